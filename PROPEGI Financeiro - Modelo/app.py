@@ -1,23 +1,53 @@
 import streamlit as st
 from pathlib import Path
 
+from data_utils import carregar_dados
+from propegi_core.instrumentacao import etapa, execucao_instrumentada
+from propegi_core.sessao import publicar_dataset
+
+PASTA_INPUT = Path(__file__).parent / "input"
+
 st.set_page_config(page_title="PROPEGI Financeiro - Modelo",page_icon="◈",layout="wide")
 
-st.title("◈ PROPEGI Financeiro - Modelo")
-
-st.markdown("---")
-    
-st.page_link("app.py", label="Home", icon="🏠")
-st.page_link("pages/01_heatmap_comparativo.py", label="Análise 1 — Comparativo (Heatmap)", icon="1️⃣")
-st.page_link("pages/02_somatorio_projetos.py", label="Análise 2 — Somatório por Projeto", icon="2️⃣")
-st.page_link("pages/03_evolucao_mensal.py", label="Análise 3 — Total Mensal", icon="3️⃣")
-st.page_link("pages/04_analise_mensal_taxa_plano.py", label="Análise 4 — Mensal Taxa Plano", icon="4️⃣")
-st.page_link("pages/05_acumulado_taxa_plano.py", label="Análise 5 — Período Taxa Plano", icon="5️⃣")
-
-    
-# serve para verificar se o arquivo de dados existe
-caminho_json = Path(__file__).parent / "input" / "dados.json"   
-if caminho_json.exists():
-    st.success(f"✅ Arquivo de dados encontrado: `{caminho_json.name}`")
-else:
-    st.error(f"❌ Arquivo de dados não encontrado em: `input/dados.json`")
+
+def home():
+    st.title("◈ PROPEGI Financeiro - Modelo")
+
+    st.markdown("---")
+
+    for pagina in PAGINAS:
+        st.page_link(pagina, label=pagina.title, icon=pagina.icon)
+
+    # serve para verificar se o arquivo de dados existe
+    caminho_json = PASTA_INPUT / "dados.json"
+    if caminho_json.exists():
+        st.success(f"✅ Arquivo de dados encontrado: `{caminho_json.name}`")
+    else:
+        st.error(f"❌ Arquivo de dados não encontrado em: `input/dados.json`")
+
+
+# Um processo só para todas as páginas: o app carrega os dados e as páginas os leem da sessão
+PAGINAS = [
+    st.Page(home, title="Home", icon="🏠", default=True),
+    st.Page("pages/01_heatmap_comparativo.py", title="Análise 1 — Comparativo (Heatmap)", icon="1️⃣"),
+    st.Page("pages/02_somatorio_projetos.py", title="Análise 2 — Somatório por Projeto", icon="2️⃣"),
+    st.Page("pages/03_evolucao_mensal.py", title="Análise 3 — Total Mensal", icon="3️⃣"),
+    st.Page("pages/04_analise_mensal_taxa_plano.py", title="Análise 4 — Mensal Taxa Plano", icon="4️⃣"),
+    st.Page("pages/05_acumulado_taxa_plano.py", title="Análise 5 — Período Taxa Plano", icon="5️⃣"),
+]
+pagina_atual = st.navigation(PAGINAS)
+
+# Armazém do processo: só lê e normaliza de novo se algum JSON mudar.
+# Sem dados, a Home continua abrindo (ela mostra o aviso do arquivo ausente).
+# Com PROPEGI_INSTRUMENTAR=1, cada rerun registra as etapas (painel na barra lateral + log)
+with execucao_instrumentada(pagina_atual.title):
+    try:
+        with etapa("carregar_dataset"):
+            publicar_dataset("modelo", carregar_dados(PASTA_INPUT))
+    except Exception as e:
+        if pagina_atual.title != "Home":
+            st.error(f"Erro ao carregar dados: {e}")
+            st.stop()
+
+    with etapa("pagina"):
+        pagina_atual.run()
@@ -1,74 +1,160 @@
 from pathlib import Path
 import json
+import sys
 import pandas as pd
 
-# mapeamento de Meses para números
-MESES = {
-    "Janeiro": 1, "Fevereiro": 2, "Março": 3, "Abril": 4,
-    "Maio": 5, "Junho": 6, "Julho": 7, "Agosto": 8,
-    "Setembro": 9, "Outubro": 10, "Novembro": 11, "Dezembro": 12
-}
-
-# converte valores em formato brasileiro para float
-def converter_valor_br_para_float(valor_str):
-    if valor_str is None or valor_str == "":
-        return 0.0
-    
-    if isinstance(valor_str, (int, float)):
-        return float(valor_str)
-    
-    # remove pontos e troca vírgula por ponto
-    valor_limpo = str(valor_str).replace(".", "").replace(",", ".")
-    try:
-        return float(valor_limpo)
-    except ValueError:
-        return 0.0
+# Raiz do repositório no path para importar o pacote compartilhado propegi_core
+_RAIZ_REPO = Path(__file__).resolve().parents[1]
+if str(_RAIZ_REPO) not in sys.path:
+    sys.path.insert(0, str(_RAIZ_REPO))
+from propegi_core.armazem import carregar_versionado  # noqa: E402
+from propegi_core.busca import valores_que_contem  # noqa: E402
+from propegi_core.esparso import pivot_esparso  # noqa: E402
+from propegi_core.esquema import ESQUEMA_MODELO, normalizar  # noqa: E402
+from propegi_core.filtros import aplicar_filtros  # noqa: E402
+from propegi_core.instrumentacao import etapa  # noqa: E402
+from propegi_core.meses import MESES_NOME  # noqa: E402
 
+# mapeamento de Meses para números
+MESES = {nome: num for num, nome in MESES_NOME.items()}
 
 #carrega todos os JSONs da pasta e retorna um DataFrame unificado
 def carregar_dados(pasta_input="input"):
+    """
+    Lê e normaliza os JSONs da pasta uma vez por versão dos arquivos; as próximas
+    chamadas (de qualquer sessão) reaproveitam o DataFrame do armazém do processo.
+    """
     pasta = Path(pasta_input)
     
     if not pasta.exists():
         raise FileNotFoundError(f"Pasta não encontrada: {pasta}")
     
     # busca todos os arquivos .json na pasta
-    arquivos_json = list(pasta.glob("*.json"))
+    arquivos_json = sorted(pasta.glob("*.json"))
     
     if not arquivos_json:
         raise FileNotFoundError(f"Nenhum arquivo JSON encontrado em: {pasta}")
+
+    return carregar_versionado("modelo", arquivos_json, lambda: _ler_dados(arquivos_json))
+
+
+def _ler_dados(arquivos_json):
+    with etapa("ler_json", arquivos=len(arquivos_json)) as e:
+        # Lista para armazenar DataFrames de cada arquivo
+        dataframes = []
+
+        # Lê cada JSON e adiciona na lista
+        for arquivo in arquivos_json:
+            with open(arquivo, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+
+            df_temp = pd.DataFrame(dados)
+            dataframes.append(df_temp)
+
+        # Junta todos os DataFrames em um só
+        df = e.saida(pd.concat(dataframes, ignore_index=True))
     
-    # Lista para armazenar DataFrames de cada arquivo
-    dataframes = []
-    
-    # Lê cada JSON e adiciona na lista
-    for arquivo in arquivos_json:
-        with open(arquivo, "r", encoding="utf-8") as f:
-            dados = json.load(f)
-        
-        df_temp = pd.DataFrame(dados)
-        dataframes.append(df_temp)
-    
-    # Junta todos os DataFrames em um só
-    df = pd.concat(dataframes, ignore_index=True)
-    
-    # Conversões importantes para garantir os tipos corretos
-    df["numeroMes"] = df["mes"].map(MESES)
-    df["valorFloat"] = df["valorDaFolha"].apply(converter_valor_br_para_float)
-    df["ano"] = df["ano"].astype(int)
-    
-    return df
+    # Conversões (numeroMes, valorFloat, ano) pelo esquema comum
+    return normalizar(df, ESQUEMA_MODELO)
+
+# Colunas com índice valor -> linhas (propegi_core.filtros), montado uma vez por versão
+COLUNAS_FILTRO = ["ano", "nomeProjeto", "categoriaDoRecurso"]
+
+
+def filtrar(df, anos=None, projetos=None, categorias=None):
+    """
+    Filtra por listas de anos, nomes de projetos e/ou categorias do recurso (Taxa /
+    Plano de Trabalho) de uma vez, pelo índice de valores.
+    Sem filtros que restrinjam algo devolve o próprio df (não altere no lugar).
+    """
+    return aplicar_filtros(
+        df,
+        {"ano": anos, "nomeProjeto": projetos, "categoriaDoRecurso": categorias},
+        [c for c in COLUNAS_FILTRO if c in df.columns]
+    )
 
 # Serve para filtrar o DataFrame por ano 
 def filtrar_por_ano(df, anos):
     """Filtra o DataFrame por lista de anos."""
-    if not anos:
-        return df
-    return df[df["ano"].isin(anos)]
+    return filtrar(df, anos=anos)
 
 # Serve para filtrar o DataFrame por projeto
 def filtrar_por_projeto(df, projetos):
     """Filtra o DataFrame por lista de nomes de projetos."""
-    if not projetos:
-        return df
-    return df[df["nomeProjeto"].isin(projetos)]
\ No newline at end of file
+    return filtrar(df, projetos=projetos)
+
+# Serve para a caixa de busca por nome do projeto
+def projetos_por_nome(df, consulta):
+    """
+    Projetos cujo nome contém a consulta, sem diferenciar maiúsculas nem acentos.
+    None se a consulta estiver vazia; [] se nenhum projeto for encontrado.
+    """
+    return valores_que_contem(df, "nomeProjeto", consulta)
+
+# Serve para o heatmap projeto × mês
+def pivot_projetos_meses(df):
+    """
+    Matriz nomeProjeto × mes (colunas em ordem de numeroMes) com a soma de valorFloat,
+    em formato esparso (propegi_core.esparso.PivotEsparso).
+    """
+    return pivot_esparso(df, "nomeProjeto", "numeroMes", "mes", "valorFloat")
+
+# Serve para o somatório por projeto (página 02)
+def soma_por_projeto(df):
+    """Total de valorFloat por projeto, do menor para o maior."""
+    return (
+        df.groupby("nomeProjeto", as_index=False)["valorFloat"]
+        .sum()
+        .rename(columns={"valorFloat": "Total"})
+        .sort_values("Total", ascending=True)
+    )
+
+# Serve para a evolução mensal (página 03)
+def total_mensal(df):
+    """Total de todos os projetos por mês, com o rótulo AnoMes (ex.: "2025-Jan"), em ordem cronológica."""
+    return (
+        df.assign(AnoMes=df["ano"].astype(str) + "-" + df["mes"])
+        .groupby(["AnoMes", "numeroMes", "ano"], as_index=False)["valorFloat"]
+        .sum()
+        .rename(columns={"valorFloat": "Total"})
+        .sort_values(["ano", "numeroMes"])
+    )
+
+# Serve para a análise mensal por Taxa / Plano de Trabalho (página 04)
+def mensal_por_categoria(df):
+    """Total por mês e categoria do recurso, em ordem de numeroMes."""
+    return (
+        df.groupby(["mes", "numeroMes", "categoriaDoRecurso"], as_index=False)["valorFloat"]
+        .sum()
+        .rename(columns={"valorFloat": "Total"})
+        .sort_values("numeroMes")
+    )
+
+def tabela_mensal_categoria(mensal):
+    """mensal_por_categoria() como tabela mês × categoria (meses em ordem de numeroMes, faltantes = 0)."""
+    return mensal.pivot_table(
+        index="mes",
+        columns="categoriaDoRecurso",
+        values="Total",
+        fill_value=0
+    ).reindex(mensal["mes"].unique())
+
+# Serve para o acumulado por Taxa / Plano de Trabalho (página 05)
+def acumulado_por_categoria(df):
+    """Total do período por projeto e categoria do recurso (soma de todos os meses)."""
+    return (
+        df.groupby(["nomeProjeto", "categoriaDoRecurso"], as_index=False)["valorFloat"]
+        .sum()
+        .rename(columns={"valorFloat": "Total"})
+    )
+
+def tabela_acumulado_categoria(acumulado):
+    """acumulado_por_categoria() como tabela projeto × categoria, com a coluna "Total Geral"."""
+    tabela = acumulado.pivot_table(
+        index="nomeProjeto",
+        columns="categoriaDoRecurso",
+        values="Total",
+        fill_value=0
+    )
+    tabela["Total Geral"] = tabela.sum(axis=1)
+    return tabela
@@ -3,16 +3,21 @@ import streamlit as st
 import plotly.express as px
 
 # importar data_utils 
-from data_utils import carregar_dados, filtrar_por_ano, filtrar_por_projeto
+from data_utils import carregar_dados, filtrar, pivot_projetos_meses
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente
+from propegi_core.heatmap import MAX_COLUNAS_HEATMAP, MAX_LINHAS_HEATMAP, recorte_heatmap
+from propegi_core.paginacao import paginar, total_paginas
+from propegi_core.instrumentacao import etapa
 
 PASTA_INPUT = Path(__file__).resolve().parents[1] / "input"
+LINHAS_POR_PAGINA = 50
 
 st.set_page_config(page_title="Heatmap Comparativo", layout="wide")
 st.header("📊 Comparativo de Valores por Projeto e Mês")
 
-# carregar TODOS os JSONs da pasta input
+# TODOS os JSONs da pasta input, carregados pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-    df = carregar_dados(PASTA_INPUT)
+    df = dataset_da_sessao("modelo", lambda: carregar_dados(PASTA_INPUT))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
@@ -23,44 +28,55 @@ projetos_disponiveis = sorted(df["nomeProjeto"].unique().tolist())
 
 col1, col2 = st.columns(2)
 with col1:
-    anos_sel = st.multiselect("Filtrar por Ano", anos_disponiveis, default=anos_disponiveis)
+    anos_sel = multiselect_persistente("Filtrar por Ano", anos_disponiveis, "anos", padrao=anos_disponiveis)
 with col2:
-    projetos_sel = st.multiselect("Filtrar por Projeto (opcional)", projetos_disponiveis)
+    projetos_sel = multiselect_persistente("Filtrar por Projeto (opcional)", projetos_disponiveis, "projetos")
 
 # aplicar filtros
-df_filtrado = filtrar_por_ano(df, anos_sel)
-if projetos_sel:
-    df_filtrado = filtrar_por_projeto(df_filtrado, projetos_sel)
+df_filtrado = filtrar(df, anos_sel, projetos_sel)
 
 if df_filtrado.empty:
     st.warning("Sem dados para os filtros escolhidos.")
     st.stop()
 
-# Pivot para heatmap
-tabela = df_filtrado.pivot_table(
-    index="nomeProjeto",
-    columns="mes",
-    values="valorFloat",
-    aggfunc="sum",
-    fill_value=0
-)
+# Pivot para heatmap (esparso: só as combinações projeto × mês com folha;
+# colunas em ordem de número do mês)
+tabela = pivot_projetos_meses(df_filtrado)
+
+# recorte: com muitos projetos o heatmap é reduzido (blocos somados) até caber na
+# tela; escolher uma faixa menor aproxima a região em detalhe
+n_proj = tabela.shape[0]
+faixa_linhas = (0, n_proj)
+# (um projeto só não tem faixa a escolher: o slider exige mínimo < máximo)
+if n_proj > 1 and (n_proj > MAX_LINHAS_HEATMAP or tabela.shape[1] > MAX_COLUNAS_HEATMAP):
+    with st.expander("🔍 Aproximar região do heatmap"):
+        ini, fim = st.slider("Projetos (posição na lista)", 1, n_proj, (1, n_proj))
+        faixa_linhas = (ini - 1, fim)
 
-# ordenar colunas por número do mês
-ordem_meses = df_filtrado[["mes", "numeroMes"]].drop_duplicates().sort_values("numeroMes")["mes"].tolist()
-tabela = tabela.reindex(columns=ordem_meses, fill_value=0)
+z, x, y, reduzido = recorte_heatmap(tabela, faixa_linhas)
 
 # Heatmap
 fig = px.imshow(
-    tabela.values,
+    z,
     labels=dict(x="Mês", y="Projeto", color="Valor (R$)"),
-    x=tabela.columns,
-    y=tabela.index,
+    x=x,
+    y=y,
     aspect="auto",
     color_continuous_scale="Blues"
 )
 fig.update_traces(hovertemplate="Projeto: %{y}<br>Mês: %{x}<br>Valor: R$ %{z:,.2f}<extra></extra>")
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+    st.plotly_chart(fig, width='stretch')
+if reduzido:
+    st.caption("Visão reduzida: cada célula soma um bloco de projetos vizinhos. Aproxime uma região para ver o detalhe.")
 
 st.subheader("📋 Tabela Resumida")
-st.dataframe(tabela.style.format("R$ {:,.2f}"), width='stretch', height=400)
+n_paginas = total_paginas(n_proj, LINHAS_POR_PAGINA)
+pagina = st.number_input("Página", min_value=1, max_value=n_paginas, value=1, step=1) if n_paginas > 1 else 1
+faixa = paginar(range(n_proj), pagina, LINHAS_POR_PAGINA)
+tabela_pagina = tabela.densificar((faixa.start, faixa.stop))
+tabela_pagina["Total"] = tabela.total_linhas()[faixa.start:faixa.stop]
+with etapa("st.dataframe"):
+    st.dataframe(tabela_pagina.style.format("R$ {:,.2f}"), width='stretch', height=400)
+st.caption(f"Página {pagina} de {n_paginas} — {n_proj} projetos")
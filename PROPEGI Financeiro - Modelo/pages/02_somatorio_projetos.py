@@ -3,16 +3,18 @@ import streamlit as st
 import plotly.express as px
 
 # importar data_utils
-from data_utils import carregar_dados, filtrar_por_ano
+from data_utils import carregar_dados, filtrar, projetos_por_nome, soma_por_projeto
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente
+from propegi_core.instrumentacao import etapa
 
 PASTA_INPUT = Path(__file__).resolve().parents[1] / "input"
 
 st.set_page_config(page_title="Somatório por Projeto", layout="wide")
 st.header("💰 Somatório dos Valores por Projeto")
 
-# carregar TODOS os JSONs da pasta input
+# TODOS os JSONs da pasta input, carregados pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-    df = carregar_dados(PASTA_INPUT)
+    df = dataset_da_sessao("modelo", lambda: carregar_dados(PASTA_INPUT))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
@@ -22,26 +24,21 @@ anos_disponiveis = sorted(df["ano"].unique().tolist())
 
 col1, col2 = st.columns([2, 3])
 with col1:
-    anos_sel = st.multiselect("Filtrar por Ano (opcional)", anos_disponiveis, default=anos_disponiveis)
+    anos_sel = multiselect_persistente("Filtrar por Ano (opcional)", anos_disponiveis, "anos", padrao=anos_disponiveis)
 with col2:
     nome_filtro = st.text_input("Filtrar por nome do projeto (contém, opcional)", value="")
 
 # aplicar filtros
-df_filtrado = filtrar_por_ano(df, anos_sel)
-if nome_filtro.strip():
-    df_filtrado = df_filtrado[df_filtrado["nomeProjeto"].str.contains(nome_filtro, case=False, na=False)]
+projetos_nome = projetos_por_nome(df, nome_filtro)  # None = sem busca
+df_filtrado = filtrar(df, anos_sel, projetos_nome) if projetos_nome != [] else df.iloc[0:0]
 
 if df_filtrado.empty:
     st.warning("Sem dados para os filtros escolhidos.")
     st.stop()
 
 # agrupar e somar por projeto
-soma_projeto = (
-    df_filtrado.groupby("nomeProjeto", as_index=False)["valorFloat"]
-    .sum()
-    .rename(columns={"valorFloat": "Total"})
-    .sort_values("Total", ascending=True)
-)
+with etapa("agrupar", df_filtrado) as e:
+    soma_projeto = e.saida(soma_por_projeto(df_filtrado))
 
 # gráfico de barras horizontal
 fig = px.bar(
@@ -58,11 +55,13 @@ fig.update_traces(
 )
 fig.update_layout(xaxis_tickformat=",.2f", height=600)
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+    st.plotly_chart(fig, width='stretch')
 
 st.subheader("📋 Tabela - Somatório por Projeto")
-st.dataframe(
-    soma_projeto[["nomeProjeto", "Total"]].style.format({"Total": "R$ {:,.2f}"}),
-    width='stretch',
-    height=450
-)
+with etapa("st.dataframe"):
+    st.dataframe(
+        soma_projeto[["nomeProjeto", "Total"]].style.format({"Total": "R$ {:,.2f}"}),
+        width='stretch',
+        height=450
+    )
@@ -3,23 +3,25 @@ import streamlit as st
 import plotly.express as px
 
 # importar data_utils
-from data_utils import carregar_dados, filtrar_por_ano
+from data_utils import carregar_dados, filtrar_por_ano, total_mensal
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente
+from propegi_core.instrumentacao import etapa
 
 PASTA_INPUT = Path(__file__).resolve().parents[1] / "input"
 
 st.set_page_config(page_title="Evolução Mensal", layout="wide")
 st.header("📈 Evolução Mensal do Valor Total")
 
-# carregar TODOS os JSONs da pasta input
+# TODOS os JSONs da pasta input, carregados pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-    df = carregar_dados(PASTA_INPUT)
+    df = dataset_da_sessao("modelo", lambda: carregar_dados(PASTA_INPUT))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
 
 # filtros
 anos_disponiveis = sorted(df["ano"].unique().tolist())
-anos_sel = st.multiselect("Filtrar por Ano (opcional)", anos_disponiveis, default=anos_disponiveis)
+anos_sel = multiselect_persistente("Filtrar por Ano (opcional)", anos_disponiveis, "anos", padrao=anos_disponiveis)
 
 # aplicar filtro
 df_filtrado = filtrar_por_ano(df, anos_sel)
@@ -28,20 +30,13 @@ if df_filtrado.empty:
     st.warning("Sem dados para os filtros escolhidos.")
     st.stop()
 
-# criar coluna AnoMes para exibição (ex: "2025-Jan")
-df_filtrado["AnoMes"] = df_filtrado["ano"].astype(str) + "-" + df_filtrado["mes"]
-
-# agrupar por mês e somar todos os projetos
-total_mensal = (
-    df_filtrado.groupby(["AnoMes", "numeroMes", "ano"], as_index=False)["valorFloat"]
-    .sum()
-    .rename(columns={"valorFloat": "Total"})
-    .sort_values(["ano", "numeroMes"])
-)
+# agrupar por mês (com o rótulo AnoMes, ex: "2025-Jan") e somar todos os projetos
+with etapa("agrupar", df_filtrado) as e:
+    df_mensal = e.saida(total_mensal(df_filtrado))
 
 # gráfico de barras
 fig = px.bar(
-    total_mensal,
+    df_mensal,
     x="AnoMes",
     y="Total",
     text="Total",
@@ -59,11 +54,13 @@ fig.update_layout(
     height=600
 )
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+    st.plotly_chart(fig, width='stretch')
 
 st.subheader("📋 Tabela - Total Mensal (Todos os projetos)")
-st.dataframe(
-    total_mensal[["AnoMes", "Total"]].style.format({"Total": "R$ {:,.2f}"}),
-    width='stretch',
-    height=450
-)
+with etapa("st.dataframe"):
+    st.dataframe(
+        df_mensal[["AnoMes", "Total"]].style.format({"Total": "R$ {:,.2f}"}),
+        width='stretch',
+        height=450
+    )
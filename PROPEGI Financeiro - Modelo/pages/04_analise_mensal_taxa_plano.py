@@ -3,16 +3,18 @@ import streamlit as st
 import plotly.express as px
 
 # importar data_utils
-from data_utils import carregar_dados, filtrar_por_ano
+from data_utils import carregar_dados, filtrar, mensal_por_categoria, tabela_mensal_categoria
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente, selectbox_persistente
+from propegi_core.instrumentacao import etapa
 
 PASTA_INPUT = Path(__file__).resolve().parents[1] / "input"
 
 st.set_page_config(page_title="Análise Mensal - Taxa/Plano", layout="wide")
 st.header("📊 Análise Mensal por Taxa e Plano de Trabalho")
 
-# carregar TODOS os JSONs da pasta input
+# TODOS os JSONs da pasta input, carregados pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-    df = carregar_dados(PASTA_INPUT)
+    df = dataset_da_sessao("modelo", lambda: carregar_dados(PASTA_INPUT))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
@@ -23,25 +25,20 @@ projetos_disponiveis = sorted(df["nomeProjeto"].unique().tolist())
 
 col1, col2 = st.columns(2)
 with col1:
-    anos_sel = st.multiselect("Filtrar por Ano", anos_disponiveis, default=anos_disponiveis)
+    anos_sel = multiselect_persistente("Filtrar por Ano", anos_disponiveis, "anos", padrao=anos_disponiveis)
 with col2:
-    projeto_sel = st.selectbox("Selecionar Projeto", projetos_disponiveis)
+    projeto_sel = selectbox_persistente("Selecionar Projeto", projetos_disponiveis, "projeto")
 
 # aplicar filtros
-df_filtrado = filtrar_por_ano(df, anos_sel)
-df_filtrado = df_filtrado[df_filtrado["nomeProjeto"] == projeto_sel]
+df_filtrado = filtrar(df, anos_sel, [projeto_sel])
 
 if df_filtrado.empty:
     st.warning("Sem dados para os filtros escolhidos.")
     st.stop()
 
 # agrupar por mês e categoria do recurso
-mensal_categoria = (
-    df_filtrado.groupby(["mes", "numeroMes", "categoriaDoRecurso"], as_index=False)["valorFloat"]
-    .sum()
-    .rename(columns={"valorFloat": "Total"})
-    .sort_values("numeroMes")
-)
+with etapa("agrupar", df_filtrado) as e:
+    mensal_categoria = e.saida(mensal_por_categoria(df_filtrado))
 
 # gráfico de barras agrupadas
 fig = px.bar(
@@ -74,19 +71,16 @@ fig.update_layout(
     legend_title="Categoria"
 )
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+    st.plotly_chart(fig, width='stretch')
 
 # tabela
 st.subheader("📋 Tabela Detalhada")
-tabela_pivot = mensal_categoria.pivot_table(
-    index="mes",
-    columns="categoriaDoRecurso",
-    values="Total",
-    fill_value=0
-).reindex(df_filtrado.sort_values("numeroMes")["mes"].unique())
+tabela_pivot = tabela_mensal_categoria(mensal_categoria)
 
-st.dataframe(
-    tabela_pivot.style.format("R$ {:,.2f}"),
-    width='stretch',
-    height=400
-)
+with etapa("st.dataframe"):
+    st.dataframe(
+        tabela_pivot.style.format("R$ {:,.2f}"),
+        width='stretch',
+        height=400
+    )
@@ -3,23 +3,25 @@ import streamlit as st
 import plotly.express as px
 
 # importar data_utils
-from data_utils import carregar_dados, filtrar_por_ano
+from data_utils import acumulado_por_categoria, carregar_dados, filtrar_por_ano, tabela_acumulado_categoria
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente
+from propegi_core.instrumentacao import etapa
 
 PASTA_INPUT = Path(__file__).resolve().parents[1] / "input"
 
 st.set_page_config(page_title="Acumulado - Taxa/Plano", layout="wide")
 st.header("📊 Análise do Período Completo por Taxa e Plano de Trabalho")
 
-# carregar TODOS os JSONs da pasta input
+# TODOS os JSONs da pasta input, carregados pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-    df = carregar_dados(PASTA_INPUT)
+    df = dataset_da_sessao("modelo", lambda: carregar_dados(PASTA_INPUT))
 except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
 
 # filtros
 anos_disponiveis = sorted(df["ano"].unique().tolist())
-anos_sel = st.multiselect("Filtrar por Ano (opcional)", anos_disponiveis, default=anos_disponiveis)
+anos_sel = multiselect_persistente("Filtrar por Ano (opcional)", anos_disponiveis, "anos", padrao=anos_disponiveis)
 
 # aplicar filtro
 df_filtrado = filtrar_por_ano(df, anos_sel)
@@ -29,11 +31,8 @@ if df_filtrado.empty:
     st.stop()
 
 # agrupar por projeto e categoria do recurso (soma de todos os meses)
-acumulado_categoria = (
-    df_filtrado.groupby(["nomeProjeto", "categoriaDoRecurso"], as_index=False)["valorFloat"]
-    .sum()
-    .rename(columns={"valorFloat": "Total"})
-)
+with etapa("agrupar", df_filtrado) as e:
+    acumulado_categoria = e.saida(acumulado_por_categoria(df_filtrado))
 
 # gráfico de barras agrupadas
 fig = px.bar(
@@ -64,22 +63,16 @@ fig.update_layout(
     xaxis_tickangle=-45
 )
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+    st.plotly_chart(fig, width='stretch')
 
 # tabela
 st.subheader("📋 Tabela Detalhada - Valores Acumulados")
-tabela_pivot = acumulado_categoria.pivot_table(
-    index="nomeProjeto",
-    columns="categoriaDoRecurso",
-    values="Total",
-    fill_value=0
-)
+tabela_pivot = tabela_acumulado_categoria(acumulado_categoria)  # com a coluna "Total Geral"
 
-# adicionar coluna de total geral
-tabela_pivot["Total Geral"] = tabela_pivot.sum(axis=1)
-
-st.dataframe(
-    tabela_pivot.style.format("R$ {:,.2f}"),
-    width='stretch',
-    height=400
-)
+with etapa("st.dataframe"):
+    st.dataframe(
+        tabela_pivot.style.format("R$ {:,.2f}"),
+        width='stretch',
+        height=400
+    )
@@ -1,12 +1,55 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from data_utils import carregar_financas_cache  # noqa: E402
+from propegi_core.instrumentacao import etapa, execucao_instrumentada  # noqa: E402
+from propegi_core.sessao import publicar_dataset  # noqa: E402
+
+CAMINHO_PADRAO_JSON = Path(__file__).resolve().parent / "input" / "Financas.json"
+
 st.set_page_config(page_title="PROPEGI Financeiro", page_icon="../../images/upeLogo.png", layout="wide", initial_sidebar_state="collapsed")
-st.title("Home")
-st.write("Use os links abaixo para navegar:")
-
-st.page_link("app.py", label="Home", icon="🏠")
-st.page_link("pages/01_analise1_comparativa.py", label="Análise 1 — Comparativo (Heatmap)", icon="1️⃣")
-st.page_link("pages/02_analise2_somatorio.py", label="Análise 2 — Somatório por Projeto", icon="2️⃣")
-st.page_link("pages/03_analise3_total_mensal.py", label="Análise 3 — Total Mensal", icon="3️⃣")
-st.page_link("pages/04_analise_mensal_taxa_plano.py", label="Análise 4 — Mensal por Taxa/Plano", icon="📅")
-st.page_link("pages/05_analise_periodo_taxa_plano.py", label="Análise 5 — Período por Taxa/Plano", icon="📊")
\ No newline at end of file
+
+
+def home():
+	st.title("Home")
+	st.write("Use os links abaixo para navegar:")
+	for pagina in PAGINAS:
+		st.page_link(pagina, label=pagina.title, icon=pagina.icon)
+
+
+# Um processo só para todas as páginas: o app carrega o dataset e as páginas o leem da sessão
+PAGINAS = [
+	st.Page(home, title="Home", icon="🏠", default=True),
+	st.Page("pages/01_analise1_comparativa.py", title="Análise 1 — Comparativo (Heatmap)", icon="1️⃣"),
+	st.Page("pages/02_analise2_somatorio.py", title="Análise 2 — Somatório por Projeto", icon="2️⃣"),
+	st.Page("pages/03_analise3_total_mensal.py", title="Análise 3 — Total Mensal", icon="3️⃣"),
+	st.Page("pages/04_analise_mensal_taxa_plano.py", title="Análise 4 — Mensal por Taxa/Plano", icon="📅"),
+	st.Page("pages/05_analise_periodo_taxa_plano.py", title="Análise 5 — Período por Taxa/Plano", icon="📊"),
+	st.Page("pages/06_analise_prazos_pagamento.py", title="Análise 6 — Prazos do Pagamento", icon="⏱️"),
+]
+pagina_atual = st.navigation(PAGINAS)
+
+# Entrada do caminho do JSON (vale para todas as páginas)
+caminho = st.sidebar.text_input(
+	"Caminho do arquivo Financas.json",
+	value=str(CAMINHO_PADRAO_JSON),
+	key="caminho_financas",
+	help="Altere caso seu arquivo esteja em outro local.",
+)
+
+# Com PROPEGI_INSTRUMENTAR=1, cada rerun registra as etapas (painel na barra lateral + log)
+with execucao_instrumentada(pagina_atual.title):
+	try:
+		# Armazém do processo: só normaliza de novo se o arquivo mudar
+		with etapa("carregar_dataset"):
+			publicar_dataset("financas", carregar_financas_cache(caminho))
+	except Exception as e:
+		st.error(f"Erro ao carregar JSON: {e}")
+		if pagina_atual.title != "Home":
+			st.stop()
+
+	with etapa("pagina"):
+		pagina_atual.run()
@@ -1,58 +1,189 @@
 from __future__ import annotations
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import hashlib
 import json
+import sys
+import threading
+import numpy as np
 import pandas as pd
-from pandas.api.types import is_numeric_dtype
 from typing import Iterable, Optional, Union
 from itertools import chain
 
+# Raiz do repositório no path para importar o pacote compartilhado propegi_core
+_RAIZ_REPO = Path(__file__).resolve().parents[1]
+if str(_RAIZ_REPO) not in sys.path:
+    sys.path.insert(0, str(_RAIZ_REPO))
+from propegi_core.armazem import carregar_versionado, limpar_armazem  # noqa: E402
+from propegi_core.busca import valores_que_contem  # noqa: E402
+from propegi_core.esparso import PivotEsparso, pivot_esparso  # noqa: E402
+from propegi_core.esquema import ESQUEMA_FINANCAS, normalizar  # noqa: E402
+from propegi_core.figuras import limpar_visoes  # noqa: E402
+from propegi_core.filtros import aplicar_filtros  # noqa: E402
+from propegi_core.datas import dias_entre, para_datetime  # noqa: E402
+from propegi_core.cache_colunar import fingerprint_arquivo, gravar_cache, ler_cache  # noqa: E402
+from propegi_core.ingestao import TAMANHO_BLOCO, ler_em_blocos  # noqa: E402
+from propegi_core.histogramas import HistogramasPorGrupo, construir_histogramas  # noqa: E402
+from propegi_core.instrumentacao import etapa, instrumentado  # noqa: E402
+from propegi_core.memo import guardar_memo, limpar_memo, memo_por_versao, versao_dataset  # noqa: E402
+from propegi_core.memoria import compactar, concat_categoricos, memory_report  # noqa: E402,F401
+from propegi_core.meses import MESES_ABREV, numero_do_mes  # noqa: E402
+from propegi_core.periodos import categorizar, localizar  # noqa: E402
+from propegi_core.ranking import maiores_em_cache  # noqa: E402
+from propegi_core.validacao import RelatorioValidacao, Regra, atipicos, fora_da_faixa, validar_em_cache  # noqa: E402
+
 # Meus Meses na ordem certa (1..12)
-MESES = {
-    1: "Jan", 2: "Fev", 3: "Mar", 4: "Abr",
-    5: "Mai", 6: "Jun", 7: "Jul", 8: "Ago",
-    9: "Set", 10: "Out", 11: "Nov", 12: "Dez",
+MESES = MESES_ABREV
+
+# Incrementar sempre que _normalize_financas_df mudar: invalida o cache em disco (.cache/)
+VERSAO_NORMALIZACAO = 4
+
+# Layout compacto do DataFrame normalizado (definido no esquema comum, propegi_core.esquema)
+COLUNAS_CATEGORIA = list(ESQUEMA_FINANCAS.categorias)
+COLUNAS_INTEIRAS = dict(ESQUEMA_FINANCAS.inteiros)
+COLUNAS_FLOAT32 = list(ESQUEMA_FINANCAS.floats32)
+
+# Datas do processo SEI, em dd/mm/aaaa no JSON; viram datetime64 na normalização
+FORMATO_DATA_SEI = "%d/%m/%Y"
+COLUNAS_DATA_SEI = (
+    "Data limite para empenho", "Data limite para liquidação", "Data limite de PD",
+    "Empenhada em", "Liquidada em", "OB emitida em", "DataCompleta",
+)
+# Etapas executadas (não podem ser anteriores à competência, 'DataCompleta')
+COLUNAS_EXECUCAO = ("Empenhada em", "Liquidada em", "OB emitida em")
+# Prazos em dias entre as datas SEI: {coluna: (de, até)} (Int32, <NA> se faltar alguma)
+COLUNAS_PRAZO = {
+    "Dias empenho-liquidação": ("Empenhada em", "Liquidada em"),
+    "Dias liquidação-OB": ("Liquidada em", "OB emitida em"),
+    "Dias empenho-OB": ("Empenhada em", "OB emitida em"),
+    "Dias competência-OB": ("DataCompleta", "OB emitida em"),
 }
-
-def _to_float(valor):
-    """
-    Converte '32617,27' -> 32617.27 e mantém números já numéricos.
-    Também lida com None/vazio retornando 0.0 para evitar quebras.
-    """
-    if valor is None: #Tratei para caso venha Valor da folha como None
-        return 0.0
-    if isinstance(valor, (int, float)):
-        return float(valor)
-    txt = str(valor).strip().replace(".", "")  # Se caso venha separador de milhar, o que é raro
-    txt = txt.replace(",", ".")
-    try:
-        return float(txt)
-    except ValueError:
-        return 0.0
-
-def carregar_financas_json(caminho_arquivo: str | Path) -> pd.DataFrame:
+# Atraso calculado pelas datas: OB emitida depois do prazo de PD (0 se no prazo)
+COLUNA_ATRASO_CALCULADO = "Dias em atraso (datas)"
+
+# Acima deste tamanho (ou para .jsonl/.ndjson) o JSON é lido em modo streaming
+LIMITE_STREAMING_BYTES = 256 * 1024 * 1024
+_EXTENSOES_JSONL = (".jsonl", ".ndjson")
+
+def carregar_financas_json(
+    caminho_arquivo: str | Path,
+    usar_cache_disco: bool = True,
+    streaming: Optional[bool] = None,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+) -> pd.DataFrame:
     """
     Lê o JSON de finanças e devolve um DataFrame com:
     - 'Projetos', 'Ano', 'Mês', 'Número do mês', 'Valor da folha' (float)
     - coluna extra 'AnoMes' no formato '2021-Jan' (ordenável por 'Número do mês')
+
+    Com usar_cache_disco=True, o resultado normalizado é guardado em Feather em
+    input/.cache/ e reaproveitado enquanto o JSON e VERSAO_NORMALIZACAO não mudarem.
+
+    streaming=True lê o arquivo registro a registro (array JSON ou JSON Lines) e
+    normaliza em blocos de tamanho_bloco linhas, sem manter a lista de dicts inteira
+    em memória. Com streaming=None, é ativado para .jsonl/.ndjson ou arquivos maiores
+    que LIMITE_STREAMING_BYTES.
     """
     caminho = Path(caminho_arquivo)
     if not caminho.exists():
         raise FileNotFoundError(f"Arquivo não encontrado: {caminho.resolve()}")
 
-    with open(caminho, "r", encoding="utf-8") as f:
-        dados = json.load(f)
+    if usar_cache_disco:
+        df = ler_cache(caminho, VERSAO_NORMALIZACAO)
+        if df is not None:
+            return df
+
+    if streaming is None:
+        streaming = (
+            caminho.suffix.lower() in _EXTENSOES_JSONL
+            or caminho.stat().st_size > LIMITE_STREAMING_BYTES
+        )
+
+    if streaming:
+        with etapa("ler_em_blocos") as e:
+            df = e.saida(_carregar_financas_streaming(caminho, tamanho_bloco))
+    else:
+        with etapa("ler_json") as e:
+            with open(caminho, "r", encoding="utf-8") as f:
+                dados = json.load(f)
+            bruto = e.saida(pd.DataFrame(dados))
+        df = _normalize_financas_df(bruto)
+    if usar_cache_disco:
+        gravar_cache(caminho, df, VERSAO_NORMALIZACAO)
+    return df
+
+
+def _carregar_financas_streaming(
+    caminho: Path,
+    tamanho_bloco: int,
+    inicio: int = 0,
+    posicao: Optional[dict] = None,
+) -> pd.DataFrame:
+    """
+    Normaliza o arquivo bloco a bloco; só os blocos já tipados ficam em memória.
+    inicio/posicao: continuar de um offset em bytes (ver propegi_core.ingestao.iterar_registros).
+    """
+    blocos = [
+        _normalize_financas_df(bloco)
+        for bloco in ler_em_blocos(caminho, tamanho_bloco, inicio, posicao)
+    ]
+    if not blocos:
+        return _normalize_financas_df(pd.DataFrame(columns=list(ESQUEMA_FINANCAS.obrigatorias)))
+    return concat_categoricos(blocos)
+
 
-    df = pd.DataFrame(dados)
-    return _normalize_financas_df(df)
+# -------------------- Cache de processo (compartilhado entre sessões) --------------------
 
-def filtrar(df: pd.DataFrame, anos: list[int] | None, projetos: list[str] | None) -> pd.DataFrame:
-    """Aplica filtros simples por ano e projetos (se fornecidos)."""
-    out = df.copy()
-    if anos:
-        out = out[out["Ano"].isin(anos)]
-    if projetos:
-        out = out[out["Projetos"].isin(projetos)]
-    return out
+def carregar_financas_cache(caminho_arquivo: str | Path) -> pd.DataFrame:
+    """
+    Versão memoizada de carregar_financas_json, compartilhada por todo o processo
+    (armazém de datasets, propegi_core.armazem).
+
+    - A chave é o fingerprint do arquivo (caminho resolvido + mtime + tamanho),
+      então editar/substituir o JSON invalida o cache automaticamente.
+    - Devolve uma cópia rasa: as páginas podem criar/filtrar colunas sem
+      alterar o DataFrame guardado no cache (não altere valores in-place).
+    - A versão fica em df.attrs["versao"] para caches derivados.
+    """
+    caminho = Path(caminho_arquivo)
+    return carregar_versionado(
+        "financas", [caminho], lambda: carregar_financas_json(caminho), VERSAO_NORMALIZACAO
+    )
+
+
+def limpar_cache_financas() -> None:
+    """Esvazia o cache de datasets, das estruturas derivadas (cubos etc.) e das visões."""
+    limpar_armazem("financas")
+    limpar_memo()
+    limpar_visoes()
+
+
+# Colunas com índice valor -> linhas (propegi_core.filtros), montado uma vez por versão
+COLUNAS_FILTRO = ["Ano", "Projetos", "Taxa", "Plano de Trabalho"]
+
+
+def filtrar(
+    df: pd.DataFrame,
+    anos: list[int] | None,
+    projetos: list[str] | None,
+    taxas: list[str] | None = None,
+    planos: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Aplica filtros por ano, projetos, taxa e plano de trabalho (se fornecidos).
+    Usa o índice por valor de COLUNAS_FILTRO: custo proporcional às linhas encontradas.
+    Sem filtros que restrinjam algo devolve o próprio df (não altere no lugar).
+    """
+    filtros = {"Ano": anos, "Projetos": projetos, "Taxa": taxas, "Plano de Trabalho": planos}
+    return aplicar_filtros(df, filtros, [c for c in COLUNAS_FILTRO if c in df.columns])
+
+def projetos_por_nome(df: pd.DataFrame, consulta: str | None) -> list[str] | None:
+    """
+    Projetos cujo nome contém a consulta, sem diferenciar maiúsculas nem acentos
+    (índice de trigramas sobre os nomes distintos, montado uma vez por versão).
+    None se a consulta estiver vazia; [] se nenhum projeto for encontrado.
+    """
+    return valores_que_contem(df, "Projetos", consulta)
 
 # Importante: função usada para as análises de Taxa e Plano de Trabalho
 def somatorio_por_taxa_plano(df: pd.DataFrame) -> pd.DataFrame:
@@ -69,118 +200,401 @@ def somatorio_por_taxa_plano(df: pd.DataFrame) -> pd.DataFrame:
 
     agrupado = df.groupby([
         "Projeto_ID", "Projetos", "Projeto de Origem", "Ano", "Mês", "Número do mês", "Taxa", "Plano de Trabalho"
-    ], dropna=False, as_index=False)["Valor da folha"].sum()
+    ], dropna=False, observed=True, as_index=False)["Valor da folha"].sum()
     return agrupado
 
 
+# -------------------- Cubo de agregação (pré-agregado por versão do dataset) --------------------
+
+# Uma linha do cubo por combinação distinta destas chaves.
+# Projetos, AnoMes e ord_col dependem de Projeto_ID / Ano / Número do mês e vão junto
+# só para as páginas não precisarem de merge.
+CHAVES_CUBO = [
+    "Projeto_ID", "Projetos", "Ano", "Número do mês", "AnoMes", "ord_col",
+    "Taxa", "Plano de Trabalho", "Status", "Recurso",
+]
+
+
+@instrumentado("cubo")
+def construir_cubo(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pré-agrega 'Valor da folha' por CHAVES_CUBO.
+    - 'Centavos' (int64): soma exata em centavos, permite somar cubos sem erro de arredondamento
+    - 'Valor da folha' (float): Centavos / 100, para as páginas usarem como antes
+    - 'Linhas': quantidade de registros originais na combinação
+    Colunas de chave ausentes no JSON entram como "N/A".
+    """
+    base = df.reindex(columns=CHAVES_CUBO)
+    for col in CHAVES_CUBO:
+        if col not in df.columns:
+            base[col] = "N/A"
+    base["Centavos"] = (df["Valor da folha"].fillna(0.0) * 100).round().astype("int64")
+
+    cubo = base.groupby(CHAVES_CUBO, dropna=False, observed=True, sort=True, as_index=False).agg(
+        Centavos=("Centavos", "sum"),
+        Linhas=("Centavos", "size"),
+    )
+    cubo["Valor da folha"] = cubo["Centavos"] / 100
+    if df.attrs.get("versao") is not None:
+        cubo.attrs["versao"] = ("cubo", df.attrs["versao"])
+    return cubo
+
+
+def cubo_financas(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cubo do dataset (ver construir_cubo), calculado uma vez por versão do dataset.
+    Passe o DataFrame completo devolvido por carregar_financas_cache; as páginas
+    filtram o cubo (filtrar funciona igual) e fazem só um groupby pequeno em cima dele.
+    """
+    return memo_por_versao("cubo_financas", versao_dataset(df), lambda: construir_cubo(df))
+
+
+def pivot_projetos_meses(df: pd.DataFrame) -> PivotEsparso:
+    """
+    Matriz Projetos × AnoMes (colunas em ordem de ord_col) com a soma de 'Valor da folha',
+    em formato esparso: só as combinações com folha ocupam memória. Use .densificar()
+    na fatia exibida e .total_linhas() / .total_colunas() para totais.
+    Funciona com o cubo ou com os dados linha a linha.
+    """
+    return pivot_esparso(df, "Projetos", "ord_col", "AnoMes", "Valor da folha")
+
+
+# -------------------- Análises (páginas e relatórios em lote) --------------------
+# Recebem o cubo (ou os dados linha a linha) já filtrado e devolvem a tabela da análise,
+# com o total em 'Total'.
+
+def tabela_heatmap(df: pd.DataFrame) -> pd.DataFrame:
+    """Análise 1: Projetos × AnoMes denso, com a coluna 'Total' por projeto."""
+    pivot = pivot_projetos_meses(df)
+    tabela = pivot.densificar()
+    tabela["Total"] = pivot.total_linhas()
+    return tabela
+
+
+def soma_por_projeto(df: pd.DataFrame) -> pd.DataFrame:
+    """Análise 2: total por projeto, do menor para o maior."""
+    return (
+        df.groupby("Projetos", as_index=False, observed=True)["Valor da folha"]
+        .sum()
+        .rename(columns={"Valor da folha": "Total"})
+        .sort_values("Total", ascending=True)
+    )
+
+
+def total_mensal(df: pd.DataFrame) -> pd.DataFrame:
+    """Análise 3: total de todos os projetos por AnoMes, em ordem cronológica (ord_col)."""
+    return mensal_por(df, [])
+
+
+def mensal_por(df: pd.DataFrame, colunas: list[str]) -> pd.DataFrame:
+    """
+    Total por AnoMes e pelas colunas dadas (ex.: ["Taxa"]), ordenado por ord_col e colunas.
+    Agrupa só por ord_col (AnoMes é função dele) e busca o rótulo na tabela de períodos;
+    se algum mês estiver fora de 1..12, agrupa também por AnoMes, como antes.
+    """
+    tabela = (
+        df.groupby(["ord_col", *colunas], as_index=False, observed=True)["Valor da folha"].sum()
+        .rename(columns={"Valor da folha": "Total"})
+        .sort_values(["ord_col", *colunas])
+    )
+    ord_col = tabela["ord_col"].astype("Int64")
+    periodos, posicoes = localizar(ord_col // 100, ord_col % 100)
+    if (posicoes < 0).any():
+        return (
+            df.groupby(["AnoMes", "ord_col", *colunas], as_index=False, observed=True)["Valor da folha"].sum()
+            .rename(columns={"Valor da folha": "Total"})
+            .sort_values(["ord_col", *colunas])
+        )
+    tabela.insert(0, "AnoMes", categorizar(periodos, "AnoMes", posicoes))
+    return tabela
+
+
+def total_por(df: pd.DataFrame, colunas: list[str], por_total: bool = False) -> pd.DataFrame:
+    """
+    Total do período pelas colunas dadas (ex.: ["Taxa", "Plano de Trabalho"]).
+    Ordenado pelas colunas, ou do maior total para o menor com por_total=True.
+    """
+    tot = (
+        df.groupby(colunas, as_index=False, observed=True)["Valor da folha"].sum()
+        .rename(columns={"Valor da folha": "Total"})
+    )
+    return tot.sort_values("Total", ascending=False) if por_total else tot.sort_values(colunas)
+
+
+
+def ultimos_registros(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """
+    Os n registros mais recentes (maior ord_col) da base inteira, para os cards
+    "Últimos Acordos" das Análises 4 e 5. Seleção parcial, uma vez por versão do dataset.
+    """
+    return maiores_em_cache(df, "ord_col", n)
+
+
+def cards_ultimos_registros(ultimos: pd.DataFrame, largura_nome: int = 25) -> pd.DataFrame:
+    """Campos dos cards (titulo, valor, rotulo, detalhe) de cada registro, para cards.grade_cards."""
+    def texto(coluna: str) -> pd.Series:
+        if coluna not in ultimos.columns:
+            return pd.Series("N/A", index=ultimos.index, dtype="string")
+        return ultimos[coluna].astype("string").fillna("N/A")
+
+    nome = texto("Projetos")
+    longo = nome.str.len() > largura_nome
+    return pd.DataFrame({
+        "titulo": "📅 " + texto("AnoMes"),
+        "valor": ultimos["Valor da folha"].astype("float64").fillna(0.0).map("R$ {:,.2f}".format),
+        "rotulo": nome.where(~longo, nome.str.slice(0, largura_nome) + "..."),
+        "detalhe": (
+            "Taxa: " + texto("Taxa") + " | Plano: " + texto("Plano de Trabalho")
+            + " | Status: " + texto("Status") + " | SEI: " + texto("SEI")
+        ),
+    })
+
+# Análise 6: distribuição dos prazos do pagamento, por projeto × recurso × mês
+METRICAS_PRAZO = ["Dias empenho-liquidação", "Dias liquidação-OB", "Dias empenho-OB", "Dias em atraso"]
+CHAVES_PRAZO = ["Projetos", "Recurso", "Ano", "ord_col"]
+
+
+def histogramas_prazos(df: pd.DataFrame) -> HistogramasPorGrupo:
+    """
+    Histogramas de 1 dia (0..180, mais negativos e excedente) de cada METRICAS_PRAZO por
+    CHAVES_PRAZO, calculados numa varredura e guardados por versão do dataset: os
+    filtros da página só escolhem grupos e somam bins (ver selecionar_prazos).
+    """
+    metricas = [m for m in METRICAS_PRAZO if m in df.columns]
+    return memo_por_versao(
+        "histogramas_prazos", versao_dataset(df), lambda: construir_histogramas(df, CHAVES_PRAZO, metricas)
+    )
+
+
+def selecionar_prazos(
+    hist: HistogramasPorGrupo,
+    anos: Optional[Iterable[int]] = None,
+    projetos: Optional[Iterable[str]] = None,
+    recursos: Optional[Iterable[str]] = None,
+) -> HistogramasPorGrupo:
+    """Grupos dos filtros (None = todos), sem voltar às linhas."""
+    grupos = hist.grupos
+    mascara = np.ones(len(grupos), dtype=bool)
+    for coluna, valores in (("Ano", anos), ("Projetos", projetos), ("Recurso", recursos)):
+        if valores is not None:
+            mascara &= grupos[coluna].isin(list(valores)).to_numpy()
+    return hist.selecionar(mascara)
+
+
+def resumo_prazos_mensal(hist: HistogramasPorGrupo, metrica: str) -> pd.DataFrame:
+    """Percentis da métrica por mês (AnoMes), em ordem cronológica."""
+    resumo = hist.resumo_por(["ord_col"], metrica).dropna(subset=["ord_col"])
+    ord_col = resumo["ord_col"].astype("Int64")
+    periodos, posicoes = localizar(ord_col // 100, ord_col % 100)
+    resumo.insert(0, "AnoMes", categorizar(periodos, "AnoMes", posicoes).astype(object))
+    return resumo.reset_index(drop=True)
+
+
+# Chaves de um lançamento (um projeto por mês); repetições são marcadas na validação
+CHAVES_DUPLICATA = ("Projetos", "Ano", "Número do mês")
+
+
+
+def regras_financas(
+    df: pd.DataFrame,
+    expected_years: Optional[Iterable[int]] = None,
+) -> list[Regra]:
+    """
+    Regras de qualidade do dataset de finanças (ver propegi_core.validacao):
+    ano esperado (opcional), valor inválido (texto lido como 0,00)/negativo/atípico, mês fora
+    de 1..12 ou diferente do nome, lançamentos duplicados e datas de execução (empenho,
+    liquidação, OB) anteriores à competência.
+    """
+    datas: dict[str, np.ndarray] = {}
+
+    def data(d: pd.DataFrame, coluna: str) -> np.ndarray:
+        # DataCompleta é comparada com várias colunas: converte uma vez só
+        if coluna not in datas:
+            datas[coluna] = para_datetime(d[coluna], FORMATO_DATA_SEI).to_numpy()
+        return datas[coluna]
+
+    def antes_da_competencia(coluna: str) -> Regra:
+        return Regra(
+            f"antes_competencia:{coluna}",
+            f"{{n}} registro(s) com '{coluna}' anterior à competência ('DataCompleta').",
+            lambda d: data(d, coluna) < data(d, "DataCompleta"),
+            (coluna, "DataCompleta"),
+        )
+
+    regras: list[Regra] = []
+    if expected_years is not None:
+        esperados = sorted(int(a) for a in expected_years)
+        regras.append(Regra(
+            "ano_fora_esperado",
+            f"{{n}} registro(s) com 'Ano' fora do conjunto esperado {esperados}.",
+            lambda d: d["Ano"].notna().to_numpy() & ~d["Ano"].isin(esperados).to_numpy(),
+            ("Ano",),
+        ))
+    # Texto que não é número vira 0,00 na normalização (br_para_float): a máscara gravada
+    # nessa hora é o único registro do valor original
+    coluna_invalida = ESQUEMA_FINANCAS.moedas_invalidas.get("Valor da folha")
+    if coluna_invalida in df.columns:
+        regras.append(Regra(
+            "valor_invalido",
+            "{n} registro(s) com 'Valor da folha' que não é número (lido como 0,00).",
+            lambda d: d[coluna_invalida].to_numpy(dtype=bool),
+            (coluna_invalida,),
+        ))
+    regras += [
+        Regra(
+            "valor_negativo",
+            "{n} registro(s) com 'Valor da folha' negativo.",
+            lambda d: fora_da_faixa(d["Valor da folha"], minimo=0),
+            ("Valor da folha",),
+        ),
+        Regra(
+            "valor_atipico",
+            "{n} registro(s) com 'Valor da folha' atípico (acima de Q3 + 3 × IQR).",
+            lambda d: atipicos(d["Valor da folha"]),
+            ("Valor da folha",),
+        ),
+        Regra(
+            "mes_fora_faixa",
+            "{n} registro(s) com 'Número do mês' fora de 1..12.",
+            lambda d: fora_da_faixa(d["Número do mês"], 1, 12),
+            ("Número do mês",),
+        ),
+        Regra(
+            "mes_inconsistente",
+            "{n} registro(s) com 'Mês' diferente de 'Número do mês'.",
+            lambda d: (numero_do_mes(d["Mês"]).astype("Int64") != d["Número do mês"].astype("Int64"))
+            .fillna(False).to_numpy(dtype=bool),
+            ("Mês", "Número do mês"),
+        ),
+        Regra(
+            "duplicatas",
+            "{n} registro(s) repetidos em Projetos/Ano/Número do mês (ver detectar_duplicatas).",
+            lambda d: d.duplicated(subset=list(CHAVES_DUPLICATA), keep=False).to_numpy(),
+            CHAVES_DUPLICATA,
+        ),
+    ]
+    regras += [antes_da_competencia(c) for c in COLUNAS_EXECUCAO]
+    return regras
+
+
+def relatorio_financas(
+    df: pd.DataFrame,
+    expected_years: Optional[Iterable[int]] = None,
+) -> RelatorioValidacao:
+    """
+    Relatório de qualidade (contagem e amostra de índices por regra de regras_financas),
+    calculado uma vez por versão do dataset.
+    """
+    esperados = None if expected_years is None else tuple(sorted(int(a) for a in expected_years))
+    return validar_em_cache(
+        f"financas:{esperados}", df, lambda: regras_financas(df, esperados), versao_dataset(df)
+    )
+
+
 def validar_financas_df(
     df: pd.DataFrame,
     expected_years: Optional[Iterable[int]] = None,
 ) -> list[str]:
     """
-    Validações simples do dataset de finanças.
+    Validações do dataset de finanças (todas as regras de regras_financas, vetorizadas).
     - Se expected_years for fornecido, valida se os anos do DF estão dentro do conjunto esperado.
-    - Sempre valida: tipo/na de 'Valor da folha' e faixa válida para 'Número do mês'.
-    Retorna lista de mensagens de alerta (vazia se tudo ok).
+    Retorna lista de mensagens de alerta (vazia se tudo ok); o relatório completo, com
+    amostras de índices, está em relatorio_financas().
     """
-    issues: list[str] = []
-
-    # 1) Anos dentro do esperado (opcional)
-    if expected_years is not None:
-        try:
-            anos = sorted(int(a) for a in df["Ano"].dropna().unique())
-            expected_set = set(int(a) for a in expected_years)
-            fora_intervalo = [a for a in anos if a not in expected_set]
-            if fora_intervalo:
-                issues.append(
-                    f"Ano(s) fora do conjunto esperado {sorted(expected_set)}: {fora_intervalo}"
-                )
-        except Exception:
-            issues.append("Coluna 'Ano' não está no formato esperado (inteiro).")
-
-    # 2) Valor da folha numérico e não nulo
-    if "Valor da folha" not in df.columns:
-        issues.append("Coluna 'Valor da folha' ausente no dataset.")
-    else:
-        if not is_numeric_dtype(df["Valor da folha"]):
-            issues.append("Coluna 'Valor da folha' não é numérica após a conversão.")
-        nulos = int(df["Valor da folha"].isna().sum())
-        if nulos > 0:
-            issues.append(f"Existem {nulos} registros com 'Valor da folha' nulo.")
-
-    # 3) Número do mês válido
-    if "Número do mês" not in df.columns:
-        issues.append("Coluna 'Número do mês' ausente no dataset.")
-    else:
-        try:
-            inval = df[(df["Número do mês"] < 1) | (df["Número do mês"] > 12)]
-            if not inval.empty:
-                qtd = len(inval)
-                issues.append(f"{qtd} registro(s) com 'Número do mês' fora de 1..12.")
-        except Exception:
-            issues.append("Coluna 'Número do mês' não está no formato numérico esperado.")
-
-    return issues
+    return relatorio_financas(df, expected_years).mensagens()
 
 
 # -------------------- Funções utilitárias avançadas (futuro-proof) --------------------
 
 def _normalize_financas_df(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Normaliza o DataFrame de finanças:
+    Normaliza o DataFrame de finanças pelo caminho comum (propegi_core.esquema.normalizar):
     - Garante colunas essenciais
     - Converte "Valor da folha" para float (pt-BR -> float)
     - Garante numéricos em "Ano" e "Número do mês"
-    - Cria colunas temporais: MesAbrev, AnoMes, ord_col
+    - Cria colunas temporais: MesAbrev, AnoMes, ord_col (_colunas_temporais)
+    - Converte as datas SEI e cria os prazos em dias (_colunas_sei)
+    - Compacta: textos repetitivos em category, inteiros menores (Int16/Int8/Int32)
     """
-    df = df.copy()
-
-    # Colunas essenciais
-    colunas_essenciais = ["Projetos", "Ano", "Mês", "Número do mês", "Valor da folha"]
-    faltando = [c for c in colunas_essenciais if c not in df.columns]
-    if faltando:
-        raise ValueError(f"Colunas ausentes no JSON: {faltando}")
-
-    # Coerção de tipos
-    df["Ano"] = pd.to_numeric(df["Ano"], errors="coerce").astype("Int64")
-    df["Número do mês"] = pd.to_numeric(df["Número do mês"], errors="coerce").astype("Int64")
+    return normalizar(df, ESQUEMA_FINANCAS, lambda d: _colunas_sei(_colunas_temporais(d)))
 
-    # Valor da folha para float
-    df["Valor da folha"] = df["Valor da folha"].apply(_to_float)
 
-    # Colunas temporais
-    df["MesAbrev"] = df["Número do mês"].map(MESES).fillna(df["Mês"])
-    df["AnoMes"] = df["Ano"].astype(str) + "-" + df["MesAbrev"].astype(str)
-    # ord_col: se Ano/Numero do mes estiverem nulos, resultará em <NA>; lidaremos convertendo para int quando possível
+def _colunas_temporais(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    MesAbrev ('Jan'), AnoMes ('2021-Jan') e ord_col (AAAAMM, <NA> se Ano/mês nulos).
+    Os rótulos vêm da tabela de períodos (propegi_core.periodos), já como category;
+    só as linhas sem Ano ou com mês fora de 1..12 são montadas como texto.
+    """
+    periodos, posicoes = localizar(df["Ano"], df["Número do mês"])
+    mes_abrev = categorizar(periodos, "MesAbrev", posicoes)
+    ano_mes = categorizar(periodos, "AnoMes", posicoes)
+
+    invalidos = posicoes < 0
+    if invalidos.any():
+        resto = df.loc[invalidos]
+        abrev_resto = resto["Número do mês"].map(MESES).fillna(resto["Mês"])
+        mes_abrev = _completar_categorias(mes_abrev, invalidos, abrev_resto)
+        ano_mes = _completar_categorias(ano_mes, invalidos, resto["Ano"].astype(str) + "-" + abrev_resto.astype(str))
+
+    df["MesAbrev"] = pd.Series(mes_abrev, index=df.index)
+    df["AnoMes"] = pd.Series(ano_mes, index=df.index)
     df["ord_col"] = df["Ano"].astype("Int64") * 100 + df["Número do mês"].astype("Int64")
-
     return df
 
 
-def carregar_financas(
-    caminhos: Union[str, Path, Iterable[Union[str, Path]]],
-    adicionar_coluna_origem: bool = True,
-) -> pd.DataFrame:
+def _colunas_sei(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Carrega um ou vários arquivos JSON de finanças e concatena em um único DataFrame normalizado.
+    COLUNAS_DATA_SEI (texto dd/mm/aaaa) -> datetime64, cada data distinta convertida uma
+    vez; COLUNAS_PRAZO em dias e o atraso calculado (ver dias_em_atraso).
+    'Dias em atraso' do JSON é mantido; só onde ele vier vazio entra o calculado.
+    """
+    for col in COLUNAS_DATA_SEI:
+        if col in df.columns:
+            df[col] = para_datetime(df[col], FORMATO_DATA_SEI)
+    for nome, (de, ate) in COLUNAS_PRAZO.items():
+        if de in df.columns and ate in df.columns:
+            df[nome] = dias_entre(df[de], df[ate])
+    if "Data limite de PD" in df.columns and "OB emitida em" in df.columns:
+        df[COLUNA_ATRASO_CALCULADO] = dias_em_atraso(df)
+        if "Dias em atraso" in df.columns:
+            df["Dias em atraso"] = (
+                pd.to_numeric(df["Dias em atraso"], errors="coerce").astype("Int32").fillna(df[COLUNA_ATRASO_CALCULADO])
+            )
+    return df
 
-    caminhos pode ser:
-    - str/Path para um arquivo
-    - str/Path para uma pasta (carrega *.json)
-    - str com wildcard (glob), ex: "input/Financas_*.json"
-    - Iterable de str/Path (lista de arquivos)
 
-    Se adicionar_coluna_origem=True, adiciona coluna "Arquivo" com o nome/base do arquivo.
+def dias_em_atraso(df: pd.DataFrame, referencia=None) -> pd.Series:
     """
+    Dias de atraso do pagamento, vetorizado: da 'Data limite de PD' até a 'OB emitida em'
+    (0 se dentro do prazo). Sem OB, conta até `referencia` (ex.: hoje), se for dada;
+    senão fica <NA>.
+    """
+    fim = df["OB emitida em"]
+    if referencia is not None:
+        fim = fim.fillna(pd.Timestamp(referencia))
+    return dias_entre(df["Data limite de PD"], fim).clip(lower=0)
+
+
+def _completar_categorias(categorias: pd.Categorical, mascara, valores: pd.Series) -> pd.Categorical:
+    """Preenche as linhas da máscara com `valores` (texto), mantendo as categorias em ordem alfabética."""
+    valores = valores.astype(object).where(valores.notna(), None).to_numpy()
+    novas = sorted(set(v for v in valores if v is not None) - set(categorias.categories))
+    completo = categorias.add_categories(novas)
+    completo[mascara] = valores
+    return completo.reorder_categories(sorted(completo.categories))
+
+
+def _coletar_caminhos(caminhos: Union[str, Path, Iterable[Union[str, Path]]]) -> list[Path]:
+    """Expande arquivo / pasta / glob / lista em uma lista ordenada de arquivos (ver carregar_financas)."""
     paths: list[Path] = []
 
     def _coletar(p: Union[str, Path]):
         pth = Path(p)
         if any(ch in str(pth) for ch in ["*", "?", "["]):
-            # padrão glob
-            paths.extend(Path().glob(str(pth)))
+            # padrão glob (ordenado para o resultado ser determinístico)
+            paths.extend(sorted(Path().glob(str(pth))))
         elif pth.is_dir():
-            paths.extend(sorted(pth.glob("*.json")))
+            paths.extend(sorted(p for p in pth.glob("*") if p.suffix.lower() in (".json", *_EXTENSOES_JSONL)))
         else:
             paths.append(pth)
 
@@ -192,21 +606,179 @@ def carregar_financas(
 
     if not paths:
         raise FileNotFoundError("Nenhum arquivo JSON encontrado para carregar.")
+    return paths
+
+
+def _carregar_arquivo_financas(caminho: Path, adicionar_coluna_origem: bool) -> pd.DataFrame:
+    """Lê e normaliza um arquivo (função de topo para poder rodar em outro processo)."""
+    df_norm = carregar_financas_json(caminho)
+    if adicionar_coluna_origem:
+        df_norm["Arquivo"] = caminho.name
+    return df_norm
+
+
+def carregar_financas(
+    caminhos: Union[str, Path, Iterable[Union[str, Path]]],
+    adicionar_coluna_origem: bool = True,
+    workers: int = 1,
+    usar_processos: bool = False,
+) -> pd.DataFrame:
+    """
+    Carrega um ou vários arquivos JSON de finanças e concatena em um único DataFrame normalizado.
+
+    caminhos pode ser:
+    - str/Path para um arquivo
+    - str/Path para uma pasta (carrega *.json e *.jsonl)
+    - str com wildcard (glob), ex: "input/Financas_*.json"
+    - Iterable de str/Path (lista de arquivos)
+
+    Se adicionar_coluna_origem=True, adiciona coluna "Arquivo" com o nome/base do arquivo.
+
+    workers > 1 lê e normaliza os arquivos em paralelo (threads, ou processos com
+    usar_processos=True — melhor para muitos arquivos grandes, já que o json.load
+    segura o GIL). A ordem dos arquivos no resultado é sempre a mesma do modo serial.
+    """
+    paths = _coletar_caminhos(caminhos)
+
+    workers = max(1, min(workers, len(paths)))
+    if workers == 1:
+        dflist = [_carregar_arquivo_financas(p, adicionar_coluna_origem) for p in paths]
+    else:
+        executor_cls = ProcessPoolExecutor if usar_processos else ThreadPoolExecutor
+        with executor_cls(max_workers=workers) as executor:
+            # map devolve os resultados na ordem de paths, não na ordem de término
+            dflist = list(executor.map(
+                _carregar_arquivo_financas, paths, [adicionar_coluna_origem] * len(paths)
+            ))
+
+    df_total = concat_categoricos(dflist)
+    return compactar(df_total, ["Arquivo"])
+
+
+
+# -------------------- Atualização incremental (só acréscimos) --------------------
+
+# Estado da última carga por conjunto de caminhos: frame total, cubo e, por arquivo,
+# fingerprint, faixa de linhas no frame, offset do fim do último registro e hash do prefixo.
+_ESTADO_INCREMENTAL: dict[tuple, dict] = {}
+_INCREMENTAL_LOCK = threading.Lock()
+
+
+def _hash_arquivo(caminho: Path, inicio: int, fim: int, h=None):
+    """Atualiza (ou cria) um hash blake2b com os bytes [inicio, fim) do arquivo."""
+    if h is None:
+        h = hashlib.blake2b(digest_size=16)
+    with open(caminho, "rb") as f:
+        f.seek(inicio)
+        restante = fim - inicio
+        while restante > 0:
+            dados = f.read(min(restante, 1 << 20))
+            if not dados:
+                break
+            h.update(dados)
+            restante -= len(dados)
+    return h
+
+
+def _somar_cubos(cubos: list[pd.DataFrame]) -> pd.DataFrame:
+    """Junta cubos parciais (soma exata em centavos), no mesmo formato de construir_cubo."""
+    junto = concat_categoricos(cubos)
+    cubo = junto.groupby(CHAVES_CUBO, dropna=False, observed=True, sort=True, as_index=False).agg(
+        Centavos=("Centavos", "sum"),
+        Linhas=("Linhas", "sum"),
+    )
+    cubo["Valor da folha"] = cubo["Centavos"] / 100
+    return _sem_categorias_vazias(cubo)
+
+
+def _sem_categorias_vazias(df: pd.DataFrame) -> pd.DataFrame:
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.remove_unused_categories()
+    return df
 
-    dflist: list[pd.DataFrame] = []
-    for p in paths:
-        if not p.exists():
-            raise FileNotFoundError(f"Arquivo não encontrado: {p}")
-        with open(p, "r", encoding="utf-8") as f:
-            dados = json.load(f)
-        df_raw = pd.DataFrame(dados)
-        df_norm = _normalize_financas_df(df_raw)
+
+def atualizar_financas(
+    caminhos: Union[str, Path, Iterable[Union[str, Path]]],
+    adicionar_coluna_origem: bool = True,
+) -> pd.DataFrame:
+    """
+    Igual a carregar_financas, mas incremental: guarda a última carga feita com os mesmos
+    caminhos e, na chamada seguinte, só lê e normaliza o que é novo:
+    - arquivos novos na pasta/glob;
+    - registros acrescentados no fim de um arquivo já lido (o trecho já lido precisa
+      continuar byte a byte igual — conferido por hash; vale para array JSON e JSON Lines).
+    Arquivos alterados de outra forma são relidos inteiros; os que não mudaram são reaproveitados.
+
+    Se só houve acréscimos, o cubo (cubo_financas: totais mensais, Taxa/Plano etc.) é
+    atualizado somando apenas as linhas novas. O resultado é idêntico ao de
+    carregar_financas(caminhos) sobre os mesmos arquivos.
+    """
+    paths = _coletar_caminhos(caminhos)
+    entrada = (caminhos,) if isinstance(caminhos, (str, Path)) else tuple(caminhos)
+    chave = (tuple(str(c) for c in entrada), adicionar_coluna_origem)
+
+    with _INCREMENTAL_LOCK:
+        estado = _ESTADO_INCREMENTAL.get(chave)
+        anteriores: dict[str, dict] = estado["arquivos"] if estado else {}
+        so_acrescimos = estado is not None and {str(p.resolve()) for p in paths} >= set(anteriores)
+
+        partes: list[pd.DataFrame] = []
+        novas: list[pd.DataFrame] = []
+        arquivos: dict[str, dict] = {}
+        for p in paths:
+            if not p.exists():
+                raise FileNotFoundError(f"Arquivo não encontrado: {p.resolve()}")
+            fp = fingerprint_arquivo(p)
+            ant = anteriores.get(fp[0])
+            posicao: dict = {}
+
+            if ant is not None and ant["fingerprint"] == fp:
+                parte, info = estado["df"].iloc[ant["linhas"][0]:ant["linhas"][1]], dict(ant)
+            elif (
+                ant is not None
+                and fp[2] > ant["fim"]
+                and _hash_arquivo(p, 0, ant["fim"]).digest() == ant["hash"].digest()
+            ):
+                # Só cresceu no fim: normaliza apenas os registros novos
+                antiga = estado["df"].iloc[ant["linhas"][0]:ant["linhas"][1]]
+                nova = _carregar_financas_streaming(p, TAMANHO_BLOCO, ant["fim"], posicao)
+                if adicionar_coluna_origem:
+                    nova["Arquivo"] = p.name
+                parte = concat_categoricos([antiga, nova]) if len(nova) else antiga
+                if len(nova):
+                    novas.append(nova)
+                info = {"fim": posicao["fim"], "hash": _hash_arquivo(p, ant["fim"], posicao["fim"], ant["hash"].copy())}
+            else:
+                parte = _carregar_financas_streaming(p, TAMANHO_BLOCO, 0, posicao)
+                if adicionar_coluna_origem:
+                    parte["Arquivo"] = p.name
+                if ant is not None:
+                    so_acrescimos = False  # arquivo reescrito: o cubo é refeito
+                else:
+                    novas.append(parte)
+                info = {"fim": posicao["fim"], "hash": _hash_arquivo(p, 0, posicao["fim"])}
+
+            inicio_linhas = sum(len(x) for x in partes)
+            info.update(fingerprint=fp, linhas=(inicio_linhas, inicio_linhas + len(parte)))
+            arquivos[fp[0]] = info
+            partes.append(parte)
+
+        df_total = _sem_categorias_vazias(concat_categoricos(partes))
         if adicionar_coluna_origem:
-            df_norm["Arquivo"] = p.name
-        dflist.append(df_norm)
+            df_total = compactar(df_total, ["Arquivo"])
+        df_total.attrs["versao"] = ("financas", tuple(a["fingerprint"] for a in arquivos.values()))
+
+        if so_acrescimos:
+            cubo = _somar_cubos([estado["cubo"], *[construir_cubo(n) for n in novas]]) if novas else estado["cubo"]
+            cubo.attrs["versao"] = ("cubo", df_total.attrs["versao"])
+        else:
+            cubo = construir_cubo(df_total)
+        guardar_memo("cubo_financas", versao_dataset(df_total), cubo)
+
+        _ESTADO_INCREMENTAL[chave] = {"df": df_total, "cubo": cubo, "arquivos": arquivos}
 
-    df_total = pd.concat(dflist, ignore_index=True)
-    return df_total
+    return df_total.copy(deep=False)
 
 
 def detectar_duplicatas(
@@ -218,6 +790,6 @@ def detectar_duplicatas(
     Padrão de chaves: ("Projetos", "Ano", "Número do mês")
     """
     if chaves is None:
-        chaves = ("Projetos", "Ano", "Número do mês")
+        chaves = CHAVES_DUPLICATA
     mask = df.duplicated(subset=list(chaves), keep=False)
     return df.loc[mask].sort_values(list(chaves))
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Figuras Plotly das análises, usadas pelas páginas e pelos relatórios em lote
+(relatorios.py). Recebem as tabelas das funções de análise do data_utils.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from data_utils import mensal_por
+from propegi_core.esparso import PivotEsparso
+from propegi_core.heatmap import recorte_heatmap
+
+
+def grafico_heatmap(
+    tabela: PivotEsparso,
+    faixa_linhas: tuple[int, int] | None = None,
+    faixa_colunas: tuple[int, int] | None = None,
+) -> go.Figure:
+    """Análise 1: heatmap Projetos × Mês/Ano (reduzido em blocos se não couber)."""
+    n_proj, n_meses = tabela.shape
+    z, x, y, _ = recorte_heatmap(tabela, faixa_linhas or (0, n_proj), faixa_colunas or (0, n_meses))
+    fig = px.imshow(
+        z,
+        labels=dict(x="Mês/Ano", y="Projetos", color="R$"),
+        x=x,
+        y=y,
+        aspect="auto",
+        color_continuous_scale="Blues",
+    )
+    fig.update_traces(hovertemplate="Projeto: %{y}<br>Mês/Ano: %{x}<br>Valor: R$ %{z:,.2f}<extra></extra>")
+    fig.update_coloraxes(colorbar_title="Valor (R$)")
+    return fig
+
+
+def grafico_somatorio(soma_projeto: pd.DataFrame) -> go.Figure:
+    """Análise 2: barras horizontais do total por projeto."""
+    fig = px.bar(soma_projeto, x="Total", y="Projetos", orientation="h", text="Total", labels={"Total": "Total (R$)", "Projetos": "Projetos"})
+    fig.update_traces(texttemplate="R$ %{x:,.2f}", hovertemplate="Projeto: %{y}<br>Total: R$ %{x:,.2f}<extra></extra>")
+    fig.update_layout(xaxis_tickformat=",.2f", margin=dict(l=10, r=10, t=30, b=10), height=600)
+    return fig
+
+
+def grafico_total_mensal(total: pd.DataFrame) -> go.Figure:
+    """Análise 3: barras do total mensal de todos os projetos."""
+    fig = px.bar(total, x="AnoMes", y="Total", text="Total", labels={"AnoMes": "Mês/Ano", "Total": "Total (R$)"})
+    fig.update_traces(texttemplate="R$ %{y:,.2f}", hovertemplate="Mês/Ano: %{x}<br>Total (todos os projetos): R$ %{y:,.2f}<extra></extra>")
+    fig.update_layout(xaxis_title="Mês/Ano", yaxis_title="Total (R$)", xaxis_tickangle=-45, yaxis_tickformat=",.2f", margin=dict(l=10, r=10, t=30, b=10), height=600)
+    return fig
+
+
+def grafico_empilhado(df_in: pd.DataFrame, coluna_cor: str, titulo: str) -> go.Figure:
+    """Análise 4: barras mensais empilhadas por coluna_cor + linha do total mensal."""
+    agrupado = mensal_por(df_in, [coluna_cor])
+    total = mensal_por(df_in, [])
+    fig = px.bar(
+        agrupado,
+        x="AnoMes",
+        y="Total",
+        color=coluna_cor,
+        category_orders={"AnoMes": total["AnoMes"].tolist()},
+        labels={"AnoMes": "Mês/Ano", "Total": "Total (R$)", coluna_cor: coluna_cor},
+        title=titulo,
+    )
+    fig.update_traces(texttemplate=None)
+
+    # Adicionar linha de tendência (total mensal)
+    fig.add_trace(
+        go.Scatter(
+            x=total["AnoMes"],
+            y=total["Total"],
+            mode="lines+markers",
+            name="Total Mensal",
+            line=dict(color="orange", width=3),
+            marker=dict(size=8, symbol="circle"),
+            yaxis="y2"
+        )
+    )
+
+    fig.update_layout(
+        xaxis_tickangle=-45,
+        yaxis=dict(title="Total por Categoria (R$)", tickformat=",.2f"),
+        yaxis2=dict(
+            title="Total Mensal (R$)",
+            overlaying="y",
+            side="right",
+            tickformat=",.2f"
+        ),
+        height=500,
+        legend_title=coluna_cor,
+        hovermode="x unified"
+    )
+    return fig
+
+
+def grafico_total(tot: pd.DataFrame, coluna: str, titulo: str) -> go.Figure:
+    """Análise 5: barras do total do período por coluna (Taxa ou Plano de Trabalho)."""
+    fig = px.bar(tot, x=coluna, y="Total", text="Total", labels={"Total": "Total (R$)"}, title=titulo)
+    fig.update_traces(texttemplate="R$ %{y:,.2f}")
+    fig.update_layout(yaxis_tickformat=",.2f", height=500)
+    return fig
+
+
+def grafico_histograma_prazo(contagens: np.ndarray, valores_bins: np.ndarray, maximo: int, titulo: str) -> go.Figure:
+    """Análise 6: histograma (bins de 1 dia) de um prazo; negativos e excedente nas pontas."""
+    rotulos = ["< 0" if v < 0 else (f"> {maximo}" if v > maximo else str(v)) for v in valores_bins]
+    usados = np.flatnonzero(contagens)
+    inicio, fim = (usados[0], usados[-1] + 1) if len(usados) else (1, 2)
+    fig = go.Figure(go.Bar(
+        x=rotulos[inicio:fim],
+        y=contagens[inicio:fim],
+        hovertemplate="Dias: %{x}<br>Registros: %{y:,}<extra></extra>",
+    ))
+    fig.update_layout(
+        title=titulo, xaxis_title="Dias", yaxis_title="Registros", xaxis_type="category", bargap=0.05, height=420
+    )
+    return fig
+
+
+def grafico_percentis_mensal(resumo: pd.DataFrame, maximo: int, titulo: str) -> go.Figure:
+    """
+    Análise 6: p50/p90/p99 de um prazo por mês (tabela de resumo_prazos_mensal).
+    Percentis censurados (abaixo de 0 ou acima de maximo) ficam fora da linha.
+    """
+    colunas = [c for c in ("p50", "p90", "p99") if c in resumo.columns]
+    longo = resumo.melt(id_vars=["AnoMes"], value_vars=colunas, var_name="Percentil", value_name="Dias")
+    dias = longo["Dias"].astype("Float64")
+    longo["Dias"] = dias.mask((dias < 0) | (dias > maximo))
+    fig = px.line(longo, x="AnoMes", y="Dias", color="Percentil", markers=True, title=titulo, labels={"AnoMes": "Mês/Ano"})
+    fig.update_layout(xaxis_tickangle=-45, xaxis_type="category", height=420, hovermode="x unified")
+    return fig
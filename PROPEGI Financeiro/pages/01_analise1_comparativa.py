@@ -3,73 +3,93 @@ import sys
 from pathlib import Path
 
 import streamlit as st
-import plotly.express as px
 import pandas as pd
 
 # Adiciona o diretório pai ao path para importar data_utils
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from data_utils import carregar_financas_json, filtrar  # noqa: E402
+from data_utils import carregar_financas_cache, cubo_financas, filtrar, pivot_projetos_meses  # noqa: E402
+from graficos import grafico_heatmap  # noqa: E402
+from propegi_core.heatmap import MAX_COLUNAS_HEATMAP, MAX_LINHAS_HEATMAP  # noqa: E402
+from propegi_core.figuras import chave_visao, figura_em_cache  # noqa: E402
+from propegi_core.memo import versao_dataset  # noqa: E402
+from propegi_core.sessao import dataset_da_sessao, limpar_filtros, multiselect_persistente  # noqa: E402
+from propegi_core.paginacao import paginar, total_paginas  # noqa: E402
+from propegi_core.instrumentacao import etapa  # noqa: E402
 
 CAMINHO_PADRAO_JSON = Path(__file__).resolve().parents[1] / "input" / "Financas.json"
+LINHAS_POR_PAGINA = 50
 
 st.set_page_config(page_title="Análise 1", layout="wide", initial_sidebar_state="collapsed")
 st.header("◈ Comparativo de Valores das Folhas por Projeto com base no Mês e o Ano")
 
-# Entrada do caminho do JSON
-caminho = st.text_input("Caminho do arquivo Financas.json", value=str(CAMINHO_PADRAO_JSON), help="Altere caso seu arquivo esteja em outro local.")
-
+# Dataset carregado pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-	df = carregar_financas_json(caminho)
+	df = dataset_da_sessao("financas", lambda: carregar_financas_cache(CAMINHO_PADRAO_JSON))
 except Exception as e:
 	st.error(f"Erro ao carregar JSON: {e}")
 	st.stop()
 
+# Cubo pré-agregado (calculado uma vez por versão do dataset)
+cubo = cubo_financas(df)
+
 # Filtros
-anos_unicos = sorted(df["Ano"].unique().tolist())
-projetos_unicos = sorted(df["Projetos"].unique().tolist())
+anos_unicos = sorted(cubo["Ano"].unique().tolist())
+projetos_unicos = sorted(cubo["Projetos"].unique().tolist())
 
 col_f1, col_f2, col_f3 = st.columns([1, 2, 1])
 with col_f1:
-	anos_sel = st.multiselect("Filtrar por Ano (opcional)", anos_unicos, default=anos_unicos)
+	anos_sel = multiselect_persistente("Filtrar por Ano (opcional)", anos_unicos, "anos", padrao=anos_unicos)
 with col_f2:
-	projetos_sel = st.multiselect("Filtrar por Projetos (opcional)", projetos_unicos)
+	projetos_sel = multiselect_persistente("Filtrar por Projetos (opcional)", projetos_unicos, "projetos")
 with col_f3:
-	if st.button("Limpar filtros"):
-		anos_sel = anos_unicos
-		projetos_sel = []
+	st.button("Limpar filtros", on_click=limpar_filtros, args=("anos", "projetos"))
 
-df_filt = filtrar(df, anos_sel, projetos_sel)
+df_filt = filtrar(cubo, anos_sel, projetos_sel)
 if df_filt.empty:
 	st.warning("Sem dados para os filtros escolhidos.")
 	st.stop()
 
-# Pivot para Heatmap
-ord_cols = df_filt[["AnoMes", "ord_col"]].drop_duplicates().sort_values("ord_col")
-ordem_colunas = ord_cols["AnoMes"].tolist()
+# Pivot para Heatmap (esparso: só as combinações projeto × mês com folha)
+tabela = pivot_projetos_meses(df_filt)
+ordem_colunas = tabela.rotulos_colunas
 
-tabela = (
-	df_filt.groupby(["Projetos", "AnoMes"], as_index=False)["Valor da folha"]
-	.sum()
-	.pivot(index="Projetos", columns="AnoMes", values="Valor da folha")
-	.reindex(columns=ordem_colunas)
-	.fillna(0.0)
-)
+# Recorte: com muitos projetos/meses o heatmap é reduzido (blocos somados) até caber
+# na tela; escolher uma faixa menor aproxima a região em detalhe
+n_proj, n_meses = tabela.shape
+faixa_linhas, faixa_colunas = (0, n_proj), (0, n_meses)
+if n_proj > MAX_LINHAS_HEATMAP or n_meses > MAX_COLUNAS_HEATMAP:
+	with st.expander("🔍 Aproximar região do heatmap"):
+		if n_proj > 1:
+			ini, fim = st.slider("Projetos (posição na lista)", 1, n_proj, (1, n_proj))
+			faixa_linhas = (ini - 1, fim)
+		if n_meses > 1:
+			mes_ini, mes_fim = st.select_slider("Período", options=ordem_colunas, value=(ordem_colunas[0], ordem_colunas[-1]))
+			faixa_colunas = (ordem_colunas.index(mes_ini), ordem_colunas.index(mes_fim) + 1)
 
-fig = px.imshow(
-	tabela.values,
-	labels=dict(x="Mês/Ano", y="Projetos", color="R$"),
-	x=tabela.columns,
-	y=tabela.index,
-	aspect="auto",
-	color_continuous_scale="Blues",
+# Figura reaproveitada enquanto dados, filtros e recorte não mudarem
+chave = chave_visao(
+	versao_dataset(cubo), "01_comparativa",
+	anos=anos_sel, projetos=projetos_sel, linhas=faixa_linhas, colunas=faixa_colunas,
+)
+fig = figura_em_cache(chave, "heatmap", lambda: grafico_heatmap(tabela, faixa_linhas, faixa_colunas))
+reduzido = (
+	faixa_linhas[1] - faixa_linhas[0] > MAX_LINHAS_HEATMAP
+	or faixa_colunas[1] - faixa_colunas[0] > MAX_COLUNAS_HEATMAP
 )
-fig.update_traces(hovertemplate="Projeto: %{y}<br>Mês/Ano: %{x}<br>Valor: R$ %{z:,.2f}<extra></extra>")
-fig.update_coloraxes(colorbar_title="Valor (R$)")
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+	st.plotly_chart(fig, width='stretch')
+if reduzido:
+	st.caption("Visão reduzida: cada célula soma um bloco de projetos/meses vizinhos. Aproxime uma região para ver o detalhe.")
 
 st.subheader("◆ Tabela Resumida")
-st.dataframe(tabela.style.format("{:,.2f}"), width='stretch', height=400)
-
+n_paginas = total_paginas(n_proj, LINHAS_POR_PAGINA)
+pagina = st.number_input("Página", min_value=1, max_value=n_paginas, value=1, step=1) if n_paginas > 1 else 1
+faixa = paginar(range(n_proj), pagina, LINHAS_POR_PAGINA)
+tabela_pagina = tabela.densificar((faixa.start, faixa.stop))
+tabela_pagina["Total"] = tabela.total_linhas()[faixa.start:faixa.stop]
+with etapa("st.dataframe"):
+	st.dataframe(tabela_pagina.style.format("{:,.2f}"), width='stretch', height=400)
+st.caption(f"Página {pagina} de {n_paginas} — {n_proj} projetos")
@@ -3,50 +3,49 @@ import sys
 from pathlib import Path
 
 import streamlit as st
-import plotly.express as px
 
 # Adiciona o diretório pai ao path para importar data_utils
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-from data_utils import carregar_financas_json, filtrar  # noqa: E402
+from data_utils import carregar_financas_cache, cubo_financas, filtrar, total_mensal as calcular_total_mensal  # noqa: E402
+from graficos import grafico_total_mensal  # noqa: E402
+from propegi_core.figuras import chave_visao, figura_em_cache, tabela_em_cache  # noqa: E402
+from propegi_core.memo import versao_dataset  # noqa: E402
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente  # noqa: E402
+from propegi_core.instrumentacao import etapa  # noqa: E402
 
 CAMINHO_PADRAO_JSON = Path(__file__).resolve().parents[1] / "input" / "Financas.json"
 
 st.set_page_config(page_title="Análise 3", layout="wide", initial_sidebar_state="collapsed")
 st.header("◈ Análise 3: Evolução mensal do valor total das folhas por projeto")
 
-caminho = st.text_input("Caminho do arquivo Financas.json", value=str(CAMINHO_PADRAO_JSON), help="Se necessário, ajuste para o local onde o arquivo está.")
-
+# Dataset carregado pelo app.py (ou aqui, se a página rodar sozinha)
 try:
-	df = carregar_financas_json(caminho)
+	df = dataset_da_sessao("financas", lambda: carregar_financas_cache(CAMINHO_PADRAO_JSON))
 except Exception as e:
 	st.error(f"Erro ao carregar JSON: {e}")
 	st.stop()
 
-anos_disponiveis = sorted(df["Ano"].unique().tolist())
-anos_sel = st.multiselect("Filtrar por Ano (opcional)", anos_disponiveis, default=anos_disponiveis)
+# Cubo pré-agregado (calculado uma vez por versão do dataset)
+cubo = cubo_financas(df)
+
+anos_disponiveis = sorted(cubo["Ano"].unique().tolist())
+anos_sel = multiselect_persistente("Filtrar por Ano (opcional)", anos_disponiveis, "anos", padrao=anos_disponiveis)
 
-df_filt = filtrar(df, anos_sel, None)
+df_filt = filtrar(cubo, anos_sel, None)
 if df_filt.empty:
 	st.warning("Sem dados para os filtros escolhidos.")
 	st.stop()
 
-ordem = df_filt[["AnoMes", "ord_col"]].drop_duplicates().sort_values("ord_col")
-ordem_cols = ordem["AnoMes"].tolist()
-
-total_mensal = (
-	df_filt.groupby("AnoMes", as_index=False)["Valor da folha"]
-	.sum()
-	.rename(columns={"Valor da folha": "Total"})
-	.merge(ordem, on="AnoMes", how="left")
-	.sort_values("ord_col")
-)
+# Agregação e figura reaproveitadas enquanto dados e filtros não mudarem
+chave = chave_visao(versao_dataset(cubo), "03_total_mensal", anos=anos_sel)
 
-fig = px.bar(total_mensal, x="AnoMes", y="Total", text="Total", labels={"AnoMes": "Mês/Ano", "Total": "Total (R$)"})
-fig.update_traces(texttemplate="R$ %{y:,.2f}", hovertemplate="Mês/Ano: %{x}<br>Total (todos os projetos): R$ %{y:,.2f}<extra></extra>")
-fig.update_layout(xaxis_title="Mês/Ano", yaxis_title="Total (R$)", xaxis_tickangle=-45, yaxis_tickformat=",.2f", margin=dict(l=10, r=10, t=30, b=10), height=600)
+total_mensal = tabela_em_cache(chave, "total_mensal", lambda: calcular_total_mensal(df_filt))
+fig = figura_em_cache(chave, "barras", lambda: grafico_total_mensal(total_mensal))
 
-st.plotly_chart(fig, width='stretch')
+with etapa("st.plotly_chart"):
+	st.plotly_chart(fig, width='stretch')
 st.subheader("◆ Tabela - Total Mensal (Todos os projetos)")
-st.dataframe(total_mensal[["AnoMes", "Total"]].style.format({"Total": "{:,.2f}"}), width='stretch', height=450)
+with etapa("st.dataframe"):
+	st.dataframe(total_mensal[["AnoMes", "Total"]].style.format({"Total": "{:,.2f}"}), width='stretch', height=450)
@@ -0,0 +1,120 @@
+import sys
+from pathlib import Path
+import pandas as pd
+import streamlit as st
+
+# Permitir import do módulo raiz
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from data_utils import (  # noqa: E402
+    METRICAS_PRAZO,
+    carregar_financas_cache,
+    histogramas_prazos,
+    resumo_prazos_mensal,
+    selecionar_prazos,
+)
+from graficos import grafico_histograma_prazo, grafico_percentis_mensal  # noqa: E402
+from propegi_core.figuras import chave_visao, figura_em_cache, tabela_em_cache  # noqa: E402
+from propegi_core.histogramas import rotular_percentis  # noqa: E402
+from propegi_core.memo import versao_dataset  # noqa: E402
+from propegi_core.sessao import dataset_da_sessao, multiselect_persistente, selectbox_persistente  # noqa: E402
+from propegi_core.instrumentacao import etapa  # noqa: E402
+
+CAMINHO_PADRAO_JSON = Path(__file__).resolve().parents[1] / "input" / "Financas.json"
+
+st.set_page_config(page_title="Prazos do Pagamento", layout="wide", initial_sidebar_state="collapsed")
+st.header("◈ Prazos do Pagamento — Empenho → Liquidação → OB")
+st.caption("Distribuição dos dias entre as etapas do processo SEI e dos dias em atraso.")
+
+# Dataset carregado pelo app.py (ou aqui, se a página rodar sozinha)
+try:
+    df = dataset_da_sessao("financas", lambda: carregar_financas_cache(CAMINHO_PADRAO_JSON))
+except Exception as e:
+    st.error(f"Erro ao carregar JSON: {e}")
+    st.stop()
+
+# Histogramas por projeto × recurso × mês, calculados uma vez por versão do dataset
+hist = histogramas_prazos(df)
+metricas = [m for m in METRICAS_PRAZO if m in hist.celulas]
+if not metricas:
+    st.warning("O JSON não traz as datas de empenho, liquidação e OB.")
+    st.stop()
+
+# Filtros: só escolhem grupos e somam bins (não voltam às linhas)
+anos = sorted(int(a) for a in hist.grupos["Ano"].dropna().unique())
+projetos = sorted(hist.grupos["Projetos"].dropna().unique().tolist())
+recursos = sorted(hist.grupos["Recurso"].dropna().unique().tolist())
+
+col1, col2, col3 = st.columns([2, 3, 2])
+with col1:
+    anos_sel = multiselect_persistente("Filtrar por ano", anos, "anos", padrao=anos)
+with col2:
+    projetos_sel = multiselect_persistente("Projetos (vazio = todos)", projetos, "projetos_prazos")
+with col3:
+    recursos_sel = multiselect_persistente("Recurso (vazio = todos)", recursos, "recursos_prazos")
+
+sel = selecionar_prazos(hist, anos_sel, projetos_sel or None, recursos_sel or None)
+if sel.grupos.empty:
+    st.warning("Sem dados para os filtros escolhidos.")
+    st.stop()
+
+chave = chave_visao(
+    versao_dataset(df), "06_prazos_pagamento", anos=anos_sel, projetos=projetos_sel, recursos=recursos_sel
+)
+
+# Percentis de cada etapa no período filtrado
+resumo = tabela_em_cache(chave, "resumo", lambda: pd.concat(
+    [sel.resumo_por([], m).assign(Prazo=m) for m in metricas], ignore_index=True
+))
+
+if "Dias em atraso" in metricas:
+    atraso = resumo.loc[resumo["Prazo"] == "Dias em atraso"].iloc[0]
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Registros", f"{int(atraso['Quantidade']):,}".replace(",", "."))
+    k2.metric("Pagamentos em atraso", f"{int(atraso['Acima de 0']):,}".replace(",", "."))
+    pct = 100 * atraso["Acima de 0"] / atraso["Quantidade"] if atraso["Quantidade"] else 0.0
+    k3.metric("% em atraso", f"{pct:.1f}%".replace(".", ","))
+
+st.subheader("◆ Percentis por etapa (dias)")
+st.caption(f"Percentis além da faixa dos histogramas aparecem como \"> {sel.maximo}\" ou \"< 0\".")
+with etapa("st.dataframe"):
+    st.dataframe(
+        rotular_percentis(resumo, sel.maximo)[["Prazo", "Quantidade", "p50", "p90", "p99", "Acima de 0"]],
+        hide_index=True,
+        width="stretch",
+    )
+
+# Distribuição de uma etapa
+metrica = selectbox_persistente("Etapa", metricas, "metrica_prazos")
+chave_metrica = chave_visao(
+    versao_dataset(df), "06_prazos_pagamento", anos=anos_sel, projetos=projetos_sel, recursos=recursos_sel, metrica=metrica
+)
+
+st.subheader(f"Distribuição — {metrica}")
+with etapa("st.plotly_chart"):
+    st.plotly_chart(
+        figura_em_cache(chave_metrica, "histograma", lambda: grafico_histograma_prazo(
+            sel.total(metrica), sel.valores_bins, sel.maximo, f"{metrica} (bins de 1 dia)"
+        )),
+        width="stretch",
+    )
+
+st.subheader(f"Percentis por mês — {metrica}")
+mensal = tabela_em_cache(chave_metrica, "mensal", lambda: resumo_prazos_mensal(sel, metrica))
+with etapa("st.plotly_chart"):
+    st.plotly_chart(
+        figura_em_cache(chave_metrica, "percentis_mensal", lambda: grafico_percentis_mensal(
+            mensal, sel.maximo, f"p50 / p90 / p99 de {metrica} por mês (sem os acima de {sel.maximo} dias)"
+        )),
+        width="stretch",
+    )
+
+aba_projeto, aba_recurso, aba_mes = st.tabs(["Por projeto", "Por recurso", "Por mês"])
+with aba_projeto:
+    with etapa("st.dataframe"):
+        st.dataframe(rotular_percentis(sel.resumo_por(["Projetos"], metrica), sel.maximo), hide_index=True, width="stretch")
+with aba_recurso:
+    with etapa("st.dataframe"):
+        st.dataframe(rotular_percentis(sel.resumo_por(["Recurso"], metrica), sel.maximo), hide_index=True, width="stretch")
+with aba_mes:
+    with etapa("st.dataframe"):
+        st.dataframe(rotular_percentis(mensal.drop(columns=["ord_col"]), sel.maximo), hide_index=True, width="stretch")
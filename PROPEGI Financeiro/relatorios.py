@@ -0,0 +1,333 @@
+"""
+Relatórios em lote das análises do PROPEGI Financeiro, sem o Streamlit.
+
+Carrega o JSON uma vez (mesmo caminho das páginas: normalização, cache em disco e cubo
+pré-agregado) e grava, para o período escolhido:
+
+- geral/: heatmap (Projetos × Mês/Ano), somatório por projeto, total mensal e
+  Taxa/Plano (mensal e do período), como tabelas e figuras;
+- projetos/<projeto>/: Taxa/Plano mensal e do período de cada projeto.
+
+Tabelas em CSV ou Parquet (Parquet requer o pacote opcional pyarrow); figuras em
+PNG/SVG/PDF se o kaleido estiver instalado, senão em HTML (um só plotly.min.js na pasta
+de saída, sem repetir a biblioteca em cada arquivo).
+
+Escopo: só as análises do painel PROPEGI Financeiro. Os painéis "PROPEGI Financeiro -
+Modelo" e "Projeto de Desenvolvimento Tecnologico" não têm exportação em lote (as
+agregações deles ainda ficam nas páginas).
+Uso, a partir desta pasta:
+
+    python relatorios.py --saida relatorios/2025-06 --de 2025-01 --ate 2025-06 --jobs 8
+"""
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+import os
+import re
+import sys
+import time
+
+import pandas as pd
+import plotly.offline
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from data_utils import (  # noqa: E402
+    carregar_financas_cache,
+    cubo_financas,
+    filtrar,
+    mensal_por,
+    pivot_projetos_meses,
+    soma_por_projeto,
+    tabela_heatmap,
+    total_mensal,
+    total_por,
+)
+from graficos import (  # noqa: E402
+    grafico_empilhado,
+    grafico_heatmap,
+    grafico_somatorio,
+    grafico_total,
+    grafico_total_mensal,
+)
+from propegi_core.busca import normalizar_texto  # noqa: E402
+
+CAMINHO_PADRAO_JSON = Path(__file__).resolve().parent / "input" / "Financas.json"
+FORMATOS_TABELA = ("csv", "parquet")
+FORMATOS_FIGURA = ("png", "svg", "pdf", "html")
+PARQUET_SEM_PYARROW = "--formato parquet requer o pacote opcional pyarrow (pip install pyarrow); use --formato csv."
+
+# Cubo do período, compartilhado pelos workers (herdado no fork ou recarregado em _iniciar_worker)
+_CUBO: pd.DataFrame | None = None
+
+
+# -------------------- Período --------------------
+
+def _ord_col(ano_mes: str) -> int:
+    """'2025-03' -> 202503 (mesmo formato de ord_col)."""
+    m = re.fullmatch(r"(\d{4})-(\d{1,2})", ano_mes.strip())
+    if not m or not 1 <= int(m.group(2)) <= 12:
+        raise argparse.ArgumentTypeError(f"Período inválido (use AAAA-MM): {ano_mes}")
+    return int(m.group(1)) * 100 + int(m.group(2))
+
+
+def cubo_do_periodo(
+    caminho: str | Path,
+    anos: list[int] | None = None,
+    de: int | None = None,
+    ate: int | None = None,
+) -> pd.DataFrame:
+    """Cubo do JSON (ver data_utils.cubo_financas) só com os anos e meses [de, ate] pedidos."""
+    cubo = filtrar(cubo_financas(carregar_financas_cache(caminho)), anos, None)
+    if de is not None or ate is not None:
+        ordem = cubo["ord_col"]
+        dentro = ordem.notna()
+        if de is not None:
+            dentro &= ordem >= de
+        if ate is not None:
+            dentro &= ordem <= ate
+        cubo = cubo[dentro.fillna(False).to_numpy()]
+    cubo = cubo.reset_index(drop=True)
+    # Versão própria: o recorte herda attrs do cubo inteiro, mas não as mesmas posições
+    # (os índices de filtro são memoizados pela versão)
+    if cubo.attrs.get("versao") is not None:
+        cubo.attrs["versao"] = ("periodo", cubo.attrs["versao"], tuple(anos or ()), de, ate)
+    return cubo
+
+
+# -------------------- Gravação --------------------
+
+def gravar_tabela(df: pd.DataFrame, destino: Path, formato: str) -> Path:
+    """Grava df em destino.<formato> (o índice só entra se tiver nome, ex.: heatmap)."""
+    caminho = destino.with_suffix("." + formato)
+    manter_indice = df.index.name is not None
+    if formato == "parquet":
+        df.to_parquet(caminho, index=manter_indice)
+    else:
+        df.to_csv(caminho, index=manter_indice, encoding="utf-8")
+    return caminho
+
+
+def _pyarrow_disponivel() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _kaleido_disponivel() -> bool:
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def gravar_figura(fig, destino: Path, formato: str, raiz: Path | None = None) -> Path:
+    """
+    Grava a figura em destino.<formato>. Em HTML, a página aponta para o plotly.min.js
+    de raiz (padrão: a pasta do arquivo), gravado uma vez só (ver _garantir_plotlyjs).
+    """
+    caminho = destino.with_suffix("." + formato)
+    if formato == "html":
+        js = _garantir_plotlyjs(raiz or caminho.parent)
+        relativo = Path(os.path.relpath(js, caminho.parent)).as_posix()
+        fig.write_html(caminho, include_plotlyjs=relativo, full_html=True)
+    else:
+        fig.write_image(caminho)
+    return caminho
+
+
+def _garantir_plotlyjs(pasta: Path) -> Path:
+    js = pasta / "plotly.min.js"
+    if not js.exists():
+        pasta.mkdir(parents=True, exist_ok=True)
+        js.write_text(plotly.offline.get_plotlyjs(), encoding="utf-8")
+    return js
+
+
+def nome_de_pasta(nome: str) -> str:
+    """Nome de projeto -> nome de pasta seguro ("Gestão / UPE" -> "gestao_upe")."""
+    limpo = re.sub(r"[^0-9a-z]+", "_", normalizar_texto(nome)).strip("_")
+    return limpo[:80] or "projeto"
+
+
+# -------------------- Relatórios --------------------
+
+def relatorio_geral(
+    cubo: pd.DataFrame, pasta: Path, formato: str, formato_figura: str, raiz: Path | None = None
+) -> list[Path]:
+    """Análises 1 a 5 com todos os projetos do período."""
+    pasta.mkdir(parents=True, exist_ok=True)
+    soma = soma_por_projeto(cubo)
+    total = total_mensal(cubo)
+    heatmap = tabela_heatmap(cubo)
+    heatmap.index.name = "Projetos"
+    tabelas = {
+        "01_heatmap": heatmap,
+        "02_somatorio_projetos": soma,
+        "03_total_mensal": total[["AnoMes", "Total"]],
+        "04_mensal_taxa_plano": mensal_por(cubo, ["Taxa", "Plano de Trabalho"])[["AnoMes", "Taxa", "Plano de Trabalho", "Total"]],
+        "05_periodo_taxa_plano": total_por(cubo, ["Taxa", "Plano de Trabalho"]),
+    }
+    figuras = {
+        "01_heatmap": grafico_heatmap(pivot_projetos_meses(cubo)),
+        "02_somatorio_projetos": grafico_somatorio(soma),
+        "03_total_mensal": grafico_total_mensal(total),
+        **_figuras_taxa_plano(cubo),
+    }
+    return _gravar(tabelas, figuras, pasta, formato, formato_figura, raiz)
+
+
+def relatorio_projeto(
+    cubo: pd.DataFrame, pasta: Path, formato: str, formato_figura: str, raiz: Path | None = None
+) -> list[Path]:
+    """Análises 4 e 5 (Taxa/Plano mensal e do período) de um projeto."""
+    pasta.mkdir(parents=True, exist_ok=True)
+    tabelas = {
+        "04_mensal_taxa_plano": mensal_por(cubo, ["Taxa", "Plano de Trabalho"])[["AnoMes", "Taxa", "Plano de Trabalho", "Total"]],
+        "05_periodo_taxa_plano": total_por(cubo, ["Taxa", "Plano de Trabalho"]),
+    }
+    return _gravar(tabelas, _figuras_taxa_plano(cubo), pasta, formato, formato_figura, raiz)
+
+
+def _figuras_taxa_plano(cubo: pd.DataFrame) -> dict:
+    return {
+        "04_mensal_taxa": grafico_empilhado(cubo, "Taxa", "Somatório mensal por taxa"),
+        "04_mensal_plano": grafico_empilhado(cubo, "Plano de Trabalho", "Somatório mensal por plano de trabalho"),
+        "05_periodo_taxa": grafico_total(total_por(cubo, ["Taxa"], por_total=True), "Taxa", "Total do período por taxa"),
+        "05_periodo_plano": grafico_total(
+            total_por(cubo, ["Plano de Trabalho"], por_total=True), "Plano de Trabalho", "Total do período por plano de trabalho"
+        ),
+    }
+
+
+def _gravar(tabelas: dict, figuras: dict, pasta: Path, formato: str, formato_figura: str, raiz: Path | None) -> list[Path]:
+    gravados = [gravar_tabela(df, pasta / nome, formato) for nome, df in tabelas.items()]
+    gravados += [gravar_figura(fig, pasta / nome, formato_figura, raiz) for nome, fig in figuras.items()]
+    return gravados
+
+
+def _iniciar_worker(caminho: str, anos, de, ate) -> None:
+    # fork: o cubo do processo principal já veio junto; spawn: recarrega (cache em disco)
+    global _CUBO
+    if _CUBO is None:
+        _CUBO = cubo_do_periodo(caminho, anos, de, ate)
+
+
+def _relatorio_do_projeto(projeto: str, pasta: Path, formato: str, formato_figura: str, raiz: Path) -> int:
+    """Tarefa de um worker: filtra o cubo compartilhado pelo projeto e grava o relatório."""
+    return len(relatorio_projeto(filtrar(_CUBO, None, [projeto]), pasta, formato, formato_figura, raiz))
+
+
+def gerar_relatorios(
+    caminho: str | Path,
+    saida: str | Path,
+    anos: list[int] | None = None,
+    de: int | None = None,
+    ate: int | None = None,
+    formato: str = "csv",
+    formato_figura: str = "png",
+    jobs: int = 1,
+    por_projeto: bool = True,
+) -> dict:
+    """
+    Gera o relatório geral e, com por_projeto=True, um por projeto do período.
+    jobs > 1 distribui os projetos entre processos (o cubo é carregado uma vez e
+    compartilhado). Sem o kaleido, formatos de imagem caem para HTML.
+    Retorna um resumo (projetos, arquivos, figuras em, segundos).
+    """
+    global _CUBO
+    inicio = time.perf_counter()
+    if formato == "parquet" and not _pyarrow_disponivel():
+        raise ImportError(PARQUET_SEM_PYARROW)
+    if formato_figura != "html" and not _kaleido_disponivel():
+        print("kaleido não instalado: figuras serão gravadas em HTML.", file=sys.stderr)
+        formato_figura = "html"
+
+    saida = Path(saida)
+    _CUBO = cubo_do_periodo(caminho, anos, de, ate)
+    if _CUBO.empty:
+        raise ValueError("Sem dados para o período escolhido.")
+    arquivos = len(relatorio_geral(_CUBO, saida / "geral", formato, formato_figura, saida))
+
+    projetos = sorted(_CUBO["Projetos"].dropna().unique().tolist()) if por_projeto else []
+    pastas, usados = [], set()
+    for projeto in projetos:
+        nome = nome_de_pasta(projeto)
+        sufixo = 2
+        while nome in usados:  # nomes que ficam iguais sem acentos/pontuação
+            nome, sufixo = f"{nome_de_pasta(projeto)}_{sufixo}", sufixo + 1
+        usados.add(nome)
+        pastas.append(saida / "projetos" / nome)
+
+    jobs = max(1, min(jobs, len(projetos) or 1))
+    if jobs == 1:
+        for projeto, pasta in zip(projetos, pastas):
+            arquivos += _relatorio_do_projeto(projeto, pasta, formato, formato_figura, saida)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_iniciar_worker,
+            initargs=(str(caminho), anos, de, ate),
+        ) as executor:
+            arquivos += sum(executor.map(
+                _relatorio_do_projeto,
+                projetos,
+                pastas,
+                [formato] * len(projetos),
+                [formato_figura] * len(projetos),
+                [saida] * len(projetos),
+                chunksize=max(1, len(projetos) // (jobs * 4)),
+            ))
+
+    return {
+        "projetos": len(projetos),
+        "arquivos": arquivos,
+        "figuras": formato_figura,
+        "segundos": round(time.perf_counter() - inicio, 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[1],
+        epilog=(
+            "Cobre só as análises do PROPEGI Financeiro (heatmap, somatório, total mensal e "
+            "Taxa/Plano); os painéis Modelo e Projeto de Desenvolvimento Tecnologico não são "
+            "exportados. Parquet requer pyarrow; PNG/SVG/PDF requerem kaleido (sem ele: HTML)."
+        ),
+    )
+    parser.add_argument("--json", default=str(CAMINHO_PADRAO_JSON), help="Arquivo Financas.json")
+    parser.add_argument("--saida", required=True, help="Pasta de saída (criada se não existir)")
+    parser.add_argument("--anos", type=int, nargs="+", help="Anos do relatório (padrão: todos)")
+    parser.add_argument("--de", type=_ord_col, help="Primeiro mês do período (AAAA-MM)")
+    parser.add_argument("--ate", type=_ord_col, help="Último mês do período (AAAA-MM)")
+    parser.add_argument("--formato", choices=FORMATOS_TABELA, default="csv", help="Formato das tabelas (parquet: requer pyarrow)")
+    parser.add_argument("--figuras", choices=FORMATOS_FIGURA, default="png", help="Formato das figuras (sem kaleido: html)")
+    parser.add_argument("--jobs", type=int, default=1, help="Processos para os relatórios por projeto")
+    parser.add_argument("--sem-projetos", action="store_true", help="Só o relatório geral")
+    args = parser.parse_args(argv)
+    if args.formato == "parquet" and not _pyarrow_disponivel():
+        parser.error(PARQUET_SEM_PYARROW)
+
+    resumo = gerar_relatorios(
+        args.json,
+        args.saida,
+        anos=args.anos,
+        de=args.de,
+        ate=args.ate,
+        formato=args.formato,
+        formato_figura=args.figuras,
+        jobs=args.jobs,
+        por_projeto=not args.sem_projetos,
+    )
+    print(
+        f"{resumo['projetos']} projetos, {resumo['arquivos']} arquivos "
+        f"(figuras em {resumo['figuras']}) em {resumo['segundos']:.1f}s -> {Path(args.saida).resolve()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
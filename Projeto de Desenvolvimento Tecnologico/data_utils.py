@@ -1,19 +1,42 @@
 from __future__ import annotations
 from pathlib import Path
+import sys
+import numpy as np
 import pandas as pd
 
 # Raiz do projeto (pasta onde está este arquivo)
 BASE_DIR = Path(__file__).resolve().parent
 INPUT_DIR = BASE_DIR / "input"
 
+# Raiz do repositório no path para importar o pacote compartilhado propegi_core
+if str(BASE_DIR.parent) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR.parent))
+from propegi_core.armazem import carregar_versionado  # noqa: E402
+from propegi_core.cache_colunar import gravar_cache, ler_cache  # noqa: E402
+from propegi_core.esquema import ESQUEMA_PDT, converter_moedas, normalizar  # noqa: E402
+from propegi_core.instrumentacao import instrumentado  # noqa: E402
+from propegi_core.memoria import compactar, memory_report, preencher_nulos  # noqa: E402,F401
+from propegi_core.meses import ano_e_mes  # noqa: E402
+from propegi_core.periodos import categorizar, localizar, tabela_periodos  # noqa: E402
+from propegi_core.ranking import maiores_em_cache  # noqa: E402
+
 # Nome padrão do JSON (ajuste se necessário)
 DEFAULT_JSON_NAME = "Projetos de Desenvolvimento Tecnologico.json"
-BRL_COLS = [
-    "valorPactuado",       # <--- NOVO: 19/11
-    "valorAgencia",
-    "valorUnidade",
-    "valorIAUPE",
-]
+BRL_COLS = list(ESQUEMA_PDT.moedas)  # valorPactuado, valorAgencia, valorUnidade, valorIAUPE
+
+# Incrementar sempre que normalizar_valores / preparar_datas / imputar_data_projeto mudarem:
+# invalida o cache em disco (input/.cache/)
+VERSAO_NORMALIZACAO = 3
+
+# Colunas de data do JSON e o formato em que vêm (ISO, só a data)
+COLUNAS_DATA = ["dataPublicacao", "inicioData", "terminoData"]
+FORMATO_DATA = "%Y-%m-%d"
+
+# Rótulo dos projetos sem ano em nenhuma fonte (ver imputar_data_projeto)
+ANO_INDEFINIDO = "Não Definido"
+
+# Colunas de texto repetitivo guardadas como category (ver compactar_projetos)
+COLUNAS_CATEGORIA = list(ESQUEMA_PDT.categorias)
 
 def input_path(name: str | Path = DEFAULT_JSON_NAME) -> Path:
     """Retorna o caminho absoluto dentro de input/."""
@@ -22,6 +45,7 @@ def input_path(name: str | Path = DEFAULT_JSON_NAME) -> Path:
         raise FileNotFoundError(f"Arquivo não encontrado em: {p}")
     return p
 
+@instrumentado("ler_json")
 def carregar_json(path: str | Path | None = None) -> pd.DataFrame:
     """
     Lê o JSON (lista de objetos) e retorna um DataFrame.
@@ -31,106 +55,106 @@ def carregar_json(path: str | Path | None = None) -> pd.DataFrame:
         path = input_path(DEFAULT_JSON_NAME)
     return pd.read_json(path)
 
-def _br_to_float(serie: pd.Series) -> pd.Series:
-    """
-    Converte '1.234.567,89' -> 1234567.89. Aceita também numérico.
-    """
-    if pd.api.types.is_numeric_dtype(serie):
-        return serie.astype(float)
-    
-    serie = serie.fillna("0").astype(str)
-    serie = serie.str.strip() # remove espaços e caracteres invisíveis do início ao fim
-    serie = serie.str.replace(r'[^\d\.\,]', '', regex=True) # Remove qualquer coisa que não seja dígito, ponto ou vírgula
-
-    # Cconversão BR -> Float
-    serie = (
-        serie.str.replace(".", "", regex=False)  # Remove separador de milhar (ponto)
-             .str.replace(",", ".", regex=False) # Substitui vírgula por ponto decimal
-    )
-    
-    return pd.to_numeric(serie, errors="coerce").fillna(0.0)
-
 def normalizar_valores(df: pd.DataFrame) -> pd.DataFrame:
     """Garante que colunas monetárias estejam em float."""
-    for c in BRL_COLS:
-        if c in df.columns:
-            df[c] = _br_to_float(df[c])
-    return df
+    return converter_moedas(df, ESQUEMA_PDT)
 
 def preparar_datas(df: pd.DataFrame) -> pd.DataFrame:
-    """Converte 'dataPublicacao' e cria colunas Ano/Mes/MesNome."""
-    df = df.copy()
-
-    # -------------- MODIFICAÇAO 19/11 (INÍCIO) --------------
-    # Colunas de data a serem convertidas
-    date_cols = ["dataPublicacao", "inicioData", "terminoData"]
-
-    for col in date_cols:
+    """
+    Converte as COLUNAS_DATA (formato FORMATO_DATA; o que não casar vira NaT) e cria
+    Ano (Int64), Mes (Int8) e MesNome ("01/Jan", category) a partir de 'dataPublicacao'.
+    """
+    df = df.copy(deep=False)
+    for col in COLUNAS_DATA:
         if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce")
-    # -------------- MODIFICAÇAO 19/11 (FIM) --------------
+            df[col] = pd.to_datetime(df[col], format=FORMATO_DATA, errors="coerce")
 
-    df["dataPublicacao"] = pd.to_datetime(df["dataPublicacao"], errors="coerce") # verificar se não é uma redundância
-    df["Ano"] = df["dataPublicacao"].dt.year
-    df["Mes"] = df["dataPublicacao"].dt.month
-    df["MesNome"] = df["dataPublicacao"].dt.strftime("%m/%b")
+    df["Ano"], df["Mes"] = ano_e_mes(df["dataPublicacao"])
+    periodos, posicoes = localizar(df["Ano"], df["Mes"])
+    df["MesNome"] = pd.Series(categorizar(periodos, "MesNome", posicoes), index=df.index)
     return df
 
 # -------------- MODIFICAÇAO 26/11 (INÍCIO) --------------
 
-"""Extrai o ano do formato 'XXX-AAAA'."""
 def _extrair_ano_do_acordo(serie_acordo: pd.Series) -> pd.Series:
-    serie = serie_acordo.astype(str).str.split('-').str[-1]
-    # Converte para numérico e coerce erros (onde a string não é um ano)
-    return pd.to_numeric(serie, errors='coerce')
+    """Extrai o ano do formato 'XXX-AAAA' (o trecho depois do último '-'); <NA> se não for número."""
+    trecho = serie_acordo.astype("string").str.rpartition("-")[2]
+    return np.trunc(pd.to_numeric(trecho, errors="coerce")).astype("Int64")
 
-# Cria uma coluna 'AnoProjeto' usando lógica sequencial (Data Publicação > InícioData > Acordo).
+# Preenche 'Ano' em sequência: Data Publicação > InícioData > ano do Acordo.
+@instrumentado("imputar_ano")
 def imputar_data_projeto(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    
-    # 1. Trata 'acordoConvenioNumero' para extrair o ano
-    # O Ano será preenchido como NaN se a extração falhar.
-    df['AnoAcordo'] = _extrair_ano_do_acordo(df['acordoConvenioNumero'])
-    
-    # 2. Preenche os NaNs em 'Ano' com o 'Ano' de 'InícioData' (se InícioData for válida)
-    # df['InícioData'].dt.year obtém o ano do objeto datetime.
-    df['Ano'] = df['Ano'].fillna(df['inicioData'].dt.year)
-    
-    # 3. Preenche os NaNs restantes em 'Ano' com o 'Ano' extraído do acordo
-    df['Ano'] = df['Ano'].fillna(df['AnoAcordo'])
-    
-    # 4. Remove a coluna auxiliar e converte 'Ano' para inteiro (para visualização limpa)
-    df = df.drop(columns=['AnoAcordo'], errors='ignore')
-    
-    # 5. Cria a categoria "Não Definido" para o agrupamento, onde o ano ainda é nulo.
-    # Converte o Ano para string para poder usar 'Não Definido' na mesma coluna
-    df['Ano'] = df['Ano'].fillna(9999).astype(int).astype(str).replace('9999', 'Não Definido')
-    
+    """
+    'Ano' continua inteiro (nullable): só as linhas ainda sem ano consultam a próxima
+    fonte. 'AnoIndefinido' marca as que ficaram sem ano em nenhuma das três; para
+    exibir, rotulo_ano() as mostra como ANO_INDEFINIDO ("Não Definido").
+    """
+    df = df.copy(deep=False)
+    ano = df["Ano"].astype("Int64")
+
+    faltando = ano.isna()
+    if faltando.any() and "inicioData" in df.columns:
+        ano = ano.fillna(ano_e_mes(df.loc[faltando, "inicioData"])[0])
+        faltando = ano.isna()
+    if faltando.any() and "acordoConvenioNumero" in df.columns:
+        ano = ano.fillna(_extrair_ano_do_acordo(df.loc[faltando, "acordoConvenioNumero"]))
+        faltando = ano.isna()
+
+    df["Ano"] = ano
+    df["AnoIndefinido"] = faltando.to_numpy()
     return df
 
+def rotulo_ano(ano: pd.Series) -> pd.Series:
+    """Ano como texto para eixos/legendas; <NA> vira ANO_INDEFINIDO."""
+    return ano.astype("Int64").astype("string").fillna(ANO_INDEFINIDO)
+
 # -------------- MODIFICAÇAO 26/11 (FIM) --------------
 
-def agrupar_mensal(df: pd.DataFrame, ano: int) -> pd.DataFrame:
-    """Soma por mês (1..12) os valores da agência, unidade e IA-UPE para o ano dado."""
-    df_ano = df[df["Ano"] == ano].copy()
-    if df_ano.empty:
-        base = pd.DataFrame({"Mes": range(1, 13)})
-        base["MesNome"] = base["Mes"].apply(lambda m: pd.Timestamp(year=ano, month=m, day=1).strftime("%m/%b"))
-        for c in BRL_COLS:
-            base[c] = 0.0
-        return base
-
-    grp = (
-        df_ano.groupby(["Mes", "MesNome"], as_index=False)[BRL_COLS]
-        .sum()
-        .sort_values("Mes")
-    )
-    meses_completos = pd.DataFrame({"Mes": range(1, 13)})
-    meses_completos["MesNome"] = meses_completos["Mes"].apply(
-        lambda m: pd.Timestamp(year=ano, month=m, day=1).strftime("%m/%b")
+def compactar_projetos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reduz a memória do DataFrame normalizado: COLUNAS_CATEGORIA em category,
+    'Mes' em Int8 e 'Ano' em Int16. Os valores monetários continuam float64.
+    """
+    return compactar(df, COLUNAS_CATEGORIA, {**ESQUEMA_PDT.inteiros, "Ano": "Int16"})
+
+def carregar_projetos(path: str | Path | None = None, imputar_ano: bool = False) -> pd.DataFrame:
+    """
+    Carrega o JSON já normalizado: normalizar_valores -> preparar_datas
+    (-> imputar_data_projeto, se imputar_ano=True) -> compactar_projetos.
+
+    O resultado fica em cache colunar (Feather) em input/.cache/ e é reaproveitado
+    enquanto o JSON e VERSAO_NORMALIZACAO não mudarem; em memória, fica no armazém do
+    processo (propegi_core.armazem), compartilhado entre sessões.
+    df.attrs["versao"] recebe a versão do JSON (chave dos caches de visões).
+    """
+    if path is None:
+        path = input_path(DEFAULT_JSON_NAME)
+    variante = "imputado" if imputar_ano else ""
+    return carregar_versionado(
+        "pdt", [path], lambda: _carregar_normalizado(path, variante), (VERSAO_NORMALIZACAO, variante)
     )
-    out = meses_completos.merge(grp, on=["Mes", "MesNome"], how="left").fillna(0.0)
-    return out
+
+def _carregar_normalizado(path: Path, variante: str) -> pd.DataFrame:
+    df = ler_cache(path, VERSAO_NORMALIZACAO, variante)
+    if df is None:
+        # moedas -> datas (Ano/Mes/MesNome) -> compactação, pelo caminho comum
+        df = normalizar(carregar_json(path), ESQUEMA_PDT, preparar_datas)
+        if variante == "imputado":
+            df = imputar_data_projeto(df)
+        df = compactar_projetos(df)
+        gravar_cache(path, df, VERSAO_NORMALIZACAO, variante)
+    return df
+
+@instrumentado()
+def agrupar_mensal(df: pd.DataFrame, ano: int) -> pd.DataFrame:
+    """
+    Soma por mês (1..12) os valores da agência, unidade e IA-UPE para o ano dado:
+    a soma por 'Mes' reindexada nos 12 meses da tabela de períodos (meses sem valor = 0).
+    """
+    meses = tabela_periodos(int(ano))[["Mes", "MesNome"]]
+    soma = df.loc[df["Ano"] == ano].groupby("Mes", observed=True)[BRL_COLS].sum()
+    soma = soma.set_axis(soma.index.astype("int64")).reindex(meses["Mes"], fill_value=0.0)
+    return pd.concat([meses, soma.reset_index(drop=True)], axis=1)
 
 def kpis_anuais(df_mes: pd.DataFrame) -> dict:
     """Totais do ano (soma dos meses) para cards."""
@@ -140,6 +164,39 @@ def kpis_anuais(df_mes: pd.DataFrame) -> dict:
         "ia_upe": float(df_mes["valorIAUPE"].sum()) if "valorIAUPE" in df_mes else 0.0,
     }
 
+# Valores recebidos por órgão (Agência, Unidade, IA-UPE), somados nas páginas 03 e 04
+COLUNAS_ORGAOS = ["valorAgencia", "valorUnidade", "valorIAUPE"]
+
+@instrumentado()
+def projetos_por_ano_segmento(df: pd.DataFrame) -> pd.DataFrame:
+    """Quantidade de projetos por Ano e segmento; Ano vira rótulo (sem ano -> "Não Definido", por último)."""
+    return (
+        df.groupby(["Ano", "segmento"], observed=True, dropna=False).size().reset_index(name="QtdProjetos")
+          .sort_values(["Ano", "segmento"], na_position="last")
+          .assign(Ano=lambda d: rotulo_ano(d["Ano"]))
+    )
+
+@instrumentado()
+def recebimentos_anuais(df: pd.DataFrame) -> pd.DataFrame:
+    """Soma por Ano do que cada órgão recebeu, mais TotalAno (soma dos três)."""
+    return (
+        df.groupby("Ano")[COLUNAS_ORGAOS]
+          .sum()
+          .reset_index()
+          .sort_values("Ano")
+          .assign(TotalAno=lambda d: d["valorAgencia"] + d["valorUnidade"] + d["valorIAUPE"])
+    )
+
+@instrumentado()
+def recebimentos_por_setor(df: pd.DataFrame) -> pd.DataFrame:
+    """ValorTotal (Agência + Unidade + IA-UPE) somado por Ano e segmento."""
+    return (
+        df.assign(ValorTotal=df[COLUNAS_ORGAOS].sum(axis=1))
+          .groupby(["Ano", "segmento"], as_index=False, observed=True)["ValorTotal"]
+          .sum()
+          .sort_values(["Ano", "segmento"])
+    )
+
 def brl(v: float) -> str:
     """Formata float para BRL simples (R$ 1.234,56)."""
     s = f"{v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
@@ -147,12 +204,33 @@ def brl(v: float) -> str:
     
 # -------------- MODIFICAÇAO 19/11 (INÍCIO) --------------
 # Função para filtrar, ordenar e retornar os 5 projetos mais recentes
-def acordos_recentes(df: pd.DataFrame) -> pd.DataFrame:
-    df_copy = df.copy()
-
-    # Ordena por InícioData em ordem decrescente (mais recentes primeiro)
-    df_ordenado = df_copy.sort_values(by='inicioData', ascending=False)
-    
-    # Retorna os últimos 5
-    return df_ordenado.head(5)
+@instrumentado()
+def acordos_recentes(df: pd.DataFrame, n: int = 5) -> pd.DataFrame:
+    """
+    Os n projetos com 'inicioData' mais recente (sem data por último), sem copiar nem
+    ordenar a base: seleção parcial, memoizada por versão do dataset.
+    """
+    return maiores_em_cache(df, "inicioData", n)
+
+
+def cards_acordos(acordos: pd.DataFrame) -> pd.DataFrame:
+    """Campos do card de acordo (cards.ESTILO_ACORDO) de cada projeto: textos já formatados."""
+    def texto(coluna: str, padrao: str = "N/A") -> pd.Series:
+        if coluna not in acordos.columns:
+            return pd.Series(padrao, index=acordos.index, dtype="string")
+        return acordos[coluna].astype("string").fillna(padrao)
+
+    def data(coluna: str) -> pd.Series:
+        if coluna not in acordos.columns:
+            return pd.Series("N/D", index=acordos.index, dtype="string")
+        return acordos[coluna].dt.strftime("%d/%m/%Y").astype("string").fillna("N/D")
+
+    return pd.DataFrame({
+        "projeto": texto("nomeProjeto"),
+        "segmento": texto("segmento"),
+        "coordenador": texto("coordenador"),
+        "inicio": data("inicioData"),
+        "termino": data("terminoData"),
+        "pactuado": acordos["valorPactuado"].astype("float64").fillna(0.0).map(brl),
+    })
 # -------------- MODIFICAÇAO 19/11 (FIM) --------------
@@ -1,13 +1,43 @@
 import streamlit as st
 
+from data_utils import DEFAULT_JSON_NAME, carregar_projetos, input_path
+from propegi_core.instrumentacao import etapa, execucao_instrumentada
+from propegi_core.sessao import publicar_dataset
+
 st.set_page_config(page_title="Projeto de Desenvolvimento Tecnológico", layout="wide",initial_sidebar_state="collapsed") #->collapsed serve para esconder a sidebar
 
-st.title("Home")
-st.write("Use os links abaixo para navegar:")
 
-st.page_link("home.py", label="Home", icon="🏠")
-st.page_link("pages/01_recebimentos_mensais.py", label="Recebimentos mensais — Agência / Unidade / IA-UPE", icon="📅")
-st.page_link("pages/02_projetos_por_segmento.py", label="Projetos em desenvolvimento por segmento/ano", icon="📊")
-st.page_link("pages/03_recebimentos_anuais.py", label="Recebimentos anuais por órgão", icon="📈")
-st.page_link("pages/04_recebimentos_por_setor.py", label="Recebimentos por setor (segmento)", icon="🥧")
+def home():
+    st.title("Home")
+    st.write("Use os links abaixo para navegar:")
+
+    for pagina in PAGINAS:
+        st.page_link(pagina, label=pagina.title, icon=pagina.icon)
+
+
+# Um processo só para todas as páginas: a home carrega os dados e as páginas os leem da sessão
+PAGINAS = [
+    st.Page(home, title="Home", icon="🏠", default=True),
+    st.Page("pages/01_recebimentos_mensais.py", title="Recebimentos mensais — Agência / Unidade / IA-UPE", icon="📅"),
+    st.Page("pages/02_projetos_por_segmento.py", title="Projetos em desenvolvimento por segmento/ano", icon="📊"),
+    st.Page("pages/03_recebimentos_anuais.py", title="Recebimentos anuais por órgão", icon="📈"),
+    st.Page("pages/04_recebimentos_por_setor.py", title="Recebimentos por setor (segmento)", icon="🥧"),
+]
+pagina_atual = st.navigation(PAGINAS)
+
+# Armazém do processo: só normaliza de novo se o JSON mudar. A variante com ano imputado
+# é carregada pela página 02 a cada rerun dela, direto do armazém.
+# Sem dados, a Home continua abrindo (com o aviso do arquivo ausente ou inválido).
+# Com PROPEGI_INSTRUMENTAR=1, cada rerun registra as etapas (painel na barra lateral + log)
+with execucao_instrumentada(pagina_atual.title):
+    try:
+        with etapa("carregar_dataset"):
+            publicar_dataset("pdt", carregar_projetos(input_path(DEFAULT_JSON_NAME)))
+    except Exception as e:
+        if pagina_atual.title != "Home":
+            st.error(f"Erro ao carregar dados: {e}")
+            st.stop()
+        st.warning(f"Não foi possível carregar os dados: {e}", icon="⚠️")
 
+    with etapa("pagina"):
+        pagina_atual.run()
@@ -3,71 +3,74 @@ import plotly.express as px
 import pandas as pd
 
 from data_utils import (          # <- import ABSOLUTO
-    carregar_json,
-    normalizar_valores,
-    preparar_datas,
+    carregar_projetos,
+    recebimentos_por_setor,       # <- soma dos 3 órgãos por Ano × segmento
     input_path,                   # <- resolve caminho dentro de input/
     DEFAULT_JSON_NAME,            # <- nome padrão do JSON
 )
+from propegi_core.figuras import chave_visao, figura_em_cache, tabela_em_cache  # noqa: E402
+from propegi_core.memo import versao_dataset  # noqa: E402
+from propegi_core.sessao import dataset_da_sessao, selectbox_persistente  # noqa: E402
+from propegi_core.instrumentacao import etapa  # noqa: E402
 
 st.set_page_config(layout="wide")
 st.title("◈ Recebimentos por ano por Setor (Segmento)")
 
-# --- Carregamento e preparo ---
-df = carregar_json(input_path(DEFAULT_JSON_NAME))
-df = normalizar_valores(df)
-df = preparar_datas(df)
+# --- Carregamento e preparo (feito pelo home.py; aqui só se a página rodar sozinha) ---
+df = dataset_da_sessao("pdt", lambda: carregar_projetos(input_path(DEFAULT_JSON_NAME)))
 
 if "segmento" not in df.columns:
     st.error("❌ A coluna 'Segmento' não foi encontrada no JSON.")
     st.stop()
 
-# Total por registro (Agência + Unidade + IA-UPE)
-cols_valor = ["valorAgencia", "valorUnidade", "valorIAUPE"]
-df["ValorTotal"] = df[cols_valor].sum(axis=1)
+# Agregação e figuras reaproveitadas enquanto os dados não mudarem
+chave = chave_visao(versao_dataset(df), "04_recebimentos_por_setor")
 
-# Agrupamento Ano × Segmento (soma valores)
-df_group = (
-    df.groupby(["Ano", "segmento"], as_index=False)["ValorTotal"]
-      .sum()
-      .sort_values(["Ano", "segmento"])
-)
+# Agrupamento Ano × Segmento (soma de Agência + Unidade + IA-UPE)
+df_group = tabela_em_cache(chave, "ano_segmento", lambda: recebimentos_por_setor(df))
 
 # --- Layout: gráfico (esq) + controles/pizza (dir) ---
 col_chart, col_side = st.columns([7, 5], gap="large")
 
 with col_chart:
     st.subheader("❖ Recebimentos anuais por Setor (Segmento)")
-    fig_bar = px.bar(
-        df_group,
-        x="Ano",
-        y="ValorTotal",
-        color="segmento",
-        barmode="group",
-        text_auto=".2s",
-        labels={"ValorTotal": "Valor (R$)"},
-        title=None,
-    )
-    fig_bar.update_layout(xaxis=dict(type="category"))
-    st.plotly_chart(fig_bar, width='stretch')
+    def _grafico_barras():
+        fig = px.bar(
+            df_group,
+            x="Ano",
+            y="ValorTotal",
+            color="segmento",
+            barmode="group",
+            text_auto=".2s",
+            labels={"ValorTotal": "Valor (R$)"},
+            title=None,
+        )
+        fig.update_layout(xaxis=dict(type="category"))
+        return fig
+
+    fig_bar = figura_em_cache(chave, "barras", _grafico_barras)
+    with etapa("st.plotly_chart"):
+        st.plotly_chart(fig_bar, width='stretch')
 
 with col_side:
     st.subheader("❖ Distribuição por setor")
     anos = sorted(df_group["Ano"].unique().tolist())
-    ano_sel = st.selectbox("Período", anos, index=len(anos) - 1)
+    ano_sel = selectbox_persistente("Período", anos, "ano", padrao=len(anos) - 1)
 
-    df_ano = df_group[df_group["Ano"] == ano_sel].copy()
+    df_ano = df_group[df_group["Ano"] == ano_sel]
     if df_ano.empty:
         st.info("Sem dados para o ano selecionado.")
     else:
-        fig_pie = px.pie(
+        chave_ano = chave_visao(versao_dataset(df), "04_recebimentos_por_setor", ano=ano_sel)
+        fig_pie = figura_em_cache(chave_ano, "pizza", lambda: px.pie(
             df_ano,
             names="segmento",
             values="ValorTotal",
             hole=0.50,
             title=f"Distribuição por setor — {ano_sel}",
-        )
-    st.plotly_chart(fig_pie, width='stretch')
+        ))
+    with etapa("st.plotly_chart"):
+        st.plotly_chart(fig_pie, width='stretch')
 
 # --- Tabela ---
 with st.expander("◆ Ver tabela por ano e setor"):
@@ -76,4 +79,5 @@ with st.expander("◆ Ver tabela por ano e setor"):
                .fillna(0.0)
                .sort_index(axis=1)  # ordena colunas alfabeticamente
     )
-    st.dataframe(tabela, width='stretch')
+    with etapa("st.dataframe"):
+        st.dataframe(tabela, width='stretch')
@@ -0,0 +1,144 @@
+"""
+Benchmark do conversor de moeda pt-BR (propegi_core.moeda.br_para_float).
+
+Compara a versão vetorizada com a conversão antiga linha a linha (.apply) e
+mostra linhas/segundo. Uso, a partir da raiz do repositório:
+
+    python benchmarks/bench_moeda.py --linhas 1000000
+"""
+from __future__ import annotations
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from propegi_core.moeda import br_para_float, br_para_float_com_invalidos  # noqa: E402
+
+
+def _to_float_antigo(valor):
+    """Conversão antiga, aplicada linha a linha (referência do benchmark)."""
+    if valor is None:
+        return 0.0
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    txt = str(valor).strip().replace(".", "").replace(",", ".")
+    try:
+        return float(txt)
+    except ValueError:
+        return 0.0
+
+
+def _converter_valor_br_para_float_antigo(valor_str):
+    """Conversão antiga do Modelo (data_utils.converter_valor_br_para_float)."""
+    if valor_str is None or valor_str == "":
+        return 0.0
+    if isinstance(valor_str, (int, float)):
+        return float(valor_str)
+    valor_limpo = str(valor_str).replace(".", "").replace(",", ".")
+    try:
+        return float(valor_limpo)
+    except ValueError:
+        return 0.0
+
+
+def _br_to_float_antigo(serie: pd.Series) -> pd.Series:
+    """Conversão antiga do PDT (data_utils._br_to_float), já com Series.str."""
+    if pd.api.types.is_numeric_dtype(serie):
+        return serie.astype(float)
+    serie = serie.fillna("0").astype(str).str.strip().str.replace(r"[^\d\.\,]", "", regex=True)
+    serie = serie.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(serie, errors="coerce").fillna(0.0)
+
+
+# Casos-limite e com quais conversores antigos o novo precisa concordar
+# (F = Financeiro _to_float, M = Modelo, P = PDT; o PDT tirava '-', 'e' e '.' de números soltos)
+# (valor, conversores antigos que devem concordar, se br_para_float_com_invalidos o marca como lixo)
+CASOS_LIMITE = [
+    ("12345678901234567890,00", "FMP", False),
+    ("1e5", "FM", False),
+    (float("nan"), "FM", False),
+    (None, "FMP", False),
+    ("", "FMP", False),
+    ("32.617,27", "FMP", False),
+    ("-5,00", "FM", False),
+    ("+5", "FM", False),
+    ("N/D", "FMP", True),
+    (1234.5, "FM", False),
+    # 'R$' e espaços fora das pontas são lixo (o regex do PDT antigo os apagava)
+    ("5R", "FM", True),
+    ("$5", "FM", True),
+    ("1 234", "FM", True),
+    ("- 5", "FM", True),
+    ("RRR", "FMP", True),
+]
+
+
+def conferir_casos_limite() -> None:
+    """Compara br_para_float com os três conversores antigos nos CASOS_LIMITE e confere a máscara de lixo."""
+    serie = pd.Series([v for v, _, _ in CASOS_LIMITE], dtype=object)
+    obtido, invalidos = br_para_float_com_invalidos(serie)
+    obtido = obtido.to_numpy()
+    antigos = {
+        "F": serie.map(_to_float_antigo, na_action=None).to_numpy(dtype=float),
+        "M": serie.map(_converter_valor_br_para_float_antigo, na_action=None).to_numpy(dtype=float),
+        "P": _br_to_float_antigo(serie).to_numpy(dtype=float),
+    }
+    for i, (valor, conversores, invalido) in enumerate(CASOS_LIMITE):
+        for c in conversores:
+            assert np.allclose(obtido[i], antigos[c][i], equal_nan=True), (
+                f"{valor!r}: {obtido[i]} (novo) != {antigos[c][i]} ({c})"
+            )
+        assert invalidos[i] == invalido, f"{valor!r}: inválido={invalidos[i]}, esperado {invalido}"
+
+
+def gerar_valores(n: int, seed: int = 42) -> pd.Series:
+    """Gera n valores no formato do export: '35.184,99', alguns None, números soltos e lixo."""
+    rng = np.random.default_rng(seed)
+    centavos = rng.integers(0, 500_000_00, size=n)
+    reais = centavos // 100
+    txt = pd.Series(reais).map("{:,}".format).str.replace(",", ".", regex=False)
+    txt = txt + "," + pd.Series(centavos % 100).astype(str).str.zfill(2)
+    serie = txt.astype(object)
+    sorteio = rng.random(n)
+    serie[sorteio < 0.01] = None
+    serie[(sorteio >= 0.01) & (sorteio < 0.015)] = "N/D"
+    serie[(sorteio >= 0.015) & (sorteio < 0.02)] = 1234.5
+    return serie
+
+
+def _medir(func, serie: pd.Series, repeticoes: int) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        func(serie)
+        melhor = min(melhor, time.perf_counter() - t0)
+    return melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    conferir_casos_limite()
+    serie = gerar_valores(args.linhas)
+    # Confere que as duas versões concordam antes de medir
+    esperado = serie.apply(_to_float_antigo).fillna(0.0)
+    obtido = br_para_float(serie)
+    assert np.allclose(esperado.to_numpy(), obtido.to_numpy()), "resultados divergentes"
+
+    t_vet = _medir(br_para_float, serie, args.repeticoes)
+    t_apply = _medir(lambda s: s.apply(_to_float_antigo), serie, args.repeticoes)
+    print(f"linhas: {args.linhas:,}")
+    print(f"br_para_float (vetorizado): {t_vet:.3f}s  ({args.linhas / t_vet:,.0f} linhas/s)")
+    print(f".apply(_to_float) (antigo): {t_apply:.3f}s  ({args.linhas / t_apply:,.0f} linhas/s)")
+    print(f"ganho: {t_apply / t_vet:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
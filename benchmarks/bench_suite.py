@@ -0,0 +1,309 @@
+"""
+Suíte de benchmarks dos três dashboards sobre JSON sintético (benchmarks/geradores.py).
+
+Mede, por domínio e tamanho, a leitura do JSON, a normalização, os filtros e as
+agregações de cada página (melhor de N repetições) e grava o resultado num JSON de
+linha de base, com o commit em que rodou. Com --comparar, mostra a razão atual/base
+de cada etapa e sai com código 1 se alguma ficou mais lenta que a tolerância.
+
+Uso, a partir da raiz do repositório:
+
+    python benchmarks/bench_suite.py --tamanhos 1k 100k --gravar base.json
+    # ... depois da mudança:
+    python benchmarks/bench_suite.py --tamanhos 1k 100k --comparar base.json
+    # ou só comparar duas execuções gravadas:
+    python benchmarks/bench_suite.py --comparar base.json novo.json
+
+Os JSON gerados ficam em --dados (padrão: pasta temporária) e são reaproveitados
+entre execuções. 1m/10m geram arquivos de ~0,6/6 GB; Modelo e PDT leem o arquivo
+inteiro de uma vez (como os apps), então 10m precisa de bastante memória.
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+_RAIZ = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(_RAIZ))
+from geradores import GERADORES, arquivo_sintetico, tamanho  # noqa: E402
+from propegi_core.esquema import ESQUEMA_MODELO, ESQUEMA_PDT, normalizar  # noqa: E402
+from propegi_core.heatmap import recorte_heatmap  # noqa: E402
+from propegi_core.memo import limpar_memo  # noqa: E402
+from propegi_core.paginacao import paginar  # noqa: E402
+
+# Versão do formato do JSON de resultados
+FORMATO = 1
+# Etapas abaixo deste tempo (s) não contam como regressão: é ruído de medição
+PISO_RUIDO = 0.002
+LINHAS_POR_PAGINA = 50
+
+
+def _importar(nome: str, caminho: Path):
+    """Importa um data_utils pelo caminho (os três apps usam o mesmo nome de módulo)."""
+    spec = importlib.util.spec_from_file_location(nome, caminho)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+fin = _importar("financeiro_data_utils", _RAIZ / "PROPEGI Financeiro" / "data_utils.py")
+mod = _importar("modelo_data_utils", _RAIZ / "PROPEGI Financeiro - Modelo" / "data_utils.py")
+pdt = _importar("pdt_data_utils", _RAIZ / "Projeto de Desenvolvimento Tecnologico" / "data_utils.py")
+
+
+class Medidor:
+    """Guarda o melhor tempo de cada etapa e devolve o resultado da última execução."""
+
+    def __init__(self, repeticoes: int) -> None:
+        self.repeticoes = repeticoes
+        self.tempos: dict[str, float | None] = {}
+
+    def __call__(self, etapa: str, func: Callable, antes: Callable[[], None] | None = None):
+        """Roda func() `repeticoes` vezes; antes() (ex.: limpar_memo) roda fora da medição."""
+        melhor = float("inf")
+        resultado = None
+        for _ in range(self.repeticoes):
+            if antes is not None:
+                antes()
+            t0 = time.perf_counter()
+            resultado = func()
+            melhor = min(melhor, time.perf_counter() - t0)
+        self.tempos[etapa] = melhor
+        return resultado
+
+    def pular(self, etapa: str) -> None:
+        self.tempos[etapa] = None
+
+
+def _ler_registros(caminho: Path) -> pd.DataFrame:
+    with open(caminho, "r", encoding="utf-8") as f:
+        return pd.DataFrame(json.load(f))
+
+
+def _anos_recentes(serie: pd.Series, quantos: int) -> list[int]:
+    return sorted(int(a) for a in serie.dropna().unique())[-quantos:]
+
+
+def bench_financas(caminho: Path, medir: Medidor) -> None:
+    # Acima do limite o app lê em streaming: o DataFrame cru inteiro nem chega a existir
+    if caminho.stat().st_size <= fin.LIMITE_STREAMING_BYTES:
+        bruto = medir("ler_json", lambda: _ler_registros(caminho))
+        medir("normalizar", lambda: fin._normalize_financas_df(bruto))
+        del bruto
+    else:
+        medir.pular("ler_json")
+        medir.pular("normalizar")
+    df = medir("carregar", lambda: fin.carregar_financas_json(caminho, usar_cache_disco=False))
+    df.attrs["versao"] = ("bench", str(caminho))
+
+    cubo = medir("cubo", lambda: fin.construir_cubo(df))
+    anos = _anos_recentes(cubo["Ano"], 3)
+    projetos = sorted(cubo["Projetos"].unique().tolist())[:5]
+    medir("filtrar_indice", lambda: fin.filtrar(cubo, anos, None), antes=limpar_memo)
+    filt = medir("filtrar", lambda: fin.filtrar(cubo, anos, None))
+    medir("filtrar_linhas", lambda: fin.filtrar(df, anos, projetos))
+    medir("buscar_projeto", lambda: fin.projetos_por_nome(cubo, "sustent"), antes=limpar_memo)
+    medir("validar", lambda: fin.relatorio_financas(df), antes=limpar_memo)
+
+    def _pagina_01():
+        tabela = fin.pivot_projetos_meses(filt)
+        recorte_heatmap(tabela, (0, tabela.shape[0]))
+        faixa = paginar(range(tabela.shape[0]), 1, LINHAS_POR_PAGINA)
+        pagina = tabela.densificar((faixa.start, faixa.stop))
+        pagina["Total"] = tabela.total_linhas()[faixa.start:faixa.stop]
+        return pagina
+
+    medir("01_heatmap", _pagina_01)
+    medir("02_somatorio", lambda: fin.soma_por_projeto(filt))
+    medir("03_total_mensal", lambda: fin.total_mensal(filt))
+    medir("04_mensal_taxa_plano", lambda: [
+        fin.mensal_por(filt, ["Taxa"]),
+        fin.mensal_por(filt, ["Plano de Trabalho"]),
+        fin.mensal_por(filt, ["Taxa", "Plano de Trabalho"]),
+    ])
+    medir("05_periodo_taxa_plano", lambda: [
+        fin.total_por(filt, ["Taxa"], por_total=True),
+        fin.total_por(filt, ["Plano de Trabalho"], por_total=True),
+        fin.total_por(filt, ["Taxa", "Plano de Trabalho"]),
+    ])
+    medir("ultimos_5", lambda: fin.ultimos_registros(df, 5), antes=limpar_memo)
+    hist = medir("histogramas_prazos", lambda: fin.histogramas_prazos(df), antes=limpar_memo)
+    medir("06_prazos_pagamento", lambda: [
+        fin.selecionar_prazos(hist, anos, None, None).resumo_por([], m) for m in hist.celulas
+    ] + [fin.resumo_prazos_mensal(fin.selecionar_prazos(hist, anos, None, None), "Dias em atraso")])
+
+
+def bench_modelo(caminho: Path, medir: Medidor) -> None:
+    bruto = medir("ler_json", lambda: _ler_registros(caminho))
+    medir("normalizar", lambda: normalizar(bruto, ESQUEMA_MODELO))
+    del bruto
+    df = medir("carregar", lambda: mod._ler_dados([caminho]))
+    df.attrs["versao"] = ("bench", str(caminho))
+
+    anos = _anos_recentes(df["ano"], 2)
+    projeto = df["nomeProjeto"].iloc[0]
+    medir("filtrar_indice", lambda: mod.filtrar(df, anos), antes=limpar_memo)
+    filt = medir("filtrar", lambda: mod.filtrar(df, anos))
+    filt_projeto = medir("filtrar_projeto", lambda: mod.filtrar(df, anos, [projeto]))
+    medir("buscar_projeto", lambda: mod.projetos_por_nome(df, "0001"), antes=limpar_memo)
+
+    def _pagina_01():
+        tabela = mod.pivot_projetos_meses(filt)
+        recorte_heatmap(tabela, (0, tabela.shape[0]))
+        faixa = paginar(range(tabela.shape[0]), 1, LINHAS_POR_PAGINA)
+        pagina = tabela.densificar((faixa.start, faixa.stop))
+        pagina["Total"] = tabela.total_linhas()[faixa.start:faixa.stop]
+        return pagina
+
+    medir("01_heatmap", _pagina_01)
+    medir("02_somatorio", lambda: mod.soma_por_projeto(filt))
+    medir("03_evolucao_mensal", lambda: mod.total_mensal(filt))
+    medir("04_mensal_taxa_plano", lambda: mod.tabela_mensal_categoria(mod.mensal_por_categoria(filt_projeto)))
+    medir("05_acumulado_taxa_plano", lambda: mod.tabela_acumulado_categoria(mod.acumulado_por_categoria(filt)))
+
+
+def bench_pdt(caminho: Path, medir: Medidor) -> None:
+    bruto = medir("ler_json", lambda: pdt.carregar_json(caminho))
+    norm = medir("normalizar", lambda: normalizar(bruto, ESQUEMA_PDT, pdt.preparar_datas))
+    del bruto
+    imputado = medir("imputar_ano", lambda: pdt.compactar_projetos(pdt.imputar_data_projeto(norm)))
+    df = medir("compactar", lambda: pdt.compactar_projetos(norm))
+    del norm
+
+    ano = _anos_recentes(df["Ano"], 1)[0]
+    medir("filtrar", lambda: df[df["Ano"] == ano])
+    medir("01_recebimentos_mensais", lambda: pdt.kpis_anuais(pdt.agrupar_mensal(df, ano)))
+    medir("02_projetos_por_segmento", lambda: [
+        pdt.projetos_por_ano_segmento(imputado),
+        pdt.acordos_recentes(imputado),
+    ])
+    medir("03_recebimentos_anuais", lambda: pdt.recebimentos_anuais(df))
+    medir("04_recebimentos_por_setor", lambda: pdt.recebimentos_por_setor(df))
+
+
+BENCHES: dict[str, Callable[[Path, Medidor], None]] = {
+    "financas": bench_financas,
+    "modelo": bench_modelo,
+    "pdt": bench_pdt,
+}
+
+
+def _git(*args: str) -> str | None:
+    try:
+        saida = subprocess.run(["git", *args], cwd=_RAIZ, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return saida.stdout.strip()
+
+
+def executar(dominios: list[str], tamanhos: list[int], repeticoes: int, seed: int, pasta_dados: Path) -> dict:
+    """Roda os benchmarks e devolve o dicionário gravado como linha de base."""
+    resultados: dict[str, dict[str, dict[str, float | None]]] = {}
+    for dominio in dominios:
+        for n in tamanhos:
+            caminho = arquivo_sintetico(dominio, n, pasta_dados, seed)
+            medir = Medidor(repeticoes)
+            limpar_memo()
+            BENCHES[dominio](caminho, medir)
+            resultados.setdefault(dominio, {})[str(n)] = medir.tempos
+            _imprimir_execucao(dominio, n, medir.tempos)
+    limpar_memo()
+
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "formato": FORMATO,
+        "commit": _git("rev-parse", "--short", "HEAD"),
+        "alteracoes_locais": bool(status) if status is not None else None,
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "maquina": f"{platform.system()} {platform.machine()}",
+        "seed": seed,
+        "repeticoes": repeticoes,
+        "resultados": resultados,
+    }
+
+
+def _fmt(segundos: float | None) -> str:
+    return "—" if segundos is None else f"{segundos * 1000:,.1f} ms"
+
+
+def _imprimir_execucao(dominio: str, n: int, tempos: dict[str, float | None]) -> None:
+    print(f"\n{dominio} — {n:,} linhas")
+    for etapa, t in tempos.items():
+        print(f"  {etapa:<28}{_fmt(t):>14}")
+
+
+def comparar(base: dict, atual: dict, tolerancia: float) -> bool:
+    """Imprime atual/base por etapa; True se alguma etapa passou de 1 + tolerancia."""
+    print(f"\nbase: {base.get('commit')} ({base.get('data')})   atual: {atual.get('commit')} ({atual.get('data')})")
+    if base.get("seed") != atual.get("seed"):
+        print(f"⚠ sementes diferentes ({base.get('seed')} x {atual.get('seed')}): dados não são os mesmos")
+    regrediu = False
+    for dominio, por_tamanho in atual["resultados"].items():
+        for n, tempos in por_tamanho.items():
+            anteriores = base.get("resultados", {}).get(dominio, {}).get(n)
+            if anteriores is None:
+                continue
+            titulo = f"{dominio} — {int(n):,} linhas"
+            print(f"\n{titulo:<38}{'base':>14}{'atual':>14}{'razão':>9}")
+            for etapa, t in tempos.items():
+                t0 = anteriores.get(etapa)
+                if t is None or t0 is None:
+                    print(f"  {etapa:<36}{_fmt(t0):>14}{_fmt(t):>14}")
+                    continue
+                razao = t / t0 if t0 else float("inf")
+                pior = razao > 1 + tolerancia and t >= PISO_RUIDO
+                regrediu |= pior
+                print(f"  {etapa:<36}{_fmt(t0):>14}{_fmt(t):>14}{razao:>8.2f}x{'  ⚠' if pior else ''}")
+    return regrediu
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dominios", nargs="+", choices=sorted(GERADORES), default=sorted(GERADORES))
+    parser.add_argument("--tamanhos", nargs="+", type=tamanho, default=[1_000, 100_000],
+                        help="1k, 100k, 1m, 10m ou inteiros (padrão: 1k 100k)")
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dados", type=Path, default=Path(tempfile.gettempdir()) / "propegi_bench",
+                        help="pasta dos JSON sintéticos (reaproveitados entre execuções)")
+    parser.add_argument("--gravar", type=Path, help="grava o resultado neste JSON")
+    parser.add_argument("--comparar", type=Path, nargs="+", metavar="JSON",
+                        help="linha de base (e, opcionalmente, um segundo resultado já gravado no lugar de rodar)")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="razão acima de 1 + tolerância conta como regressão (padrão: 0.10)")
+    args = parser.parse_args()
+    if args.comparar and len(args.comparar) > 2:
+        parser.error("--comparar aceita no máximo dois arquivos")
+
+    if args.comparar and len(args.comparar) == 2:
+        atual = json.loads(args.comparar[1].read_text(encoding="utf-8"))
+    else:
+        atual = executar(args.dominios, args.tamanhos, args.repeticoes, args.seed, args.dados)
+
+    if args.gravar:
+        args.gravar.parent.mkdir(parents=True, exist_ok=True)
+        args.gravar.write_text(json.dumps(atual, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nresultado gravado em {args.gravar}")
+
+    if args.comparar:
+        base = json.loads(args.comparar[0].read_text(encoding="utf-8"))
+        if comparar(base, atual, args.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Geradores sintéticos (com semente) de JSON no formato dos três domínios, para os benchmarks.
+
+- financas: registros do Financas.json (PROPEGI Financeiro)
+- modelo:   registros do dados.json (PROPEGI Financeiro - Modelo)
+- pdt:      registros do JSON de Projetos de Desenvolvimento Tecnológico
+
+Os valores seguem o export real: moeda pt-BR ('35.184,99'), datas 'dd/mm/aaaa'
+(Financeiro) ou ISO (PDT), meses por extenso. Uma fração pequena vem com nulos e
+lixo ('N/D', '', 'R$ ...', números soltos, meses sem acento, datas em outro formato),
+para medir também os caminhos de erro. Mesma semente -> mesmo arquivo.
+
+Os registros são gerados e gravados em blocos (array JSON de topo), então 10M de
+linhas não precisam caber em memória como lista de dicts. Uso:
+
+    python benchmarks/geradores.py financas 100k --saida /tmp/financas_100k.json
+"""
+from __future__ import annotations
+import argparse
+import sys
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from propegi_core.meses import MESES_NOME  # noqa: E402
+
+# Tamanhos nomeados aceitos pela linha de comando (e pelo bench_suite.py)
+TAMANHOS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Registros gerados por vez (cada bloco tem sua própria semente derivada)
+_BLOCO = 200_000
+
+_NOMES_MES = np.array([MESES_NOME[m] for m in range(1, 13)], dtype=object)
+_SEM_ACENTO = str.maketrans("ÁÂÃÉÊÍÓÔÕÚÇáâãéêíóôõúç", "AAAEEIOOOUCaaaeeiooouc")
+
+_PREFIXOS = ["Projeto de Extensão", "Programa de Inovação", "Laboratório de", "Núcleo de Pesquisa em", "Observatório de"]
+_TEMAS = ["Cidadania Ativa", "Sustentabilidade", "Saúde Digital", "Energias Renováveis", "Educação Básica", "Mobilidade Urbana"]
+_SEGMENTOS = ["Tecnologia da Informação", "Gestão Municipal", "Indústria de Embalagens", "Saúde", "Energia", "Construção Civil", "Agronegócio"]
+_STATUS_PDT = ["🔄 Em Andamento", "🚨 A Vencer", "➕📝 Em Aditivação", "✅ Concluído", "⏸️ Suspenso"]
+
+
+def tamanho(texto: str) -> int:
+    """'100k' -> 100000; aceita os nomes de TAMANHOS ou um inteiro."""
+    chave = texto.strip().lower()
+    return TAMANHOS[chave] if chave in TAMANHOS else int(chave.replace("_", ""))
+
+
+def _sorteio(rng: np.random.Generator, n: int, fracoes: list[float]) -> list[np.ndarray]:
+    """Máscaras disjuntas com as frações dadas (ex.: [0.01, 0.005] -> 1% e 0.5% das linhas)."""
+    u = rng.random(n)
+    limites = np.cumsum([0.0, *fracoes])
+    return [(u >= a) & (u < b) for a, b in zip(limites[:-1], limites[1:])]
+
+
+def _formatar_br(centavos: np.ndarray) -> np.ndarray:
+    """Centavos (int) -> '35.184,99'."""
+    reais = pd.Series(centavos // 100).map("{:,}".format).str.replace(",", ".", regex=False)
+    txt = reais + "," + pd.Series(centavos % 100).astype(str).str.zfill(2)
+    return txt.to_numpy(dtype=object)
+
+
+def valores_br(rng: np.random.Generator, n: int, maximo: float = 50_000.0) -> np.ndarray:
+    """
+    Valores monetários como no export: '35.184,99' e, em ~4% das linhas, o que aparece
+    de errado na planilha — None, 'N/D', '', '-', números soltos, 'R$ 1.234,56',
+    negativos e texto com duas vírgulas.
+    """
+    centavos = rng.integers(0, int(maximo * 100), size=n)
+    out = _formatar_br(centavos)
+    nulo, nd, vazio, traco, numero, prefixo, negativo, quebrado = _sorteio(
+        rng, n, [0.01, 0.005, 0.005, 0.003, 0.005, 0.005, 0.003, 0.004]
+    )
+    out[nulo] = None
+    out[nd] = "N/D"
+    out[vazio] = ""
+    out[traco] = "-"
+    out[numero] = (centavos[numero] / 100).tolist()
+    out[prefixo] = "R$ " + out[prefixo].astype(str)
+    out[negativo] = "-" + out[negativo].astype(str)
+    out[quebrado] = out[quebrado].astype(str) + ",00"
+    return out
+
+
+def _nomes_mes(rng: np.random.Generator, numero_mes: np.ndarray) -> np.ndarray:
+    """'Janeiro'...; alguns em caixa alta, sem acento ('Marco') ou nulos."""
+    nomes = _NOMES_MES[numero_mes - 1]
+    alta, sem_acento, nulo = _sorteio(rng, len(nomes), [0.005, 0.01, 0.002])
+    nomes[alta] = [s.upper() for s in nomes[alta]]
+    nomes[sem_acento] = [s.translate(_SEM_ACENTO) for s in nomes[sem_acento]]
+    nomes[nulo] = None
+    return nomes
+
+
+def _datas(
+    rng: np.random.Generator,
+    dias: np.ndarray,
+    formato: str,
+    fracao_nula: float = 0.02,
+) -> np.ndarray:
+    """
+    Datas (dias desde 1970-01-01) no formato dado; uma parte nula, vazia, inexistente
+    ('31/02/2024') ou no formato errado (ISO no lugar de dd/mm/aaaa e vice-versa).
+    """
+    # strftime só nos dias distintos (poucos milhares), depois expande para as linhas
+    distintos, posicao = np.unique(dias, return_inverse=True)
+    datas = pd.to_datetime(distintos, unit="D")
+    out = datas.strftime(formato).to_numpy(dtype=object)[posicao]
+    nulo, vazio, inexistente, outro = _sorteio(rng, len(out), [fracao_nula, 0.005, 0.002, 0.003])
+    outro_formato = "%Y-%m-%d" if formato != "%Y-%m-%d" else "%d/%m/%Y"
+    out[outro] = datas.strftime(outro_formato).to_numpy(dtype=object)[posicao[outro]]
+    out[nulo] = None
+    out[vazio] = ""
+    out[inexistente] = "31/02/2024" if formato == "%d/%m/%Y" else "2024-02-31"
+    return out
+
+
+def _dias_do_mes(ano: np.ndarray, numero_mes: np.ndarray, dia: int) -> np.ndarray:
+    inicio_mes = (np.asarray((ano - 1970) * 12 + numero_mes - 1, dtype="int64")).astype("datetime64[M]")
+    return inicio_mes.astype("datetime64[D]").astype("int64") + (dia - 1)
+
+
+def _codigos(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Números SEI no formato '7944644-9'."""
+    numero = pd.Series(rng.integers(1_000_000, 9_999_999, size=n)).astype(str)
+    return (numero + "-" + pd.Series(rng.integers(0, 10, size=n)).astype(str)).to_numpy(dtype=object)
+
+
+def _nomes_projetos(n_proj: int) -> np.ndarray:
+    i = np.arange(n_proj)
+    prefixo = np.array(_PREFIXOS, dtype=object)[i % len(_PREFIXOS)]
+    tema = np.array(_TEMAS, dtype=object)[(i // len(_PREFIXOS)) % len(_TEMAS)]
+    return (pd.Series(prefixo) + " " + pd.Series(tema) + " " + pd.Series(i + 1).map("{:05d}".format)).to_numpy(dtype=object)
+
+
+def _n_projetos(n: int, linhas_por_projeto: int) -> int:
+    """Quantidade de projetos do dataset inteiro (não do bloco), entre 5 e 50 mil."""
+    return int(np.clip(n // linhas_por_projeto, 5, 50_000))
+
+
+def _bloco_financas(rng: np.random.Generator, m: int, n: int) -> pd.DataFrame:
+    n_proj = _n_projetos(n, 120)
+    proj = rng.integers(0, n_proj, size=m)
+    ids = pd.Series(np.arange(1, n_proj + 1)).map("PROJ-{:05d}".format).to_numpy(dtype=object)
+
+    ano = rng.integers(2020, 2026, size=m)
+    numero_mes = rng.integers(1, 13, size=m)
+    dia_limite = _dias_do_mes(ano, numero_mes, 20)
+    empenho = dia_limite + rng.integers(-10, 40, size=m)
+    liquidacao = empenho + rng.integers(0, 30, size=m)
+    ob = liquidacao + rng.integers(0, 15, size=m)
+
+    # Número do mês que não bate com o nome em 0.2% das linhas; Ano nulo em 0.1%
+    numero_registrado = numero_mes.astype(object)
+    divergente, = _sorteio(rng, m, [0.002])
+    numero_registrado[divergente] = (numero_mes[divergente] % 12 + 1).tolist()
+    ano_registrado = ano.astype(object)
+    ano_nulo, = _sorteio(rng, m, [0.001])
+    ano_registrado[ano_nulo] = None
+
+    taxa = rng.choice(np.array(["Taxa A", "Taxa B", "Taxa C", None], dtype=object), size=m, p=[0.33, 0.33, 0.335, 0.005])
+    plano = rng.choice(np.array(["Plano 1", "Plano 2", "Plano 3", None], dtype=object), size=m, p=[0.33, 0.33, 0.335, 0.005])
+    limite_txt = _datas(rng, dia_limite, "%d/%m/%Y", 0.0)
+
+    return pd.DataFrame({
+        "Projeto_ID": ids[proj],
+        "Projetos": _nomes_projetos(n_proj)[proj],
+        "Projeto de Origem": "PROPEGI Financeiro",
+        "Ano": ano_registrado,
+        "Mês": _nomes_mes(rng, numero_mes),
+        "Número do mês": numero_registrado,
+        "Trimestre": "Q" + pd.Series((numero_mes - 1) // 3 + 1).astype(str).to_numpy(dtype=object),
+        "Status": rng.choice(np.array(["Concluído", "Em andamento", "Pendente", "Atrasado"], dtype=object), size=m),
+        "Valor da folha": valores_br(rng, m),
+        "Recurso": rng.choice(np.array(["Tesouro", "Convênio", "Recursos Próprios"], dtype=object), size=m),
+        "SEI mãe": _codigos(rng, m),
+        "SEI": _codigos(rng, m),
+        "Data limite para empenho": limite_txt,
+        "Data limite para liquidação": limite_txt,
+        "Data limite de PD": limite_txt,
+        "Empenhada em": _datas(rng, empenho, "%d/%m/%Y"),
+        "Liquidada em": _datas(rng, liquidacao, "%d/%m/%Y", 0.05),
+        "OB emitida em": _datas(rng, ob, "%d/%m/%Y", 0.08),
+        "Dias em atraso": np.maximum(ob - dia_limite, 0),
+        "Sub-issues progress": pd.Series(rng.integers(0, 101, size=m) / 100).map("{:.2f}".format).to_numpy(dtype=object),
+        "DataCompleta": _datas(rng, _dias_do_mes(ano, numero_mes, 1), "%d/%m/%Y", 0.0),
+        "Taxa": taxa,
+        "Plano de Trabalho": plano,
+    })
+
+
+def _bloco_modelo(rng: np.random.Generator, m: int, n: int) -> pd.DataFrame:
+    n_proj = _n_projetos(n, 24)
+    proj = rng.integers(0, n_proj, size=m)
+    ids = pd.Series(np.arange(n_proj)).map("PVTI_{:012X}".format).to_numpy(dtype=object)
+    nomes = pd.Series(np.arange(n_proj)).map("SCJ - 0040608319.{:06d}/2025-92".format).to_numpy(dtype=object)
+    numero_mes = rng.integers(1, 13, size=m)
+    nome_mes = _NOMES_MES[numero_mes - 1]
+    # o Modelo exige o nome do mês (numeroMes vem dele): aqui só variações de caixa/acento
+    alta, sem_acento = _sorteio(rng, m, [0.005, 0.01])
+    nome_mes[alta] = [s.upper() for s in nome_mes[alta]]
+    nome_mes[sem_acento] = [s.translate(_SEM_ACENTO) for s in nome_mes[sem_acento]]
+    return pd.DataFrame({
+        "projetoId": ids[proj],
+        "nomeProjeto": nomes[proj],
+        "status": rng.choice(np.array(["Resources", "Active", "Done"], dtype=object), size=m),
+        "ano": rng.integers(2022, 2026, size=m).astype(str).astype(object),
+        "mes": nome_mes,
+        "valorDaFolha": valores_br(rng, m, 10_000.0),
+        "categoriaDoRecurso": rng.choice(np.array(["Taxa", "Plano de Trabalho"], dtype=object), size=m),
+        "categoriaDaFolha": rng.choice(np.array(["Aluno", "Coordenação", "Professor", "Técnico"], dtype=object), size=m),
+    })
+
+
+def _bloco_pdt(rng: np.random.Generator, m: int, n: int) -> pd.DataFrame:
+    ano = rng.integers(2021, 2026, size=m)
+    inicio = _dias_do_mes(ano, rng.integers(1, 13, size=m), 1)
+    publicacao = inicio + rng.integers(-60, 60, size=m)
+    termino = inicio + rng.integers(180, 730, size=m)
+
+    sequencia = pd.Series(rng.integers(1, 200, size=m)).map("{:03d}".format)
+    acordo = (sequencia + rng.choice(np.array(["-", "/"], dtype=object), size=m, p=[0.8, 0.2]) + pd.Series(ano).astype(str)).to_numpy(dtype=object)
+    sem_acordo, sem_numero = _sorteio(rng, m, [0.2, 0.01])
+    acordo[sem_acordo] = None
+    acordo[sem_numero] = "s/n"
+
+    empresas = np.array([f"Empresa {i:04d} Ltda" for i in range(max(5, min(n // 5, 5_000)))], dtype=object)
+    coordenadores = np.array([f"Coordenador(a) {i:03d}" for i in range(max(5, min(n // 20, 500)))], dtype=object)
+    return pd.DataFrame({
+        "projetoId": pd.Series(rng.integers(0, 16**12, size=m)).map("PVTI_{:012x}".format).to_numpy(dtype=object),
+        "nomeProjeto": pd.Series(rng.integers(0, max(5, n), size=m)).map("Desenvolvimento tecnológico {:06d}".format).to_numpy(dtype=object),
+        "segmento": rng.choice(np.array([*_SEGMENTOS, None], dtype=object), size=m, p=[0.12] * 7 + [0.16]),
+        "status": rng.choice(np.array(_STATUS_PDT, dtype=object), size=m),
+        "intervenienciaComOIAUPE": rng.choice(np.array(["Sim", "Não", None], dtype=object), size=m, p=[0.85, 0.13, 0.02]),
+        "convenioOuAcordo": rng.choice(np.array(["Acordo PD&I", "Convênio", None], dtype=object), size=m, p=[0.78, 0.2, 0.02]),
+        "edital": rng.choice(np.array(["Não", None], dtype=object), size=m, p=[0.85, 0.15]),
+        "acordoConvenioNumero": acordo,
+        "aditivoNumero": rng.choice(np.array([None, "001-2024", "002-2025"], dtype=object), size=m, p=[0.88, 0.08, 0.04]),
+        "tipoDeAditivo": rng.choice(np.array([None, "Prazo", "De prazo", "Valor"], dtype=object), size=m, p=[0.88, 0.06, 0.04, 0.02]),
+        "empresa": empresas[rng.integers(0, len(empresas), size=m)],
+        "cnpj": pd.Series(rng.integers(0, 10**8, size=m)).map("{:08d}/0001-00".format).to_numpy(dtype=object),
+        "coordenador": coordenadores[rng.integers(0, len(coordenadores), size=m)],
+        "valorPactuado": valores_br(rng, m, 1_000_000.0),
+        "valorRepassado": valores_br(rng, m, 700_000.0),
+        "valorExecutado": valores_br(rng, m, 300_000.0),
+        "valorAgencia": valores_br(rng, m, 40_000.0),
+        "valorUnidade": valores_br(rng, m, 40_000.0),
+        "valorIAUPE": valores_br(rng, m, 120_000.0),
+        "dataPublicacao": _datas(rng, publicacao, "%Y-%m-%d", 0.35),
+        "inicioData": _datas(rng, inicio, "%Y-%m-%d", 0.15),
+        "terminoData": _datas(rng, termino, "%Y-%m-%d", 0.15),
+    })
+
+
+GERADORES: dict[str, Callable[[np.random.Generator, int, int], pd.DataFrame]] = {
+    "financas": _bloco_financas,
+    "modelo": _bloco_modelo,
+    "pdt": _bloco_pdt,
+}
+
+
+def gerar_blocos(dominio: str, n: int, seed: int = 42, bloco: int = _BLOCO):
+    """Gera os n registros do domínio em DataFrames de até `bloco` linhas (valores crus, como no JSON)."""
+    gerar = GERADORES[dominio]
+    for i, inicio in enumerate(range(0, n, bloco)):
+        rng = np.random.default_rng([seed, i])
+        yield gerar(rng, min(bloco, n - inicio), n)
+
+
+def gravar_json(dominio: str, n: int, destino: str | Path, seed: int = 42) -> Path:
+    """Grava os n registros do domínio como array JSON de topo (UTF-8, sem escapar acentos)."""
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    parcial = destino.with_name(destino.name + ".parcial")
+    with open(parcial, "w", encoding="utf-8") as f:
+        f.write("[")
+        primeiro = True
+        for df in gerar_blocos(dominio, n, seed):
+            texto = df.to_json(orient="records", force_ascii=False)[1:-1]
+            if not texto:
+                continue
+            f.write(("" if primeiro else ",\n") + texto.replace("},{", "},\n{"))
+            primeiro = False
+        f.write("]\n")
+    parcial.replace(destino)
+    return destino
+
+
+def arquivo_sintetico(dominio: str, n: int, pasta: str | Path, seed: int = 42) -> Path:
+    """Caminho do JSON sintético em `pasta`, gerando-o só se ainda não existir."""
+    destino = Path(pasta) / f"{dominio}_{n}_s{seed}.json"
+    if not destino.exists():
+        gravar_json(dominio, n, destino, seed)
+    return destino
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("dominio", choices=sorted(GERADORES))
+    parser.add_argument("linhas", type=tamanho, help="1k, 100k, 1m, 10m ou um inteiro")
+    parser.add_argument("--saida", type=Path, required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    destino = gravar_json(args.dominio, args.linhas, args.saida, args.seed)
+    print(f"{args.linhas:,} registros de {args.dominio} em {destino} ({destino.stat().st_size / 1e6:,.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
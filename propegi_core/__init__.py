@@ -0,0 +1 @@
+# Pacote com utilitários compartilhados pelos dashboards (Financeiro, Modelo e PDT)
@@ -0,0 +1,75 @@
+"""
+Armazém de datasets do processo: cada dataset normalizado fica uma vez em memória,
+compartilhado por todas as sessões/páginas (e pelos três painéis, se rodarem no
+mesmo servidor).
+
+- A versão é o fingerprint dos arquivos de origem (caminho + mtime + tamanho):
+  editar/substituir um arquivo invalida a entrada automaticamente.
+- LRU com ARMAZEM_MAX_ENTRADAS datasets; versões antigas da mesma origem saem na hora.
+- Devolve cópia rasa com df.attrs["versao"] (chave dos caches derivados).
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Hashable, Iterable
+import threading
+
+import pandas as pd
+
+from .cache_colunar import fingerprint_arquivo
+from .instrumentacao import etapa
+
+# Quantos datasets normalizados ficam em memória ao mesmo tempo (LRU)
+ARMAZEM_MAX_ENTRADAS = 8
+
+_ARMAZEM: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+_ARMAZEM_LOCK = threading.Lock()
+
+
+def carregar_versionado(
+    dominio: str,
+    fontes: Iterable[str | Path],
+    carregar: Callable[[], pd.DataFrame],
+    variante: Hashable = None,
+) -> pd.DataFrame:
+    """
+    carregar() uma vez por versão das fontes; depois devolve o dataset guardado.
+    variante distingue carregamentos diferentes das mesmas fontes (ex.: ano imputado).
+    """
+    fontes = [Path(f) for f in fontes]
+    for f in fontes:
+        if not f.exists():
+            raise FileNotFoundError(f"Arquivo não encontrado: {f.resolve()}")
+    fingerprints = tuple(fingerprint_arquivo(f) for f in fontes)
+    origem = (dominio, tuple(fp[0] for fp in fingerprints), variante)
+    chave = (dominio, fingerprints, variante)
+
+    with _ARMAZEM_LOCK:
+        df = _ARMAZEM.get(chave)
+        if df is not None:
+            _ARMAZEM.move_to_end(chave)
+
+    if df is None:
+        # Carrega fora do lock para não bloquear as outras sessões
+        with etapa(f"carregar:{dominio}") as e:
+            df = e.saida(carregar())
+        df.attrs["versao"] = chave
+        with _ARMAZEM_LOCK:
+            for k in [k for k in _ARMAZEM if (k[0], tuple(fp[0] for fp in k[1]), k[2]) == origem and k != chave]:
+                del _ARMAZEM[k]
+            df = _ARMAZEM.setdefault(chave, df)
+            _ARMAZEM.move_to_end(chave)
+            while len(_ARMAZEM) > ARMAZEM_MAX_ENTRADAS:
+                _ARMAZEM.popitem(last=False)
+
+    return df.copy(deep=False)
+
+
+def limpar_armazem(dominio: str | None = None) -> None:
+    """Descarta os datasets guardados (todos, ou só os do domínio)."""
+    with _ARMAZEM_LOCK:
+        if dominio is None:
+            _ARMAZEM.clear()
+        else:
+            for k in [k for k in _ARMAZEM if k[0] == dominio]:
+                del _ARMAZEM[k]
@@ -0,0 +1,98 @@
+"""
+Busca por trecho de nome (ex.: caixa "Filtrar por nome do projeto").
+O índice é montado uma vez por versão do dataset sobre os valores distintos da coluna
+(não sobre as linhas): nomes sem acento e em minúsculas + índice de trigramas.
+A consulta devolve os valores encontrados, que então filtram o frame pelo índice de
+valores (propegi_core.filtros), sem varrer as linhas com str.contains.
+"""
+from __future__ import annotations
+from typing import Hashable
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from .memo import memo_por_versao, versao_dataset
+
+N_GRAMA = 3
+
+
+def normalizar_texto(texto: str) -> str:
+    """Minúsculas e sem acentos ("Gestão" -> "gestao"), para comparar nomes em português."""
+    decomposto = unicodedata.normalize("NFKD", str(texto))
+    return "".join(ch for ch in decomposto if not unicodedata.combining(ch)).casefold()
+
+
+def _ngramas(texto: str) -> set[str]:
+    return {texto[i:i + N_GRAMA] for i in range(len(texto) - N_GRAMA + 1)}
+
+
+def construir_indice_busca(valores: list[Hashable]) -> dict:
+    """
+    Índice sobre valores distintos:
+    - "valores": os valores originais
+    - "normalizados": normalizar_texto de cada valor
+    - "ngramas": trigrama -> posições (em "valores") dos nomes que o contêm
+    """
+    normalizados = [normalizar_texto(v) for v in valores]
+    postagens: dict[str, list[int]] = {}
+    for i, nome in enumerate(normalizados):
+        for grama in _ngramas(nome):
+            postagens.setdefault(grama, []).append(i)
+    return {
+        "valores": list(valores),
+        "normalizados": normalizados,
+        "ngramas": {g: np.asarray(ids, dtype=np.int32) for g, ids in postagens.items()},
+    }
+
+
+def buscar(indice: dict, consulta: str) -> list[Hashable]:
+    """Valores cujo nome contém a consulta (ignorando maiúsculas e acentos)."""
+    alvo = normalizar_texto(consulta).strip()
+    if not alvo:
+        return list(indice["valores"])
+
+    normalizados = indice["normalizados"]
+    if len(alvo) < N_GRAMA:
+        candidatos = range(len(normalizados))
+    else:
+        listas = []
+        for grama in _ngramas(alvo):
+            ids = indice["ngramas"].get(grama)
+            if ids is None:
+                return []
+            listas.append(ids)
+        listas.sort(key=len)
+        candidatos = listas[0]
+        for ids in listas[1:]:
+            candidatos = np.intersect1d(candidatos, ids, assume_unique=True)
+            if not len(candidatos):
+                return []
+
+    # confirma o trecho inteiro (os trigramas só garantem as peças)
+    return [indice["valores"][i] for i in candidatos if alvo in normalizados[i]]
+
+
+def _valores_distintos(serie: pd.Series) -> list[Hashable]:
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.categories.tolist()
+    return serie.dropna().unique().tolist()
+
+
+def indice_busca(df: pd.DataFrame, coluna: str) -> dict:
+    """construir_indice_busca dos valores de df[coluna], uma vez por versão do dataset."""
+    return memo_por_versao(
+        "indice_busca:" + coluna,
+        versao_dataset(df),
+        lambda: construir_indice_busca(_valores_distintos(df[coluna])),
+    )
+
+
+def valores_que_contem(df: pd.DataFrame, coluna: str, consulta: str | None) -> list[Hashable] | None:
+    """
+    Valores distintos de df[coluna] que contêm a consulta (sem diferenciar maiúsculas/acentos).
+    Retorna None se a consulta estiver vazia (sem filtro) e [] se nada for encontrado.
+    """
+    if consulta is None or not consulta.strip():
+        return None
+    return buscar(indice_busca(df, coluna), consulta)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+from pathlib import Path
+from uuid import uuid4
+import json
+import os
+
+import pandas as pd
+
+from .instrumentacao import etapa, instrumentado
+
+try:  # pyarrow é opcional: sem ele o cache em disco fica desligado
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = None
+    feather = None
+
+# Versão do layout do arquivo de cache (mudar invalida todos os caches)
+FORMATO_CACHE = 1
+PASTA_CACHE = ".cache"
+_CHAVE_META = b"propegi"
+
+
+def fingerprint_arquivo(caminho_arquivo: str | Path) -> tuple[str, int, int]:
+    """
+    Identifica a versão de um arquivo: (caminho resolvido, mtime em ns, tamanho em bytes).
+    Qualquer alteração no arquivo gera um fingerprint diferente.
+    """
+    caminho = Path(caminho_arquivo).resolve()
+    st = caminho.stat()
+    return (str(caminho), st.st_mtime_ns, st.st_size)
+
+
+def caminho_cache(fonte: str | Path, variante: str = "") -> Path:
+    """Arquivo Feather do cache: <pasta do JSON>/.cache/<nome>[-variante].feather"""
+    fonte = Path(fonte)
+    sufixo = f"-{variante}" if variante else ""
+    return fonte.parent / PASTA_CACHE / f"{fonte.stem}{sufixo}.feather"
+
+
+def _carimbo(fonte: Path, versao_normalizacao: int) -> dict:
+    _, mtime_ns, tamanho = fingerprint_arquivo(fonte)
+    return {
+        "formato": FORMATO_CACHE,
+        "normalizacao": versao_normalizacao,
+        "fonte": {"nome": fonte.name, "mtime_ns": mtime_ns, "tamanho": tamanho},
+    }
+
+
+@instrumentado("ler_cache")
+def ler_cache(fonte: str | Path, versao_normalizacao: int, variante: str = "") -> pd.DataFrame | None:
+    """
+    Lê o DataFrame normalizado do cache (memory-map do Feather).
+    Retorna None se não houver cache válido: sem pyarrow, arquivo ausente/corrompido,
+    JSON de origem alterado ou versão da normalização diferente.
+    """
+    if feather is None:
+        return None
+    fonte = Path(fonte)
+    destino = caminho_cache(fonte, variante)
+    if not destino.exists():
+        return None
+    try:
+        tabela = feather.read_table(destino, memory_map=True)
+        meta = tabela.schema.metadata or {}
+        carimbo = json.loads(meta.get(_CHAVE_META, b"{}"))
+    except (OSError, ValueError, pa.ArrowException):
+        return None
+    if carimbo != _carimbo(fonte, versao_normalizacao):
+        return None
+    return tabela.to_pandas()
+
+
+def gravar_cache(fonte: str | Path, df: pd.DataFrame, versao_normalizacao: int, variante: str = "") -> bool:
+    """
+    Grava o DataFrame normalizado em Feather (sem compressão, para permitir memory-map),
+    com o carimbo de versão e o fingerprint do JSON de origem nos metadados.
+    Falhas (sem pyarrow, pasta sem permissão, coluna não serializável) só desligam o cache.
+    """
+    if feather is None:
+        return False
+    fonte = Path(fonte)
+    destino = caminho_cache(fonte, variante)
+    # Nome único por gravação: as sessões são threads do mesmo processo e o armazém
+    # carrega fora do lock, então duas podem gravar o mesmo cache ao mesmo tempo
+    tmp = destino.with_name(f"{destino.name}.{os.getpid()}.{uuid4().hex}.tmp")
+    try:
+        with etapa("gravar_cache", df):
+            _gravar_feather(fonte, df, versao_normalizacao, destino, tmp)
+    except (OSError, TypeError, ValueError, pa.ArrowException):
+        tmp.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _gravar_feather(fonte: Path, df: pd.DataFrame, versao_normalizacao: int, destino: Path, tmp: Path) -> None:
+    tabela = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    meta = dict(tabela.schema.metadata or {})
+    meta[_CHAVE_META] = json.dumps(_carimbo(fonte, versao_normalizacao)).encode("utf-8")
+    tabela = tabela.replace_schema_metadata(meta)
+    destino.parent.mkdir(exist_ok=True)
+    feather.write_feather(tabela, tmp, compression="uncompressed")
+    os.replace(tmp, destino)  # troca atômica: outras sessões nunca leem arquivo pela metade
@@ -0,0 +1,137 @@
+"""
+Grade de cards HTML (KPIs, acordos...) desenhada num único st.markdown.
+
+Cada card é uma linha de um DataFrame (ou um dict) aplicada a um template HTML do
+estilo; a grade inteira — <style> do estilo + cards dispostos em CSS grid — vai num só
+elemento, em vez de um st.markdown por card (mais um para o CSS) dentro de st.columns.
+
+O CSS segue junto com os cards a cada rerun: o Streamlit tira da tela os elementos que
+o rerun não redesenha, então um <style> enviado só na primeira execução da sessão
+sumiria. Ir no mesmo payload não custa mensagem extra.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from html import escape
+from string import Formatter
+from typing import Iterable, Mapping, Optional, Union
+
+import pandas as pd
+import streamlit as st
+
+from .paginacao import paginar, total_paginas
+
+
+@dataclass(frozen=True)
+class EstiloCard:
+    """
+    nome: prefixo das classes CSS (.<nome>-grade, .<nome>-card...).
+    css: regras do estilo (sem a tag <style>).
+    template: HTML de um card, com campos {campo} (str.format); os valores são escapados.
+    """
+    nome: str
+    css: str
+    template: str
+
+    @property
+    def campos(self) -> list[str]:
+        return [campo for _, campo, _, _ in Formatter().parse(self.template) if campo]
+
+
+ESTILO_KPI = EstiloCard(
+    "kpi",
+    """
+    .kpi-card { background: #111418; border: 1px solid rgba(255,255,255,0.08); border-radius: 14px;
+                padding: 16px 18px; box-shadow: 0 2px 10px rgba(0,0,0,0.25); }
+    .kpi-title { font-size: 0.92rem; color: #c9d1d9; margin-bottom: 6px; }
+    .kpi-big   { font-size: 1.75rem; font-weight: 700; margin-bottom: 8px; line-height: 1.2; }
+    .kpi-small { font-size: 0.85rem; color: #9aa4af; }
+    .kpi-small span { color: #c9d1d9; font-weight: 600; }
+    """,
+    """<div class="kpi-card"><div class="kpi-title">{titulo}</div><div class="kpi-big">{valor}</div>"""
+    """<div class="kpi-small"><span>{rotulo}</span> {detalhe}</div></div>""",
+)
+
+# Mesmo template do ESTILO_KPI, com o gradiente dos painéis Financeiro
+ESTILO_KPI_DESTAQUE = EstiloCard(
+    "kpid",
+    """
+    .kpid-card { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 8px;
+                 padding: 20px; color: white; box-shadow: 0 2px 4px rgba(0,0,0,0.1); height: 100%; }
+    .kpid-title { font-size: 14px; opacity: 0.9; margin-bottom: 8px; }
+    .kpid-big   { font-size: 26px; font-weight: bold; margin: 10px 0; overflow-wrap: anywhere; }
+    .kpid-small { font-size: 12px; opacity: 0.8; margin-top: 10px; }
+    .kpid-small span { display: block; opacity: 0.9; margin-bottom: 6px; }
+    """,
+    """<div class="kpid-card"><div class="kpid-title">{titulo}</div><div class="kpid-big">{valor}</div>"""
+    """<div class="kpid-small"><span>{rotulo}</span> {detalhe}</div></div>""",
+)
+
+ESTILO_ACORDO = EstiloCard(
+    "acordo",
+    """
+    .acordo-card { padding: 10px 10px; border-left: 5px solid #00BFFF; background: #1e1e1e; border-radius: 8px;
+                   box-shadow: 0 2px 5px rgba(0,0,0,0.2); height: 100%; }
+    .acordo-title { font-size: 1.0rem; font-weight: 600; color: #74CCF4; margin-bottom: 3px; }
+    .acordo-detail { font-size: 0.8rem; color: #CCCCCC; margin-top: 2px; line-height: 1.3; }
+    .acordo-datas { margin-top: 10px; }
+    .acordo-datas span { font-weight: 600; }
+    .acordo-value { font-size: 1.05rem; font-weight: 700; color: #4CAF50; margin-top: 10px; padding-top: 5px;
+                    border-top: 1px dashed rgba(255,255,255,0.1); }
+    """,
+    """<div class="acordo-card"><div class="acordo-title">{projeto}</div>"""
+    """<div class="acordo-detail">Segmento: <strong>{segmento}</strong></div>"""
+    """<div class="acordo-detail">Coordenador: <strong>{coordenador}</strong></div>"""
+    """<div class="acordo-datas">Início: <span>{inicio}</span> | Término: <span>{termino}</span></div>"""
+    """<div class="acordo-value">Valor Pactuado: {pactuado}</div></div>""",
+)
+
+Cards = Union[pd.DataFrame, Iterable[Mapping[str, object]]]
+
+
+def _registros(cards: Cards, campos: list[str]) -> list[dict]:
+    if isinstance(cards, pd.DataFrame):
+        return cards[campos].astype("string").fillna("").to_dict("records")
+    return [{c: "" if card.get(c) is None else str(card.get(c)) for c in campos} for card in cards]
+
+
+def _escapar(valor: str) -> str:
+    # "$" vira entidade: com vários "R$" no mesmo markdown, o Streamlit leria o trecho entre eles como LaTeX
+    return escape(valor).replace("$", "&#36;")
+
+
+def html_grade(cards: Cards, estilo: EstiloCard, colunas: int) -> str:
+    """<style> do estilo + os cards numa grade de `colunas` colunas, como um só HTML."""
+    campos = estilo.campos
+    corpo = "".join(
+        estilo.template.format(**{c: _escapar(v) for c, v in registro.items()})
+        for registro in _registros(cards, campos)
+    )
+    return (
+        f"<style>{' '.join(estilo.css.split())}"
+        f".{estilo.nome}-grade {{ display: grid; grid-template-columns: repeat({int(colunas)}, minmax(0, 1fr));"
+        f" gap: 1rem; margin-bottom: 1rem; }}</style>"
+        f'<div class="{estilo.nome}-grade">{corpo}</div>'
+    )
+
+
+def grade_cards(
+    cards: Cards,
+    estilo: EstiloCard,
+    colunas: int = 4,
+    por_pagina: Optional[int] = None,
+) -> None:
+    """
+    Desenha os cards num único st.markdown. Com por_pagina, e havendo mais cards que
+    isso, divide-os em abas ("Pag 1", "Pag 2"...), cada uma com o seu HTML: todas as
+    páginas vão no mesmo rerun e a troca de aba acontece no navegador, sem novo rerun.
+    """
+    if not isinstance(cards, pd.DataFrame):
+        cards = list(cards)
+    if not por_pagina or len(cards) <= por_pagina:
+        st.markdown(html_grade(cards, estilo, colunas), unsafe_allow_html=True)
+        return
+    n_paginas = total_paginas(len(cards), por_pagina)
+    abas = st.tabs([f"Pag {p}" for p in range(1, n_paginas + 1)])
+    for pagina, aba in enumerate(abas, start=1):
+        with aba:
+            st.markdown(html_grade(paginar(cards, pagina, por_pagina), estilo, colunas), unsafe_allow_html=True)
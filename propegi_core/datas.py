@@ -0,0 +1,29 @@
+"""Conversão de colunas de data em texto para datetime64."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def para_datetime(serie: pd.Series, formato: str) -> pd.Series:
+    """
+    Texto -> datetime64 no formato dado (o que não casar vira NaT), convertendo cada
+    valor distinto uma vez só: colunas de data repetem poucas datas em muitas linhas.
+    Colunas já em datetime64 passam direto.
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    codigos, distintos = pd.factorize(serie)
+    convertidos = pd.to_datetime(pd.Series(distintos, dtype=object), format=formato, errors="coerce").to_numpy()
+    valores = convertidos[np.maximum(codigos, 0)] if len(convertidos) else np.full(len(codigos), np.datetime64("NaT", "ns"))
+    valores[codigos < 0] = np.datetime64("NaT")
+    return pd.Series(valores, index=serie.index, name=serie.name)
+
+
+def dias_entre(inicio: pd.Series, fim: pd.Series) -> pd.Series:
+    """Dias corridos de inicio até fim (Int32; <NA> se alguma das datas for NaT)."""
+    a = inicio.to_numpy(dtype="datetime64[D]")
+    b = fim.to_numpy(dtype="datetime64[D]")
+    nulos = np.isnat(a) | np.isnat(b)
+    dias = (b.astype("int64") - a.astype("int64")).astype("int32")
+    return pd.Series(pd.arrays.IntegerArray(dias, nulos), index=inicio.index)
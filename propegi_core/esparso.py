@@ -0,0 +1,155 @@
+"""
+Pivot esparso (formato COO) para matrizes projeto × mês, que são quase todas zero:
+cada projeto só tem folha em alguns meses. Guarda só as células não nulas
+(linha, coluna, valor) montadas a partir dos códigos das categorias e da coluna de
+ordenação (ex.: ord_col); só a fatia exibida vira matriz densa.
+Sem dependência de scipy.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+import math
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import instrumentado
+
+
+@dataclass(frozen=True)
+class PivotEsparso:
+    """Matriz em COO: valores[k] está na linha linhas_idx[k], coluna colunas_idx[k] (pares únicos)."""
+    rotulos_linhas: list
+    rotulos_colunas: list
+    linhas_idx: np.ndarray
+    colunas_idx: np.ndarray
+    valores: np.ndarray
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return len(self.rotulos_linhas), len(self.rotulos_colunas)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.valores)
+
+    def total_linhas(self) -> np.ndarray:
+        """Soma de cada linha (ex.: total por projeto)."""
+        return np.bincount(self.linhas_idx, weights=self.valores, minlength=self.shape[0])
+
+    def total_colunas(self) -> np.ndarray:
+        """Soma de cada coluna (ex.: total por mês)."""
+        return np.bincount(self.colunas_idx, weights=self.valores, minlength=self.shape[1])
+
+    def _na_faixa(self, linhas: tuple[int, int] | None, colunas: tuple[int, int] | None):
+        i0, i1 = linhas if linhas is not None else (0, self.shape[0])
+        j0, j1 = colunas if colunas is not None else (0, self.shape[1])
+        dentro = (
+            (self.linhas_idx >= i0) & (self.linhas_idx < i1)
+            & (self.colunas_idx >= j0) & (self.colunas_idx < j1)
+        )
+        return (i0, i1, j0, j1), dentro
+
+    def densificar(
+        self,
+        linhas: tuple[int, int] | None = None,
+        colunas: tuple[int, int] | None = None,
+    ) -> pd.DataFrame:
+        """Fatia [início, fim) de linhas/colunas como DataFrame denso (zeros onde não há valor)."""
+        (i0, i1, j0, j1), dentro = self._na_faixa(linhas, colunas)
+        z = np.zeros((i1 - i0, j1 - j0))
+        z[self.linhas_idx[dentro] - i0, self.colunas_idx[dentro] - j0] = self.valores[dentro]
+        return pd.DataFrame(z, index=self.rotulos_linhas[i0:i1], columns=self.rotulos_colunas[j0:j1])
+
+    def reduzir(
+        self,
+        linhas: tuple[int, int] | None,
+        colunas: tuple[int, int] | None,
+        max_linhas: int,
+        max_colunas: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Como heatmap.reduzir_matriz, mas direto das células não nulas: soma blocos de
+        linhas/colunas sem montar a matriz inteira. Retorna (z float32, inícios de linhas,
+        inícios de colunas), com os inícios relativos à faixa.
+        """
+        (i0, i1, j0, j1), dentro = self._na_faixa(linhas, colunas)
+        passo_l = max(1, math.ceil((i1 - i0) / max_linhas))
+        passo_c = max(1, math.ceil((j1 - j0) / max_colunas))
+        inicios_l = np.arange(0, i1 - i0, passo_l)
+        inicios_c = np.arange(0, j1 - j0, passo_c)
+
+        bl = (self.linhas_idx[dentro] - i0) // passo_l
+        bc = (self.colunas_idx[dentro] - j0) // passo_c
+        plano = np.bincount(
+            bl * len(inicios_c) + bc,
+            weights=self.valores[dentro],
+            minlength=len(inicios_l) * len(inicios_c),
+        )
+        return plano.reshape(len(inicios_l), len(inicios_c)).astype(np.float32), inicios_l, inicios_c
+
+
+def _codigos(serie: pd.Series) -> tuple[np.ndarray, list]:
+    """Códigos (-1 = nulo) e rótulos ordenados como o índice de um pivot do pandas."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie.cat.codes.to_numpy().astype(np.int64), serie.cat.categories.tolist()
+    codigos, uniques = pd.factorize(serie, sort=True, use_na_sentinel=True)
+    return codigos.astype(np.int64), list(uniques)
+
+
+def _densos(codigos: np.ndarray, limite: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Como np.unique(codigos, return_inverse=True) para inteiros em [0, limite), mas por
+    contagem (O(n)) quando o intervalo não é muito maior que a quantidade de códigos.
+    """
+    if limite > 4 * len(codigos) + 1_000_000:
+        return np.unique(codigos, return_inverse=True)
+    presentes = np.bincount(codigos, minlength=limite) > 0
+    novo = np.cumsum(presentes) - 1
+    return np.flatnonzero(presentes), novo[codigos]
+
+
+@instrumentado("pivot_esparso")
+def pivot_esparso(
+    df: pd.DataFrame,
+    linha: str,
+    coluna_ordem: str,
+    coluna_rotulo: str,
+    valor: str,
+) -> PivotEsparso:
+    """
+    Soma df[valor] por (linha, coluna) em COO.
+    - linhas: valores de df[linha] presentes, na ordem das categorias (ou alfabética)
+    - colunas: valores distintos de df[coluna_ordem] em ordem crescente, rotulados por
+      df[coluna_rotulo] (ex.: ord_col -> AnoMes)
+    Linhas com chave nula ficam de fora, como no groupby/pivot do pandas.
+    """
+    cod_linha, rotulos = _codigos(df[linha])
+    ordem = df[coluna_ordem]
+    valida = (cod_linha >= 0) & ordem.notna().to_numpy()
+
+    posicoes = np.flatnonzero(valida)
+    cod_linha = cod_linha[valida]
+    ordem_val = ordem.to_numpy(dtype=np.float64, na_value=np.nan)[valida]
+    vals = df[valor].to_numpy(dtype=np.float64, na_value=0.0)[valida]
+
+    # só linhas/colunas que aparecem, mantendo a ordem das categorias / da ordenação
+    usadas, i = _densos(cod_linha, len(rotulos))
+    if len(ordem_val) and np.array_equal(ordem_val, np.round(ordem_val)):
+        base = ordem_val.min()
+        pos_col, j = _densos((ordem_val - base).astype(np.int64), int(ordem_val.max() - base) + 1)
+        primeira = np.full(len(pos_col), len(j), dtype=np.int64)
+        np.minimum.at(primeira, j, np.arange(len(j)))
+    else:
+        _, primeira, j = np.unique(ordem_val, return_index=True, return_inverse=True)
+
+    n_col = len(primeira)
+    celulas, k = _densos(i * n_col + j, len(usadas) * n_col)
+    somas = np.bincount(k, weights=vals, minlength=len(celulas))
+
+    return PivotEsparso(
+        rotulos_linhas=[rotulos[c] for c in usadas.tolist()],
+        rotulos_colunas=df[coluna_rotulo].iloc[posicoes[primeira]].tolist(),
+        linhas_idx=(celulas // n_col).astype(np.int32) if n_col else celulas.astype(np.int32),
+        colunas_idx=(celulas % n_col).astype(np.int32) if n_col else celulas.astype(np.int32),
+        valores=somas,
+    )
@@ -0,0 +1,170 @@
+"""
+Esquema comum dos registros e adaptadores por domínio.
+
+Os três painéis têm nomes de campos diferentes para as mesmas coisas (projeto, ano,
+mês, valor em R$). Cada domínio declara um Esquema dizendo qual campo faz cada papel,
+e a normalização (validar colunas -> números -> meses -> moeda -> derivadas ->
+compactar) é uma só, em normalizar(). As páginas continuam usando os nomes do próprio
+domínio; registros_comuns() dá a visão com os nomes comuns para uso entre domínios.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Optional, TypedDict
+
+import pandas as pd
+
+from .instrumentacao import etapa
+from .meses import numero_do_mes
+from .memoria import compactar
+from .moeda import br_para_float_com_invalidos
+
+
+class Registro(TypedDict):
+    """Registro comum (uma linha de registros_comuns)."""
+    dominio: str
+    projeto_id: Optional[str]
+    projeto: Optional[str]
+    ano: Optional[int]
+    mes: Optional[int]
+    valor: float
+
+
+COLUNAS_REGISTRO = list(Registro.__annotations__)
+
+
+@dataclass(frozen=True)
+class Esquema:
+    """Como os campos de um domínio se encaixam nos papéis comuns."""
+    dominio: str
+    obrigatorias: tuple[str, ...] = ()
+    projeto: Optional[str] = None
+    projeto_id: Optional[str] = None
+    ano: Optional[str] = None
+    numero_mes: Optional[str] = None
+    nome_mes: Optional[str] = None
+    # valor principal do registro comum
+    valor: Optional[str] = None
+    # colunas em texto pt-BR ("R$ 1.234,56") -> float: {origem: destino}
+    moedas: Mapping[str, str] = field(default_factory=dict)
+    # {destino: coluna bool} que marca os textos de moeda não convertidos (lixo -> 0.0)
+    moedas_invalidas: Mapping[str, str] = field(default_factory=dict)
+    # layout compacto (ver memoria.compactar)
+    categorias: tuple[str, ...] = ()
+    inteiros: Mapping[str, str] = field(default_factory=dict)
+    floats32: tuple[str, ...] = ()
+
+
+ESQUEMA_FINANCAS = Esquema(
+    dominio="financas",
+    obrigatorias=("Projetos", "Ano", "Mês", "Número do mês", "Valor da folha"),
+    projeto="Projetos",
+    projeto_id="Projeto_ID",
+    ano="Ano",
+    numero_mes="Número do mês",
+    nome_mes="Mês",
+    valor="Valor da folha",
+    moedas={"Valor da folha": "Valor da folha"},
+    moedas_invalidas={"Valor da folha": "Valor da folha inválido"},
+    categorias=(
+        "Projeto_ID", "Projetos", "Projeto de Origem", "Mês", "Trimestre", "Taxa",
+        "Plano de Trabalho", "Status", "Recurso", "MesAbrev", "AnoMes",
+    ),
+    inteiros={"Ano": "Int16", "Número do mês": "Int8", "ord_col": "Int32", "Dias em atraso": "Int32"},
+    # 'Valor da folha' continua float64: float32 não guarda centavos acima de ~R$ 160 mil
+    floats32=("Sub-issues progress",),
+)
+
+ESQUEMA_MODELO = Esquema(
+    dominio="modelo",
+    obrigatorias=("nomeProjeto", "ano", "mes", "valorDaFolha"),
+    projeto="nomeProjeto",
+    projeto_id="projetoId",
+    ano="ano",
+    numero_mes="numeroMes",
+    nome_mes="mes",
+    valor="valorFloat",
+    moedas={"valorDaFolha": "valorFloat"},
+    inteiros={"ano": "int64"},
+)
+
+ESQUEMA_PDT = Esquema(
+    dominio="pdt",
+    projeto="nomeProjeto",
+    ano="Ano",
+    numero_mes="Mes",
+    valor="valorPactuado",
+    moedas={c: c for c in ("valorPactuado", "valorAgencia", "valorUnidade", "valorIAUPE")},
+    categorias=(
+        "segmento", "status", "empresa", "coordenador", "convenioOuAcordo",
+        "intervenienciaComOIAUPE", "edital", "tipoDeAditivo", "MesNome",
+    ),
+    inteiros={"Mes": "Int8"},
+)
+
+
+def validar_colunas(df: pd.DataFrame, esquema: Esquema) -> None:
+    """ValueError se faltar alguma coluna obrigatória do domínio."""
+    faltando = [c for c in esquema.obrigatorias if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas ausentes no JSON: {faltando}")
+
+
+def converter_moedas(df: pd.DataFrame, esquema: Esquema) -> pd.DataFrame:
+    """
+    Colunas de moeda pt-BR -> float (br_para_float), nas colunas de destino; para as
+    de esquema.moedas_invalidas, grava também a máscara do que não era número.
+    """
+    for origem, destino in esquema.moedas.items():
+        if origem in df.columns:
+            valores, invalidos = br_para_float_com_invalidos(df[origem])
+            df[destino] = valores
+            if destino in esquema.moedas_invalidas:
+                df[esquema.moedas_invalidas[destino]] = invalidos
+    return df
+
+
+def normalizar(
+    df: pd.DataFrame,
+    esquema: Esquema,
+    derivar: Callable[[pd.DataFrame], pd.DataFrame] | None = None,
+) -> pd.DataFrame:
+    """
+    Caminho único de normalização (devolve uma cópia):
+    colunas obrigatórias -> Ano / número do mês numéricos (número do mês a partir do
+    nome, se o campo não vier) -> moedas -> derivar(df) (colunas do domínio) -> compactar.
+    """
+    validar_colunas(df, esquema)
+    with etapa(f"normalizar:{esquema.dominio}", df) as e:
+        df = df.copy()
+
+        if esquema.ano and esquema.ano in df.columns:
+            df[esquema.ano] = pd.to_numeric(df[esquema.ano], errors="coerce").astype("Int64")
+        if esquema.numero_mes:
+            if esquema.numero_mes in df.columns:
+                df[esquema.numero_mes] = pd.to_numeric(df[esquema.numero_mes], errors="coerce").astype("Int64")
+            elif esquema.nome_mes and esquema.nome_mes in df.columns:
+                df[esquema.numero_mes] = numero_do_mes(df[esquema.nome_mes])
+
+        df = converter_moedas(df, esquema)
+        if derivar is not None:
+            df = derivar(df)
+        return e.saida(compactar(df, esquema.categorias, esquema.inteiros, esquema.floats32))
+
+
+def registros_comuns(df: pd.DataFrame, esquema: Esquema) -> pd.DataFrame:
+    """DataFrame normalizado do domínio com as colunas de Registro (papéis ausentes = <NA>)."""
+    papeis = {
+        "projeto_id": esquema.projeto_id,
+        "projeto": esquema.projeto,
+        "ano": esquema.ano,
+        "mes": esquema.numero_mes,
+        "valor": esquema.valor,
+    }
+    out = pd.DataFrame(index=df.index)
+    out["dominio"] = esquema.dominio
+    for papel, coluna in papeis.items():
+        out[papel] = df[coluna] if coluna and coluna in df.columns else pd.NA
+    out["ano"] = pd.to_numeric(out["ano"], errors="coerce").astype("Int16")
+    out["mes"] = pd.to_numeric(out["mes"], errors="coerce").astype("Int8")
+    out["valor"] = pd.to_numeric(out["valor"], errors="coerce").fillna(0.0).astype("float64")
+    return out[COLUNAS_REGISTRO]
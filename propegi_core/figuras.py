@@ -0,0 +1,122 @@
+"""
+Cache de visões das páginas (figuras Plotly e tabelas agregadas), por
+(versão do dataset, página, filtros normalizados). Uma nova execução da página sem
+mudança de dados nem de filtros (ex.: abrir um expander) reaproveita a agregação e a
+figura em vez de refazê-las.
+
+- Figuras ficam guardadas como JSON (texto imutável; o tamanho conta para o limite)
+  e são remontadas sem validação, o que custa poucos ms contra dezenas para montar.
+- LRU com limite de entradas e de bytes.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Hashable, Iterable
+import json
+import threading
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .instrumentacao import etapa
+
+VISOES_MAX_ENTRADAS = 256
+VISOES_MAX_BYTES = 64 * 1024 * 1024
+
+_VISOES: "OrderedDict[tuple, tuple[object, int]]" = OrderedDict()
+_VISOES_BYTES = 0
+_VISOES_LOCK = threading.Lock()
+
+
+def _normalizar(valor) -> Hashable:
+    """Listas/conjuntos viram tupla ordenada (a ordem de seleção não importa)."""
+    if isinstance(valor, (list, tuple, set, frozenset, pd.Index, pd.Series)):
+        return tuple(sorted(dict.fromkeys(valor), key=lambda v: (str(type(v)), str(v))))
+    if hasattr(valor, "item"):  # escalares NumPy
+        return valor.item()
+    return valor
+
+
+def chave_visao(versao: Hashable | None, pagina: str, **filtros) -> tuple | None:
+    """
+    Chave do cache para a página com os filtros informados.
+    None (sem cache) se o DataFrame não tiver versão (ver memo.versao_dataset).
+    """
+    if versao is None:
+        return None
+    return (versao, pagina, tuple(sorted((nome, _normalizar(v)) for nome, v in filtros.items())))
+
+
+def _buscar(chave: tuple):
+    with _VISOES_LOCK:
+        item = _VISOES.get(chave)
+        if item is None:
+            return None
+        _VISOES.move_to_end(chave)
+        return item[0]
+
+
+def _guardar(chave: tuple, valor: object, tamanho: int) -> None:
+    global _VISOES_BYTES
+    if tamanho > VISOES_MAX_BYTES:
+        return
+    with _VISOES_LOCK:
+        antigo = _VISOES.pop(chave, None)
+        if antigo is not None:
+            _VISOES_BYTES -= antigo[1]
+        _VISOES[chave] = (valor, tamanho)
+        _VISOES_BYTES += tamanho
+        while len(_VISOES) > VISOES_MAX_ENTRADAS or _VISOES_BYTES > VISOES_MAX_BYTES:
+            _, (_, tam) = _VISOES.popitem(last=False)
+            _VISOES_BYTES -= tam
+
+
+def figura_em_cache(chave: tuple | None, nome: str, construir: Callable[[], go.Figure]) -> go.Figure:
+    """
+    Figura de (chave, nome): remontada do JSON guardado ou construída por construir().
+    Altere a figura dentro de construir (update_layout etc.), não depois.
+    """
+    if chave is None:
+        with etapa(f"figura:{nome}", cache="sem versão"):
+            return construir()
+    chave = (*chave, "figura", nome)
+    texto = _buscar(chave)
+    if texto is None:
+        with etapa(f"figura:{nome}", cache="falta"):
+            fig = construir()
+            texto = pio.to_json(fig, validate=False)
+        _guardar(chave, texto, len(texto))
+        return fig
+    # JSON gerado pelo próprio Plotly: dispensa a validação (a parte cara da montagem)
+    with etapa(f"figura:{nome}", cache="acerto"):
+        return go.Figure(json.loads(texto), _validate=False)
+
+
+def tabela_em_cache(chave: tuple | None, nome: str, construir: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Tabela agregada de (chave, nome), construída uma vez por construir().
+    O mesmo objeto é devolvido nas execuções seguintes: não altere no lugar.
+    """
+    if chave is None:
+        with etapa(f"tabela:{nome}", cache="sem versão") as e:
+            return e.saida(construir())
+    chave = (*chave, "tabela", nome)
+    tabela = _buscar(chave)
+    if tabela is None:
+        with etapa(f"tabela:{nome}", cache="falta") as e:
+            tabela = e.saida(construir())
+        _guardar(chave, tabela, int(tabela.memory_usage(index=True, deep=True).sum()))
+    return tabela
+
+
+def limpar_visoes(paginas: Iterable[str] | None = None) -> None:
+    """Descarta o cache (todo, ou só das páginas informadas)."""
+    global _VISOES_BYTES
+    with _VISOES_LOCK:
+        if paginas is None:
+            _VISOES.clear()
+            _VISOES_BYTES = 0
+            return
+        paginas = set(paginas)
+        for chave in [c for c in _VISOES if c[1] in paginas]:
+            _VISOES_BYTES -= _VISOES.pop(chave)[1]
@@ -0,0 +1,132 @@
+"""
+Filtros indexados: para cada coluna de filtro, guarda as posições (ordenadas) das
+linhas de cada valor. Um filtro vira a união das listas dos valores escolhidos e a
+combinação de filtros, a interseção dessas listas — custo proporcional às linhas
+encontradas, sem máscaras booleanas do tamanho do DataFrame nem cópia da base.
+
+O índice é montado uma vez por versão do dataset (ver memo.versao_posicional).
+"""
+from __future__ import annotations
+from typing import Hashable, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import instrumentado
+from .memo import memo_por_versao, versao_posicional
+
+# coluna -> {valor: posições (np.intp, crescentes)}
+IndiceFiltro = dict[str, dict[Hashable, np.ndarray]]
+
+
+def _indexar_coluna(serie: pd.Series) -> dict[Hashable, np.ndarray]:
+    """Agrupa as posições por valor com um argsort estável dos códigos (nulos ficam de fora)."""
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+        valores = serie.cat.categories.tolist()
+    else:
+        codigos, uniques = pd.factorize(serie, use_na_sentinel=True)
+        valores = list(uniques.tolist()) if hasattr(uniques, "tolist") else list(uniques)
+
+    ordem = np.argsort(codigos, kind="stable")
+    contagens = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+    inicio = int((codigos < 0).sum())  # códigos -1 (nulos) ficam no começo da ordem
+    limites = np.concatenate(([0], np.cumsum(contagens))) + inicio
+
+    indice: dict[Hashable, np.ndarray] = {}
+    for i, valor in enumerate(valores):
+        if contagens[i]:
+            indice[valor] = ordem[limites[i]:limites[i + 1]].astype(np.intp, copy=False)
+    return indice
+
+
+@instrumentado("indice_filtros")
+def construir_indice(df: pd.DataFrame, colunas: Iterable[str]) -> IndiceFiltro:
+    """Índice valor -> posições para as colunas informadas que existirem em df."""
+    return {col: _indexar_coluna(df[col]) for col in colunas if col in df.columns}
+
+
+def indice_filtros(df: pd.DataFrame, colunas: Iterable[str]) -> IndiceFiltro:
+    """
+    construir_indice memoizado pela versão do dataset; só para frames com índice padrão
+    (ver memo.versao_posicional).
+    """
+    colunas = tuple(colunas)
+    versao = versao_posicional(df)
+    return memo_por_versao("indice_filtros:" + "|".join(colunas), versao, lambda: construir_indice(df, colunas))
+
+
+def posicoes_filtradas(
+    df: pd.DataFrame,
+    filtros: Mapping[str, Iterable | None],
+    colunas_indice: Iterable[str] | None = None,
+) -> np.ndarray | None:
+    """
+    Posições (crescentes) das linhas que atendem a todos os filtros {coluna: valores}.
+    Filtro vazio/None é ignorado (como em isin só quando há seleção).
+    Retorna None quando nenhum filtro restringe nada (todas as linhas).
+    colunas_indice: colunas a indexar juntas (padrão: as dos filtros); informar sempre o
+    mesmo conjunto faz as páginas compartilharem o mesmo índice.
+    """
+    ativos = {col: list(vals) for col, vals in filtros.items() if vals is not None and len(vals)}
+    if not ativos:
+        return None
+
+    faltando = [col for col in ativos if col not in df.columns]
+    if faltando:
+        raise KeyError(f"Colunas de filtro ausentes: {faltando}")
+
+    colunas = tuple(colunas_indice) if colunas_indice is not None else tuple(ativos)
+    colunas = colunas + tuple(c for c in ativos if c not in colunas)
+    indice = indice_filtros(df, colunas)
+
+    conjuntos = []
+    for col, valores in ativos.items():
+        por_valor = indice[col]
+        partes = [por_valor[v] for v in dict.fromkeys(valores) if _chave_valida(v) and v in por_valor]
+        if not partes:
+            return np.empty(0, dtype=np.intp)
+        if sum(len(p) for p in partes) == len(df):
+            continue  # seleção cobre todas as linhas (ex.: todos os anos marcados)
+        uniao = partes[0] if len(partes) == 1 else np.sort(np.concatenate(partes))
+        conjuntos.append(uniao)
+
+    if not conjuntos:
+        return None
+
+    # Interseção começando pelo filtro mais seletivo: busca binária de cada posição
+    # nas listas seguintes, O(encontradas · log n)
+    conjuntos.sort(key=len)
+    resultado = conjuntos[0]
+    for outro in conjuntos[1:]:
+        if not len(resultado):
+            break
+        pos = np.searchsorted(outro, resultado)
+        pos[pos == len(outro)] = 0
+        resultado = resultado[outro[pos] == resultado]
+    return resultado
+
+
+def _chave_valida(valor) -> bool:
+    try:
+        hash(valor)
+    except TypeError:
+        return False
+    return not (isinstance(valor, float) and np.isnan(valor))
+
+
+@instrumentado("filtrar")
+def aplicar_filtros(
+    df: pd.DataFrame,
+    filtros: Mapping[str, Iterable | None],
+    colunas_indice: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """
+    DataFrame só com as linhas filtradas (mesma ordem e rótulos de índice da base).
+    Sem filtros que restrinjam algo devolve o próprio df, sem cópia (não altere o resultado
+    no lugar; use .assign / .copy() se precisar de colunas novas).
+    """
+    posicoes = posicoes_filtradas(df, filtros, colunas_indice)
+    if posicoes is None:
+        return df
+    return df.iloc[posicoes]
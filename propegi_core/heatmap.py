@@ -0,0 +1,78 @@
+"""
+Heatmaps grandes (projetos × meses): a matriz é reduzida no servidor até a resolução
+que cabe na tela, somando blocos de linhas/colunas vizinhas, e vai como float32 —
+o Plotly serializa arrays NumPy como binário (base64), não como listas de números.
+Um recorte (faixa de linhas e colunas) permite aproximar uma região em detalhe.
+"""
+from __future__ import annotations
+import math
+
+import numpy as np
+import pandas as pd
+
+from .esparso import PivotEsparso
+
+# Resolução máxima enviada ao navegador (células por eixo)
+MAX_LINHAS_HEATMAP = 150
+MAX_COLUNAS_HEATMAP = 120
+
+
+def reduzir_matriz(
+    matriz: np.ndarray,
+    max_linhas: int = MAX_LINHAS_HEATMAP,
+    max_colunas: int = MAX_COLUNAS_HEATMAP,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Soma blocos de linhas/colunas consecutivas para caber em max_linhas × max_colunas.
+    Retorna (z em float32, início de cada bloco de linhas, início de cada bloco de colunas).
+    """
+    n_linhas, n_colunas = matriz.shape
+    passo_l = max(1, math.ceil(n_linhas / max_linhas))
+    passo_c = max(1, math.ceil(n_colunas / max_colunas))
+    inicios_l = np.arange(0, n_linhas, passo_l)
+    inicios_c = np.arange(0, n_colunas, passo_c)
+
+    z = np.asarray(matriz, dtype=np.float64)
+    if passo_l > 1:
+        z = np.add.reduceat(z, inicios_l, axis=0)
+    if passo_c > 1:
+        z = np.add.reduceat(z, inicios_c, axis=1)
+    return z.astype(np.float32), inicios_l, inicios_c
+
+
+def rotulos_blocos(rotulos: list, inicios: np.ndarray) -> list[str]:
+    """Rótulo de cada bloco: o próprio rótulo (bloco de 1) ou "primeiro … último"."""
+    fins = np.append(inicios[1:], len(rotulos)) - 1
+    return [
+        str(rotulos[i]) if i == f else f"{rotulos[i]} … {rotulos[f]}"
+        for i, f in zip(inicios.tolist(), fins.tolist())
+    ]
+
+
+def recorte_heatmap(
+    tabela: pd.DataFrame | PivotEsparso,
+    linhas: tuple[int, int] | None = None,
+    colunas: tuple[int, int] | None = None,
+    max_linhas: int = MAX_LINHAS_HEATMAP,
+    max_colunas: int = MAX_COLUNAS_HEATMAP,
+) -> tuple[np.ndarray, list[str], list[str], bool]:
+    """
+    Recorta a tabela (pivot denso ou PivotEsparso) nas faixas de posições [início, fim)
+    e reduz à resolução máxima; no esparso, nunca monta a matriz inteira.
+    Retorna (z, rótulos x, rótulos y, reduzido?) prontos para px.imshow.
+    """
+    i0, i1 = linhas if linhas is not None else (0, tabela.shape[0])
+    j0, j1 = colunas if colunas is not None else (0, tabela.shape[1])
+
+    if isinstance(tabela, PivotEsparso):
+        z, inicios_l, inicios_c = tabela.reduzir((i0, i1), (j0, j1), max_linhas, max_colunas)
+        rotulos_x = tabela.rotulos_colunas[j0:j1]
+        rotulos_y = tabela.rotulos_linhas[i0:i1]
+    else:
+        parte = tabela.iloc[i0:i1, j0:j1]
+        z, inicios_l, inicios_c = reduzir_matriz(parte.to_numpy(), max_linhas, max_colunas)
+        rotulos_x = parte.columns.tolist()
+        rotulos_y = parte.index.tolist()
+
+    reduzido = z.shape != (i1 - i0, j1 - j0)
+    return z, rotulos_blocos(rotulos_x, inicios_c), rotulos_blocos(rotulos_y, inicios_l), reduzido
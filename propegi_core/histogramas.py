@@ -0,0 +1,160 @@
+"""
+Histogramas de bins fixos por grupo, para distribuições (ex.: prazos em dias) que
+precisam responder a filtros sem varrer as linhas de novo.
+
+construir_histogramas() varre os dados uma vez: cada linha cai num grupo (combinação
+das chaves, ex.: projeto × recurso × mês) e num bin de 1 unidade entre 0 e `maximo`
+(mais um bin para negativos e um para acima do máximo). Só as células (grupo, bin)
+não vazias são guardadas, em COO como em esparso.PivotEsparso: com muitos grupos
+pequenos, a matriz densa grupos × bins seria quase toda zero.
+Depois, filtrar é escolher grupos e somar contagens com np.bincount; percentis saem
+da soma acumulada dos bins — exatos para valores inteiros até `maximo`.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import instrumentado
+
+# Maior valor com bin próprio (acima disso, tudo cai no último bin)
+MAXIMO_PADRAO = 180
+PERCENTIS_PADRAO = (50, 90, 99)
+
+
+@dataclass(frozen=True)
+class HistogramasPorGrupo:
+    """
+    grupos: uma linha por grupo, com as colunas-chave.
+    celulas: {métrica: (grupo, bin, contagem)} das células não vazias.
+    Bins: 0 = negativos, 1..maximo+1 = valores 0..maximo, último = acima de maximo.
+    """
+    grupos: pd.DataFrame
+    celulas: Mapping[str, tuple[np.ndarray, np.ndarray, np.ndarray]]
+    maximo: int
+
+    @property
+    def n_bins(self) -> int:
+        return self.maximo + 3
+
+    @property
+    def valores_bins(self) -> np.ndarray:
+        """Valor representativo de cada bin (-1 para negativos, maximo + 1 para o excedente)."""
+        return np.arange(-1, self.maximo + 2)
+
+    def selecionar(self, mascara_grupos=None) -> "HistogramasPorGrupo":
+        """Só os grupos da máscara (booleana, uma posição por grupo), renumerados."""
+        if mascara_grupos is None:
+            return self
+        mascara = np.asarray(mascara_grupos, dtype=bool)
+        novo_indice = np.cumsum(mascara) - 1
+        celulas = {}
+        for metrica, (grupo, bin_, contagem) in self.celulas.items():
+            manter = mascara[grupo]
+            celulas[metrica] = (novo_indice[grupo[manter]], bin_[manter], contagem[manter])
+        return HistogramasPorGrupo(self.grupos.loc[mascara].reset_index(drop=True), celulas, self.maximo)
+
+    def total(self, metrica: str) -> np.ndarray:
+        """Histograma da métrica somando todos os grupos."""
+        _, bin_, contagem = self.celulas[metrica]
+        return np.bincount(bin_, weights=contagem, minlength=self.n_bins).astype(np.int64)
+
+    def por(self, colunas: list[str], metrica: str) -> tuple[pd.DataFrame, np.ndarray]:
+        """Grupos somados pelas colunas dadas: (chaves, matriz chaves × bins)."""
+        if not colunas:
+            return pd.DataFrame(index=range(1)), self.total(metrica)[None, :]
+        codigos, chaves = _agrupar(self.grupos, colunas)
+        grupo, bin_, contagem = self.celulas[metrica]
+        matriz = np.bincount(
+            codigos[grupo] * self.n_bins + bin_, weights=contagem, minlength=len(chaves) * self.n_bins
+        )
+        return chaves, matriz.astype(np.int64).reshape(len(chaves), self.n_bins)
+
+    def resumo_por(
+        self,
+        colunas: list[str],
+        metrica: str,
+        percentis: Iterable[int] = PERCENTIS_PADRAO,
+    ) -> pd.DataFrame:
+        """Por combinação das colunas: quantidade, percentis e quantos acima de 0."""
+        chaves, matriz = self.por(colunas, metrica)
+        return pd.concat([chaves, resumo_histogramas(matriz, self.valores_bins, percentis)], axis=1)
+
+
+def _agrupar(df: pd.DataFrame, colunas: list[str]) -> tuple[np.ndarray, pd.DataFrame]:
+    """Código do grupo de cada linha e as chaves de cada grupo (na mesma ordem)."""
+    agrupado = df.groupby(colunas, observed=True, dropna=False, sort=True)
+    chaves = agrupado.size().reset_index()[colunas]
+    return agrupado.ngroup().to_numpy(), chaves
+
+
+def resumo_histogramas(
+    matriz: np.ndarray,
+    valores_bins: np.ndarray,
+    percentis: Iterable[int] = PERCENTIS_PADRAO,
+) -> pd.DataFrame:
+    """
+    Para cada linha da matriz (histograma): 'Quantidade', 'p50'/'p90'/... (valor do bin
+    onde a contagem acumulada atinge o percentil; <NA> sem dados) e 'Acima de 0'.
+    Percentil que cai num bin de ponta é censurado: -1 / maximo + 1 só dizem "abaixo de
+    0" / "acima do máximo" (para exibir, ver rotular_percentis).
+    """
+    matriz = np.atleast_2d(matriz)
+    acumulado = np.cumsum(matriz, axis=1)
+    total = acumulado[:, -1]
+    saida = {"Quantidade": total}
+    for p in percentis:
+        alvo = np.ceil(total * p / 100).clip(min=1)
+        posicao = (acumulado < alvo[:, None]).sum(axis=1).clip(max=matriz.shape[1] - 1)
+        saida[f"p{p}"] = pd.arrays.IntegerArray(valores_bins[posicao].astype("int32"), total == 0)
+    saida["Acima de 0"] = matriz[:, valores_bins > 0].sum(axis=1)
+    return pd.DataFrame(saida)
+
+
+def rotular_percentis(
+    resumo: pd.DataFrame,
+    maximo: int,
+    percentis: Iterable[int] = PERCENTIS_PADRAO,
+) -> pd.DataFrame:
+    """
+    Cópia do resumo com os percentis em texto, para tabelas: os censurados viram "< 0" e
+    "> maximo" (os mesmos rótulos das pontas do histograma), em vez de -1 e maximo + 1.
+    """
+    resumo = resumo.copy()
+    for p in percentis:
+        coluna = f"p{p}"
+        if coluna not in resumo.columns:
+            continue
+        valores = resumo[coluna].astype("Int64")
+        texto = valores.astype("string")
+        texto = texto.mask((valores < 0).fillna(False), "< 0").mask((valores > maximo).fillna(False), f"> {maximo}")
+        resumo[coluna] = texto
+    return resumo
+
+
+@instrumentado("histogramas")
+def construir_histogramas(
+    df: pd.DataFrame,
+    chaves: list[str],
+    metricas: list[str],
+    maximo: int = MAXIMO_PADRAO,
+) -> HistogramasPorGrupo:
+    """
+    Uma varredura: grupo de cada linha (combinação das chaves) e bin de cada métrica
+    (valores inteiros; nulos não contam). Devolve as células (grupo, bin) não vazias.
+    """
+    codigos, grupos = _agrupar(df, chaves)
+    n_bins = maximo + 3
+    celulas = {}
+    for metrica in metricas:
+        valores = pd.to_numeric(df[metrica], errors="coerce").astype("Float64")
+        presentes = valores.notna().to_numpy()
+        v = valores.to_numpy(dtype="float64", na_value=0.0)[presentes]
+        bins = np.clip(np.floor(v).astype(np.int64), -1, maximo + 1) + 1
+        celula, contagem = np.unique(codigos[presentes] * n_bins + bins, return_counts=True)
+        celulas[metrica] = (
+            (celula // n_bins).astype(np.int32), (celula % n_bins).astype(np.int16), contagem.astype(np.int64),
+        )
+    return HistogramasPorGrupo(grupos, celulas, maximo)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Iterator
+import codecs
+import json
+
+import pandas as pd
+
+# Registros por bloco convertido em DataFrame
+TAMANHO_BLOCO = 50_000
+# Bytes lidos do arquivo por vez
+_LEITURA = 1 << 20
+_ESPACOS = " \t\n\r"
+_BOM = codecs.BOM_UTF8
+
+
+def _iterar_array(f, decod, buf: str, pos: int, base: int, espera_separador: bool, posicao: dict) -> Iterator[dict]:
+    """
+    Percorre um array JSON de topo objeto a objeto, sem carregar o arquivo inteiro.
+    base é o offset em bytes de buf[0]; posicao["fim"] recebe o byte logo após o último registro.
+    """
+    decoder = json.JSONDecoder()
+    fim_arquivo = False
+    ultimo_fim: int | None = None  # índice (em caracteres de buf) do fim do último registro
+
+    def _ler_mais():
+        nonlocal buf, pos, base, fim_arquivo, ultimo_fim
+        dados = f.read(_LEITURA)
+        fim_arquivo = not dados
+        if ultimo_fim is not None:
+            posicao["fim"] = base + len(buf[:ultimo_fim].encode("utf-8"))
+            ultimo_fim = None
+        base += len(buf[:pos].encode("utf-8"))
+        buf = buf[pos:] + decod.decode(dados, final=fim_arquivo)
+        pos = 0
+
+    while True:
+        while pos < len(buf) and buf[pos] in _ESPACOS:
+            pos += 1
+        if pos >= len(buf):
+            if fim_arquivo:
+                raise ValueError("JSON truncado: array sem ']' final.")
+            _ler_mais()
+            continue
+
+        ch = buf[pos]
+        if ch == "]":
+            break
+        if ch == ",":
+            if not espera_separador:
+                raise ValueError("JSON inválido: ',' fora de lugar no array.")
+            espera_separador = False
+            pos += 1
+            continue
+        if espera_separador:
+            raise ValueError("JSON inválido: faltando ',' entre registros.")
+
+        try:
+            obj, fim = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            obj, fim = None, None
+        # Registro incompleto (ou número cortado no fim do buffer): lê mais e tenta de novo
+        if fim is None or (fim == len(buf) and not fim_arquivo):
+            if fim_arquivo:
+                raise ValueError("JSON inválido ou truncado no meio de um registro.")
+            _ler_mais()
+            continue
+
+        espera_separador = True
+        pos = ultimo_fim = fim
+        yield obj
+
+    if ultimo_fim is not None:
+        posicao["fim"] = base + len(buf[:ultimo_fim].encode("utf-8"))
+
+
+def _iterar_linhas(f, inicio: int, posicao: dict) -> Iterator[dict]:
+    """JSON Lines: um objeto por linha; posicao["fim"] avança linha a linha."""
+    fim = inicio
+    for n, linha in enumerate(f, start=1):
+        fim += len(linha)
+        texto = linha.decode("utf-8").strip()
+        if texto:
+            try:
+                registro = json.loads(texto)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON Lines inválido na linha {n}: {e.msg}") from e
+            posicao["fim"] = fim
+            yield registro
+
+
+def iterar_registros(
+    caminho_arquivo: str | Path,
+    inicio: int = 0,
+    posicao: dict | None = None,
+) -> Iterator[dict]:
+    """
+    Lê registros de um arquivo JSON um a um, com memória limitada.
+
+    Aceita:
+    - array JSON de topo: [ {...}, {...} ]
+    - JSON Lines (um objeto por linha, .jsonl / .ndjson)
+    O formato é detectado pelo primeiro caractere do arquivo.
+
+    inicio: offset em bytes logo após o último registro de uma leitura anterior
+    (posicao["fim"]); a leitura continua dali, lendo só os registros novos.
+    posicao: dict opcional que recebe "formato" ("array"/"linhas") e "fim"
+    (offset em bytes logo após o último registro lido).
+    """
+    if posicao is None:
+        posicao = {}
+    posicao["fim"] = inicio
+    with open(caminho_arquivo, "rb") as f:
+        cabecalho = f.read(_LEITURA)
+        salto_bom = len(_BOM) if cabecalho.startswith(_BOM) else 0
+        eh_array = cabecalho[salto_bom:].lstrip(_ESPACOS.encode())[:1] == b"["
+        posicao["formato"] = "array" if eh_array else "linhas"
+
+        if not eh_array:
+            f.seek(max(inicio, salto_bom))
+            yield from _iterar_linhas(f, max(inicio, salto_bom), posicao)
+            return
+
+        decod = codecs.getincrementaldecoder("utf-8")()
+        if inicio:
+            # Continuação: logo depois de um registro, então o próximo caractere útil é ',' ou ']'
+            f.seek(inicio)
+            buf, pos, base, espera_separador = "", 0, inicio, True
+        else:
+            buf = decod.decode(cabecalho[salto_bom:], final=not cabecalho)
+            pos, base, espera_separador = buf.index("[") + 1, salto_bom, False
+        yield from _iterar_array(f, decod, buf, pos, base, espera_separador, posicao)
+
+
+def ler_em_blocos(
+    caminho_arquivo: str | Path,
+    tamanho_bloco: int = TAMANHO_BLOCO,
+    inicio: int = 0,
+    posicao: dict | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Devolve o arquivo em DataFrames de até tamanho_bloco linhas.
+    Só um bloco de dicts Python existe em memória por vez.
+    inicio/posicao: ver iterar_registros.
+    """
+    bloco: list[dict] = []
+    for registro in iterar_registros(caminho_arquivo, inicio, posicao):
+        bloco.append(registro)
+        if len(bloco) >= tamanho_bloco:
+            yield pd.DataFrame.from_records(bloco)
+            bloco = []
+    if bloco:
+        yield pd.DataFrame.from_records(bloco)
@@ -0,0 +1,265 @@
+"""
+Instrumentação por etapa das execuções das páginas: tempo de parede, linhas de
+entrada/saída e pico de alocação (tracemalloc) de cada etapa nomeada
+(ler JSON, normalizar, filtrar, agregar, montar figura, exibir tabela...).
+
+Desligada por padrão: etapa() vira um contexto vazio e nada é medido. Para ligar:
+
+    PROPEGI_INSTRUMENTAR=1 streamlit run app.py        # tempo, linhas e memória
+    PROPEGI_INSTRUMENTAR=tempo streamlit run app.py    # sem tracemalloc (mais leve)
+
+Cada execução (rerun) da página vai para o painel de depuração da barra lateral
+(painel_instrumentacao) e para um log JSON Lines, uma linha por etapa, que pode ser
+agregado entre sessões e processos: PROPEGI_INSTRUMENTACAO_LOG (padrão:
+<pasta temporária>/propegi_instrumentacao.jsonl). Fora de uma execução de página
+(ex.: relatorios.py), cada etapa de primeiro nível vai direto para o log.
+
+O tracemalloc é global ao processo: com várias sessões rodando ao mesmo tempo, o
+pico de uma etapa inclui o que as outras alocaram no mesmo intervalo.
+"""
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+import pandas as pd
+
+T = TypeVar("T")
+
+VARIAVEL_ATIVAR = "PROPEGI_INSTRUMENTAR"
+VARIAVEL_LOG = "PROPEGI_INSTRUMENTACAO_LOG"
+LOG_PADRAO = Path(tempfile.gettempdir()) / "propegi_instrumentacao.jsonl"
+
+_DESLIGADO = {"", "0", "false", "nao", "não", "off"}
+_LOG_LOCK = threading.Lock()
+# Execução e pilha de etapas da thread atual (o Streamlit roda cada sessão numa thread)
+_LOCAL = threading.local()
+
+
+def instrumentacao_ativa() -> bool:
+    return os.environ.get(VARIAVEL_ATIVAR, "").strip().lower() not in _DESLIGADO
+
+
+def _mede_memoria() -> bool:
+    return os.environ.get(VARIAVEL_ATIVAR, "").strip().lower() != "tempo"
+
+
+def caminho_log() -> Path:
+    return Path(os.environ.get(VARIAVEL_LOG) or LOG_PADRAO)
+
+
+def contar_linhas(obj) -> int | None:
+    """Linhas de um DataFrame/Series/array/PivotEsparso (ou a soma, numa lista deles); None se não se aplica."""
+    if isinstance(obj, (list, tuple)):
+        partes = [contar_linhas(o) for o in obj]
+        return sum(partes) if partes and None not in partes else None
+    forma = getattr(obj, "shape", None)
+    if isinstance(forma, tuple) and forma:
+        return int(forma[0])
+    return None
+
+
+@dataclass
+class Etapa:
+    nome: str
+    nivel: int
+    linhas_entrada: int | None = None
+    linhas_saida: int | None = None
+    segundos: float = 0.0
+    pico_bytes: int | None = None
+    info: dict = field(default_factory=dict)
+    # uso interno: memória no início e maior pico absoluto visto nas sub-etapas
+    _base: int = field(default=0, repr=False)
+    _pico_filhas: int = field(default=0, repr=False)
+
+    def saida(self, obj: T) -> T:
+        """Registra as linhas de saída de obj e o devolve (ex.: return e.saida(df))."""
+        self.linhas_saida = contar_linhas(obj)
+        return obj
+
+
+class _EtapaNula:
+    """Etapa usada com a instrumentação desligada: não guarda nada."""
+
+    __slots__ = ()
+
+    @property
+    def info(self) -> dict:
+        return {}
+
+    def saida(self, obj: T) -> T:
+        return obj
+
+
+_ETAPA_NULA = _EtapaNula()
+
+
+@dataclass
+class Execucao:
+    rotulo: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    inicio: float = field(default_factory=time.time)
+    etapas: list[Etapa] = field(default_factory=list)
+
+
+def iniciar_execucao(rotulo: str) -> None:
+    """Começa a registrar uma execução (ex.: o rerun de uma página); sem efeito se desligada."""
+    if not instrumentacao_ativa():
+        return
+    if _mede_memoria() and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _LOCAL.execucao = Execucao(rotulo)
+    _LOCAL.pilha = []
+
+
+def finalizar_execucao() -> list[Etapa]:
+    """Encerra a execução atual, grava as etapas no log e as devolve (para o painel)."""
+    execucao = getattr(_LOCAL, "execucao", None)
+    _LOCAL.execucao = None
+    _LOCAL.pilha = []
+    if execucao is None:
+        return []
+    _gravar_log(execucao.rotulo, execucao.id, execucao.etapas)
+    return execucao.etapas
+
+
+@contextmanager
+def execucao_instrumentada(rotulo: str) -> Iterator[None]:
+    """
+    Envolve o rerun de uma página (no app/home, em volta do pagina.run()): registra as
+    etapas e, no fim (inclusive após st.stop), grava o log e mostra o painel.
+    """
+    iniciar_execucao(rotulo)
+    try:
+        yield
+    finally:
+        painel_instrumentacao(finalizar_execucao())
+
+
+@contextmanager
+def etapa(nome: str, entrada=None, **info) -> Iterator[Etapa | _EtapaNula]:
+    """
+    Mede o bloco como uma etapa: with etapa("agrupar", df) as e: tabela = e.saida(...).
+    entrada: objeto (DataFrame etc.) ou número de linhas de entrada. info: campos extras no log.
+    Etapas dentro de etapas aparecem com nível maior (o tempo da mãe inclui o das filhas).
+    """
+    if not instrumentacao_ativa():
+        yield _ETAPA_NULA
+        return
+
+    pilha: list[Etapa] = getattr(_LOCAL, "pilha", None) or []
+    _LOCAL.pilha = pilha
+    linhas = entrada if isinstance(entrada, int) or entrada is None else contar_linhas(entrada)
+    registro = Etapa(nome, len(pilha), linhas, info=dict(info))
+
+    memoria = tracemalloc.is_tracing()
+    if memoria:
+        atual, pico = tracemalloc.get_traced_memory()
+        if pilha:
+            pilha[-1]._pico_filhas = max(pilha[-1]._pico_filhas, pico)
+        tracemalloc.reset_peak()
+        registro._base = atual
+
+    execucao = getattr(_LOCAL, "execucao", None)
+    if execucao is not None:
+        execucao.etapas.append(registro)
+    pilha.append(registro)
+    t0 = time.perf_counter()
+    try:
+        yield registro
+    finally:
+        registro.segundos = time.perf_counter() - t0
+        pilha.pop()
+        if memoria and tracemalloc.is_tracing():
+            pico = max(tracemalloc.get_traced_memory()[1], registro._pico_filhas)
+            registro.pico_bytes = max(pico - registro._base, 0)
+            if pilha:
+                pilha[-1]._pico_filhas = max(pilha[-1]._pico_filhas, pico)
+        if execucao is None and not pilha:
+            _gravar_log(None, None, [registro])
+
+
+def instrumentado(nome: str | None = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorador: cada chamada vira uma etapa (nome da função por padrão), com as linhas
+    do primeiro argumento como entrada e as do retorno como saída.
+    """
+    def decorar(func: Callable[..., T]) -> Callable[..., T]:
+        rotulo = nome or func.__name__
+
+        @wraps(func)
+        def envolvida(*args, **kwargs):
+            if not instrumentacao_ativa():
+                return func(*args, **kwargs)
+            with etapa(rotulo, args[0] if args else None) as e:
+                return e.saida(func(*args, **kwargs))
+        return envolvida
+    return decorar
+
+
+def _gravar_log(rotulo: str | None, id_execucao: str | None, etapas: list[Etapa]) -> None:
+    if not etapas:
+        return
+    agora = datetime.now(timezone.utc).isoformat(timespec="milliseconds")
+    linhas = []
+    for e in etapas:
+        linha = {
+            "ts": agora, "pid": os.getpid(), "execucao": id_execucao, "rotulo": rotulo,
+            "etapa": e.nome, "nivel": e.nivel, "segundos": round(e.segundos, 6),
+            "linhas_entrada": e.linhas_entrada, "linhas_saida": e.linhas_saida, "pico_bytes": e.pico_bytes,
+        }
+        linha.update(e.info)
+        linhas.append(json.dumps(linha, ensure_ascii=False, default=str))
+    try:
+        destino = caminho_log()
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        with _LOG_LOCK, open(destino, "a", encoding="utf-8") as f:
+            f.write("\n".join(linhas) + "\n")
+    except OSError:
+        pass  # log é auxiliar: falha ao gravar não derruba a página
+
+
+def tabela_etapas(etapas: list[Etapa]) -> pd.DataFrame:
+    """Etapas em tabela (nome recuado pelo nível), como no painel."""
+    return pd.DataFrame({
+        "Etapa": ["  " * e.nivel + e.nome for e in etapas],
+        "ms": [e.segundos * 1000 for e in etapas],
+        "Linhas (entrada)": pd.array([e.linhas_entrada for e in etapas], dtype="Int64"),
+        "Linhas (saída)": pd.array([e.linhas_saida for e in etapas], dtype="Int64"),
+        "Pico (MB)": [None if e.pico_bytes is None else e.pico_bytes / 1e6 for e in etapas],
+        "Detalhes": [", ".join(f"{k}={v}" for k, v in e.info.items()) for e in etapas],
+    })
+
+
+def ler_log(caminho: str | Path | None = None) -> pd.DataFrame:
+    """Log JSON Lines em DataFrame, para agregar entre sessões (ex.: groupby('etapa'))."""
+    destino = Path(caminho) if caminho is not None else caminho_log()
+    if not destino.exists():
+        return pd.DataFrame()
+    return pd.read_json(destino, lines=True)
+
+
+def painel_instrumentacao(etapas: list[Etapa]) -> None:
+    """Painel de depuração na barra lateral com as etapas da execução (nada se desligada)."""
+    if not etapas:
+        return
+    import streamlit as st
+
+    total = sum(e.segundos for e in etapas if e.nivel == 0)
+    with st.sidebar.expander(f"⏱ Instrumentação — {total * 1000:,.0f} ms", expanded=False):
+        st.dataframe(
+            tabela_etapas(etapas).style.format({"ms": "{:,.1f}", "Pico (MB)": "{:,.2f}"}, na_rep="—"),
+            hide_index=True,
+            width="stretch",
+        )
+        st.caption(f"Log: {caminho_log()}")
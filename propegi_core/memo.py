@@ -0,0 +1,80 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+import threading
+
+import pandas as pd
+
+T = TypeVar("T")
+
+# Quantas estruturas derivadas (cubos, índices, relatórios...) ficam em memória (LRU)
+MEMO_MAX_ENTRADAS = 64
+
+_MEMO: "OrderedDict[tuple, object]" = OrderedDict()
+_MEMO_LOCK = threading.Lock()
+
+
+def versao_dataset(df: pd.DataFrame) -> Hashable | None:
+    """
+    Versão do dataset carregado (fingerprint em df.attrs["versao"]) + número de linhas.
+    Retorna None se o DataFrame não veio de um carregador com cache.
+    """
+    versao = df.attrs.get("versao")
+    if versao is None:
+        return None
+    return (versao, len(df))
+
+
+def versao_posicional(df: pd.DataFrame) -> Hashable | None:
+    """
+    versao_dataset(df) só se df tiver o índice padrão (RangeIndex 0..n-1); senão None.
+    Para estruturas que guardam posições de linha (índices de filtro, top-N): um recorte
+    ou um frame reordenado herda df.attrs da base — e, com o mesmo número de linhas, a
+    mesma versão —, mas as linhas dele não estão nas mesmas posições.
+    """
+    indice = df.index
+    if not (isinstance(indice, pd.RangeIndex) and indice.start == 0 and indice.step == 1):
+        return None
+    return versao_dataset(df)
+
+
+def memo_por_versao(nome: str, versao: Hashable | None, construir: Callable[[], T]) -> T:
+    """
+    Calcula construir() uma vez por (nome, versão do dataset) e reaproveita depois.
+    Sem versão (None), apenas calcula, sem guardar.
+    """
+    if versao is None:
+        return construir()
+    chave = (nome, versao)
+    with _MEMO_LOCK:
+        if chave in _MEMO:
+            _MEMO.move_to_end(chave)
+            return _MEMO[chave]  # type: ignore[return-value]
+
+    valor = construir()
+    with _MEMO_LOCK:
+        valor = _MEMO.setdefault(chave, valor)
+        _MEMO.move_to_end(chave)
+        _podar()
+    return valor  # type: ignore[return-value]
+
+
+def guardar_memo(nome: str, versao: Hashable | None, valor: T) -> T:
+    """Registra um valor já calculado (ex.: atualizado de forma incremental) para (nome, versão)."""
+    if versao is not None:
+        with _MEMO_LOCK:
+            _MEMO[(nome, versao)] = valor
+            _MEMO.move_to_end((nome, versao))
+            _podar()
+    return valor
+
+
+def _podar() -> None:
+    while len(_MEMO) > MEMO_MAX_ENTRADAS:
+        _MEMO.popitem(last=False)
+
+
+def limpar_memo() -> None:
+    """Descarta todas as estruturas derivadas guardadas."""
+    with _MEMO_LOCK:
+        _MEMO.clear()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Iterable, Mapping
+
+import pandas as pd
+from pandas.api.types import CategoricalDtype
+
+
+def _eh_categoria(serie: pd.Series) -> bool:
+    return isinstance(serie.dtype, CategoricalDtype)
+
+
+def compactar(
+    df: pd.DataFrame,
+    categorias: Iterable[str] = (),
+    inteiros: Mapping[str, str] | None = None,
+    floats32: Iterable[str] = (),
+) -> pd.DataFrame:
+    """
+    Reduz o uso de memória de um DataFrame normalizado (altera e devolve o próprio df).
+    - categorias: colunas de texto repetitivo -> category (categorias em ordem alfabética)
+    - inteiros: {coluna: dtype}, ex. {"Ano": "Int16"} (nullable, aceita <NA>)
+    - floats32: colunas numéricas em que float32 basta (não use para dinheiro)
+    Colunas ausentes são ignoradas.
+    """
+    for col in categorias:
+        if col in df.columns and not _eh_categoria(df[col]):
+            df[col] = df[col].astype("category")
+    for col, dtype in (inteiros or {}).items():
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+    for col in floats32:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+    return df
+
+
+def concat_categoricos(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    pd.concat que preserva colunas category: unifica as categorias (ordem alfabética)
+    antes de concatenar. Sem isso, blocos com categorias diferentes viram object.
+    """
+    colunas = {c for f in frames for c in f.columns if _eh_categoria(f[c])}
+    if colunas and len(frames) > 1:
+        frames = list(frames)
+        for col in colunas:
+            uniao = pd.Index([])
+            for f in frames:
+                if col in f.columns:
+                    serie = f[col]
+                    uniao = uniao.union(serie.cat.categories if _eh_categoria(serie) else pd.Index(serie.dropna().unique()))
+            try:
+                uniao = uniao.sort_values()
+            except TypeError:  # categorias de tipos misturados
+                pass
+            tipo = CategoricalDtype(uniao)
+            frames = [
+                f.assign(**{col: f[col].astype(tipo) if col in f.columns else pd.Categorical([None] * len(f), dtype=tipo)})
+                for f in frames
+            ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def preencher_nulos(serie: pd.Series, valor) -> pd.Series:
+    """fillna que também funciona em colunas category (adiciona a categoria se preciso)."""
+    if _eh_categoria(serie) and valor not in serie.cat.categories:
+        serie = serie.cat.add_categories([valor])
+    return serie.fillna(valor)
+
+
+def memory_report(antes: pd.DataFrame, depois: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compara o uso de memória por coluna (memory_usage(deep=True)) antes e depois da compactação.
+    Devolve uma tabela com dtype e bytes antes/depois, a redução em % e uma linha TOTAL.
+    """
+    colunas = list(dict.fromkeys([*antes.columns, *depois.columns]))
+    bytes_antes = antes.memory_usage(index=False, deep=True)
+    bytes_depois = depois.memory_usage(index=False, deep=True)
+    rel = pd.DataFrame({
+        "dtype antes": [str(antes[c].dtype) if c in antes.columns else "-" for c in colunas],
+        "dtype depois": [str(depois[c].dtype) if c in depois.columns else "-" for c in colunas],
+        "bytes antes": [int(bytes_antes.get(c, 0)) for c in colunas],
+        "bytes depois": [int(bytes_depois.get(c, 0)) for c in colunas],
+    }, index=pd.Index(colunas, name="coluna"))
+    rel.loc["TOTAL"] = ["", "", int(rel["bytes antes"].sum()), int(rel["bytes depois"].sum())]
+    antes_b = rel["bytes antes"].astype("float64")
+    rel["redução %"] = ((1 - rel["bytes depois"].astype("float64") / antes_b.where(antes_b > 0)) * 100).round(1)
+    return rel
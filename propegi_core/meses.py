@@ -0,0 +1,61 @@
+"""Mapa único de meses usado pelos três painéis."""
+from __future__ import annotations
+
+import pandas as pd
+
+from .busca import normalizar_texto
+
+# Abreviações em português (AnoMes do Financeiro: "2025-Jan", "2025-Fev"...)
+MESES_ABREV = {
+    1: "Jan", 2: "Fev", 3: "Mar", 4: "Abr",
+    5: "Mai", 6: "Jun", 7: "Jul", 8: "Ago",
+    9: "Set", 10: "Out", 11: "Nov", 12: "Dez",
+}
+
+MESES_NOME = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro",
+}
+
+# Abreviações de strftime("%b") no locale padrão (MesNome do PDT: "01/Jan", "02/Feb"...)
+MESES_ABREV_EN = {
+    1: "Jan", 2: "Feb", 3: "Mar", 4: "Apr",
+    5: "May", 6: "Jun", 7: "Jul", 8: "Aug",
+    9: "Sep", 10: "Oct", 11: "Nov", 12: "Dec",
+}
+
+# nome ou abreviação (sem acento, minúsculo) -> número
+_NUMERO_POR_NOME = {
+    normalizar_texto(nome): num
+    for mapa in (MESES_NOME, MESES_ABREV)
+    for num, nome in mapa.items()
+}
+
+
+def numero_do_mes(serie: pd.Series) -> pd.Series:
+    """
+    Número do mês (Int8, <NA> se desconhecido) a partir do nome: "Março", "marco",
+    "MAR" e "Mar" dão 3. Só os valores distintos são normalizados.
+    """
+    distintos = pd.Series(serie.dropna().unique())
+    mapa = {v: _NUMERO_POR_NOME.get(normalizar_texto(v).strip()) for v in distintos}
+    return serie.map(mapa).astype("Int8")
+
+
+def rotulo_mes_en(mes: int) -> str:
+    """Rótulo "%m/%b" do PDT (ex.: 1 -> "01/Jan")."""
+    return f"{mes:02d}/{MESES_ABREV_EN[mes]}"
+
+
+def ano_e_mes(datas: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """
+    Ano (Int64) e mês (Int8) de uma série datetime64, por aritmética inteira sobre os
+    meses desde 1970 (sem .dt.year/.dt.month campo a campo); NaT vira <NA>.
+    """
+    valores = datas.to_numpy()
+    nulos = pd.isna(valores)
+    meses = valores.astype("datetime64[M]").astype("int64")
+    ano = pd.Series(pd.arrays.IntegerArray(meses // 12 + 1970, nulos), index=datas.index)
+    mes = pd.Series(pd.arrays.IntegerArray((meses % 12 + 1).astype("int8"), nulos.copy()), index=datas.index)
+    return ano, mes
@@ -0,0 +1,153 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_string_dtype
+
+# Linhas convertidas por vez (limita a matriz de caracteres em memória)
+_BLOCO = 1_000_000
+_POT10 = 10.0 ** np.arange(19)
+
+# Classe de cada caractere (code point < 256); o resto é inválido
+_INVALIDO, _DIGITO, _VIRGULA, _PONTO, _SINAL, _ESPACO, _R, _CIFRAO = range(8)
+_CLASSE = np.zeros(257, dtype=np.int8)
+_CLASSE[ord("0"):ord("9") + 1] = _DIGITO
+_CLASSE[ord(",")] = _VIRGULA
+_CLASSE[ord(".")] = _PONTO
+_CLASSE[ord("-")] = _SINAL
+_CLASSE[ord("+")] = _SINAL
+for _ch in "\0 \t\n\r\xa0":  # padding do array e espaços
+    _CLASSE[ord(_ch)] = _ESPACO
+_CLASSE[ord("R")] = _R
+_CLASSE[ord("$")] = _CIFRAO
+
+# Fases do texto: espaços, prefixo 'R$' opcional, sinal opcional, número, espaços.
+# _TRANSICAO[fase, classe] -> próxima fase; _ERRO é absorvente (texto não é número)
+_INICIO, _VIU_R, _APOS_CIFRAO, _NUMERO, _FIM, _ERRO = range(6)
+_TRANSICAO = np.full((6, 8), _ERRO, dtype=np.int8)
+_TRANSICAO[[_INICIO, _APOS_CIFRAO, _NUMERO], _DIGITO:_PONTO + 1] = _NUMERO
+_TRANSICAO[[_INICIO, _APOS_CIFRAO], _SINAL] = _NUMERO
+_TRANSICAO[_INICIO, _ESPACO] = _INICIO
+_TRANSICAO[_INICIO, _R] = _VIU_R
+_TRANSICAO[_VIU_R, _CIFRAO] = _APOS_CIFRAO
+_TRANSICAO[_APOS_CIFRAO, _ESPACO] = _APOS_CIFRAO
+_TRANSICAO[[_NUMERO, _FIM], _ESPACO] = _FIM
+
+_eh_str = np.frompyfunc(lambda v: isinstance(v, str), 1, 1)
+_eh_nan_float = np.frompyfunc(lambda v: isinstance(v, float) and v != v, 1, 1)
+
+
+def _float_texto(texto: str) -> float | None:
+    """Caminho antigo (float() após tirar pontos e trocar a vírgula), para o que a matriz não cobre; None se falhar."""
+    try:
+        return float(texto.strip().replace(".", "").replace(",", "."))
+    except ValueError:
+        return None
+
+
+_float_texto_vet = np.frompyfunc(_float_texto, 1, 1)
+
+
+def _texto_br_para_float(textos: np.ndarray) -> np.ndarray:
+    """
+    Converte um array de strings pt-BR em float64 (NaN onde não é número).
+
+    Trabalha sobre a matriz de code points (linhas x caracteres) e percorre
+    apenas as colunas de caracteres, então o custo é O(linhas * largura) em NumPy.
+    """
+    u = textos.astype("U")
+    n = len(u)
+    largura = u.dtype.itemsize // 4
+    colunas = u.view(np.uint32).reshape(n, largura).T.copy()
+
+    mantissa = np.zeros(n, dtype=np.int64)
+    n_digitos = np.zeros(n, dtype=np.int64)
+    decimais = np.zeros(n, dtype=np.int64)
+    viu_virgula = np.zeros(n, dtype=bool)
+    negativo = np.zeros(n, dtype=bool)
+    fase = np.full(n, _INICIO, dtype=np.int8)
+
+    for c in colunas:
+        classe = _CLASSE[np.minimum(c, 256)]
+        fase = _TRANSICAO[fase, classe]
+
+        digito = classe == _DIGITO
+        mantissa *= np.where(digito, 10, 1)
+        mantissa += np.where(digito, c.astype(np.int64) - 48, 0)
+        n_digitos += digito
+        decimais += digito & viu_virgula
+
+        virgula = classe == _VIRGULA
+        fase[virgula & viu_virgula] = _ERRO  # mais de uma vírgula
+        viu_virgula |= virgula
+        negativo |= c == ord("-")
+
+    valido = fase != _ERRO
+    valido &= (n_digitos > 0) & (n_digitos <= 18)
+    # mantissa / 10^k é arredondado corretamente, igual a float('32617.27')
+    out = mantissa / _POT10[np.minimum(decimais, 18)]
+    np.negative(out, out=out, where=negativo)
+    out[~valido] = np.nan
+    return out
+
+
+def br_para_float(serie: pd.Series) -> pd.Series:
+    """
+    Converte uma coluna de valores em formato brasileiro para float, de forma vetorizada.
+
+    - '32.617,27' -> 32617.27, 'R$ 1.234,56' -> 1234.56, '-5,00' -> -5.0
+    - 'R$' e espaços só valem como prefixo/nas pontas: '5R', '$5', '1 234', '- 5' são lixo
+    - Números já numéricos são mantidos (coluna numérica passa direto, inclusive NaN;
+      NaN solto numa coluna de texto também continua NaN)
+    - Mais de 18 dígitos ou expoente ('1e5') seguem o float() dos conversores antigos
+    - None / vazio -> 0.0
+    - Texto que não é número (lixo) -> 0.0 (ver br_para_float_com_invalidos)
+    """
+    return br_para_float_com_invalidos(serie)[0]
+
+
+def br_para_float_com_invalidos(serie: pd.Series) -> tuple[pd.Series, np.ndarray]:
+    """
+    Como br_para_float, devolvendo também a máscara (bool, por linha) dos valores que
+    viraram 0.0 por não serem número: texto lixo ou objeto não numérico. None, NaN e
+    texto vazio/só espaços não contam como inválidos.
+    """
+    if is_numeric_dtype(serie) and not is_bool_dtype(serie):
+        return serie.astype("float64"), np.zeros(len(serie), dtype=bool)
+
+    valores = serie.to_numpy(dtype=object)
+    if is_string_dtype(serie.dtype) and serie.dtype != object:
+        eh_texto = serie.notna().to_numpy()
+    else:
+        eh_texto = _eh_str(valores).astype(bool)
+
+    out = np.zeros(len(valores), dtype=np.float64)
+    idx_texto = np.flatnonzero(eh_texto)
+    for ini in range(0, len(idx_texto), _BLOCO):
+        idx = idx_texto[ini:ini + _BLOCO]
+        out[idx] = _texto_br_para_float(valores[idx])
+    # O que a matriz recusou (mais de 18 dígitos, expoente, lixo) tenta o float() antigo, só nessas linhas
+    # ('nan' escrito por extenso continua NaN, como no float() antigo)
+    nan_solto = np.zeros(len(valores), dtype=bool)
+    idx = idx_texto[np.isnan(out[idx_texto])]
+    if len(idx):
+        convertidos = _float_texto_vet(valores[idx])
+        falhou = convertidos == None  # noqa: E711 (comparação elemento a elemento)
+        convertidos[falhou] = np.nan
+        out[idx] = convertidos.astype(np.float64)
+        nan_solto[idx] = ~falhou & np.isnan(out[idx])
+
+    # Números soltos numa coluna de texto (ex.: 1234.5 no meio de strings)
+    if not eh_texto.all():
+        out[~eh_texto] = pd.to_numeric(pd.Series(valores[~eh_texto]), errors="coerce").to_numpy(dtype=np.float64)
+        if serie.dtype == object:
+            # float NaN (não None) continua NaN, como nos conversores antigos
+            nan_solto[~eh_texto] = _eh_nan_float(valores[~eh_texto]).astype(bool)
+
+    nao_convertidos = np.isnan(out) & ~nan_solto
+    invalidos = nao_convertidos & ~pd.isna(valores)
+    if invalidos.any():
+        # texto vazio ou só com espaços é "sem valor", não lixo (só as linhas que falharam)
+        idx = np.flatnonzero(invalidos & eh_texto)
+        invalidos[idx] = pd.Series(valores[idx], dtype="string").str.strip().ne("").to_numpy(dtype=bool)
+    out[nao_convertidos] = 0.0
+    return pd.Series(out, index=serie.index, name=serie.name), invalidos
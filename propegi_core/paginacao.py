@@ -0,0 +1,26 @@
+"""Paginação simples para tabelas e listas exibidas nas páginas."""
+from __future__ import annotations
+import math
+from typing import Sequence, TypeVar, Union
+
+import pandas as pd
+
+T = TypeVar("T")
+
+
+def total_paginas(n_itens: int, tamanho_pagina: int) -> int:
+    """Quantidade de páginas (pelo menos 1, mesmo sem itens)."""
+    return max(1, math.ceil(n_itens / tamanho_pagina))
+
+
+def paginar(
+    itens: Union[pd.DataFrame, Sequence[T]],
+    pagina: int,
+    tamanho_pagina: int,
+) -> Union[pd.DataFrame, Sequence[T]]:
+    """Fatia da página (1 = primeira); página fora do intervalo é ajustada ao limite."""
+    pagina = min(max(1, int(pagina)), total_paginas(len(itens), tamanho_pagina))
+    inicio = (pagina - 1) * tamanho_pagina
+    if isinstance(itens, pd.DataFrame):
+        return itens.iloc[inicio:inicio + tamanho_pagina]
+    return itens[inicio:inicio + tamanho_pagina]
@@ -0,0 +1,64 @@
+"""
+Tabela de períodos (dimensão mês a mês) compartilhada pelos painéis.
+
+Uma linha por mês entre dois anos, com os rótulos que os domínios usam: Ano, Mes,
+MesAbrev ("Jan"), MesNome ("01/Jan", do PDT), AnoMes ("2025-Jan", do Financeiro),
+ord_col (AAAAMM) e Trimestre ("Q1"). É montada uma vez por faixa de anos e consultada
+por posição — o mês m do ano a fica na linha (a - ano_inicial) * 12 + (m - 1) —, em vez
+de formatar datas/textos linha a linha.
+"""
+from __future__ import annotations
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .meses import MESES_ABREV, rotulo_mes_en
+
+COLUNAS_PERIODO = ["Ano", "Mes", "MesAbrev", "MesNome", "AnoMes", "ord_col", "Trimestre"]
+
+
+@lru_cache(maxsize=32)
+def tabela_periodos(ano_inicial: int, ano_final: int | None = None) -> pd.DataFrame:
+    """
+    Meses de ano_inicial a ano_final (padrão: só ano_inicial), em ordem cronológica.
+    A mesma tabela é devolvida a cada chamada com a mesma faixa: não a altere.
+    """
+    ano_final = ano_inicial if ano_final is None else ano_final
+    anos = np.repeat(np.arange(ano_inicial, max(ano_final, ano_inicial - 1) + 1), 12)
+    meses = np.tile(np.arange(1, 13), len(anos) // 12)
+    abrev = [MESES_ABREV[m] for m in meses]
+    return pd.DataFrame({
+        "Ano": anos,
+        "Mes": meses,
+        "MesAbrev": abrev,
+        "MesNome": [rotulo_mes_en(m) for m in meses],
+        "AnoMes": [f"{a}-{ab}" for a, ab in zip(anos, abrev)],
+        "ord_col": anos * 100 + meses,
+        "Trimestre": [f"Q{(m - 1) // 3 + 1}" for m in meses],
+    })
+
+
+def localizar(ano: pd.Series, mes: pd.Series) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Tabela de períodos que cobre os anos da série e a linha dela para cada (ano, mês);
+    -1 onde o ano for nulo ou o mês nulo/fora de 1..12.
+    """
+    a = pd.to_numeric(ano, errors="coerce").astype("Int64").to_numpy(dtype="int64", na_value=-1)
+    m = pd.to_numeric(mes, errors="coerce").astype("Int64").to_numpy(dtype="int64", na_value=0)
+    validos = (a >= 0) & (m >= 1) & (m <= 12)
+    if not validos.any():
+        return tabela_periodos(0, -1), np.full(len(a), -1, dtype=np.int64)
+    inicio, fim = int(a[validos].min()), int(a[validos].max())
+    posicoes = np.where(validos, (a - inicio) * 12 + m - 1, -1)
+    return tabela_periodos(inicio, fim), posicoes
+
+
+def categorizar(periodos: pd.DataFrame, coluna: str, posicoes: np.ndarray) -> pd.Categorical:
+    """
+    Valores de `coluna` da tabela nas posições dadas (-1 -> nulo), como category com as
+    categorias presentes em ordem alfabética (o mesmo que memoria.compactar produziria).
+    """
+    categorias, codigos = np.unique(periodos[coluna].to_numpy(dtype=object), return_inverse=True)
+    codigos_linhas = np.where(posicoes >= 0, codigos[np.maximum(posicoes, 0)], -1) if len(codigos) else posicoes
+    return pd.Categorical.from_codes(codigos_linhas, categorias.tolist()).remove_unused_categories()
@@ -0,0 +1,57 @@
+"""
+Os N maiores valores de uma coluna (ex.: os 5 registros mais recentes) sem ordenar
+nem copiar o DataFrame inteiro.
+
+np.argpartition separa as N maiores chaves em O(n); só esses candidatos (mais os
+empates com o N-ésimo) são ordenados. O resultado é o mesmo de
+df.sort_values(coluna, ascending=False, kind="stable").head(n): nulos por último e
+empates na ordem original das linhas.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .memo import memo_por_versao, versao_posicional
+
+
+def _chave_ordenacao(serie: pd.Series) -> np.ndarray:
+    """Chave numérica comparável (datas em ns); nulos viram o menor valor possível."""
+    nulos = serie.isna().to_numpy()
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        chave = serie.to_numpy(dtype="datetime64[ns]").view(np.int64).copy()
+        chave[nulos] = np.iinfo(np.int64).min
+        return chave
+    chave = pd.to_numeric(serie, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(nulos | np.isnan(chave), -np.inf, chave)
+
+
+def posicoes_maiores(serie: pd.Series, n: int) -> np.ndarray:
+    """Posições das n maiores entradas da série, da maior para a menor (empates: ordem original)."""
+    chave = _chave_ordenacao(serie)
+    k = min(max(int(n), 0), len(chave))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(chave):
+        limiar = chave[np.argpartition(chave, len(chave) - k)[len(chave) - k]]
+        candidatos = np.flatnonzero(chave >= limiar)
+    else:
+        candidatos = np.arange(len(chave))
+    # argsort estável sobre a ordem invertida e depois desinvertido: decrescente, empates na ordem original
+    invertidos = candidatos[::-1]
+    ordem = invertidos[np.argsort(chave[invertidos], kind="stable")][::-1]
+    return ordem[:k]
+
+
+def maiores(df: pd.DataFrame, coluna: str, n: int = 5) -> pd.DataFrame:
+    """As n linhas com os maiores valores de `coluna`, em ordem decrescente."""
+    return df.take(posicoes_maiores(df[coluna], n))
+
+
+def maiores_em_cache(df: pd.DataFrame, coluna: str, n: int = 5) -> pd.DataFrame:
+    """
+    maiores() uma vez por versão do dataset; só para frames com índice padrão (ver
+    memo.versao_posicional). O frame devolvido é compartilhado entre reruns: não o altere.
+    """
+    versao = versao_posicional(df)
+    return memo_por_versao(f"maiores:{coluna}:{n}", versao, lambda: maiores(df, coluna, n))
@@ -0,0 +1,86 @@
+"""
+Estado compartilhado entre as páginas de um painel (st.navigation).
+
+- O ponto de entrada (app.py / home.py) carrega o dataset uma vez por execução pelo
+  armazém do processo (propegi_core.armazem: imutável, compartilhado pelo servidor) e
+  publica a referência na sessão; as páginas só leem, sem recarregar nem normalizar.
+- Os filtros (anos, projetos...) ficam guardados na sessão com chaves próprias, fora
+  dos widgets: o Streamlit descarta o estado de um widget quando a página que o desenha
+  sai da tela, então a seleção sobreviveria só enquanto o usuário ficasse na página.
+"""
+from __future__ import annotations
+from typing import Callable, Hashable, Iterable, Sequence
+
+import pandas as pd
+import streamlit as st
+
+_PREFIXO_DATASET = "dataset:"
+_PREFIXO_WIDGET = "_widget:"
+
+
+def publicar_dataset(nome: str, df: pd.DataFrame) -> None:
+    """Guarda na sessão a referência ao dataset carregado pelo ponto de entrada."""
+    st.session_state[_PREFIXO_DATASET + nome] = df
+
+
+def dataset_da_sessao(nome: str, carregar: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Dataset publicado pelo ponto de entrada; se a página rodar sozinha
+    (ex.: streamlit run pages/...), carrega com carregar() e publica.
+    """
+    df = st.session_state.get(_PREFIXO_DATASET + nome)
+    if df is None:
+        df = carregar()
+        publicar_dataset(nome, df)
+    return df
+
+
+def _copiar_widget(chave: str) -> None:
+    st.session_state[chave] = st.session_state[_PREFIXO_WIDGET + chave]
+
+
+def _preparar_widget(chave: str, valor) -> str:
+    # O valor guardado volta para o widget antes de desenhá-lo; a mudança feita pelo
+    # usuário chega antes disso, pelo on_change (_copiar_widget)
+    chave_widget = _PREFIXO_WIDGET + chave
+    st.session_state[chave_widget] = valor
+    return chave_widget
+
+
+def multiselect_persistente(
+    rotulo: str,
+    opcoes: Sequence[Hashable],
+    chave: str,
+    padrao: Iterable[Hashable] = (),
+    **kwargs,
+) -> list:
+    """
+    st.multiselect cuja seleção vale para todas as páginas que usam a mesma chave.
+    Valores guardados que não existem nas opções desta página são ignorados.
+    """
+    validas = set(opcoes)
+    guardado = st.session_state.get(chave)
+    valor = [v for v in (guardado if guardado is not None else padrao) if v in validas]
+    chave_widget = _preparar_widget(chave, valor)
+    return st.multiselect(rotulo, opcoes, key=chave_widget, on_change=_copiar_widget, args=(chave,), **kwargs)
+
+
+def selectbox_persistente(
+    rotulo: str,
+    opcoes: Sequence[Hashable],
+    chave: str,
+    padrao: int = 0,
+    **kwargs,
+):
+    """st.selectbox com a escolha compartilhada entre páginas (padrao: posição inicial)."""
+    opcoes = list(opcoes)
+    guardado = st.session_state.get(chave)
+    valor = guardado if guardado in opcoes else (opcoes[padrao] if opcoes else None)
+    chave_widget = _preparar_widget(chave, valor)
+    return st.selectbox(rotulo, opcoes, key=chave_widget, on_change=_copiar_widget, args=(chave,), **kwargs)
+
+
+def limpar_filtros(*chaves: str) -> None:
+    """Esquece as seleções guardadas (use como on_click de um botão "Limpar filtros")."""
+    for chave in chaves:
+        st.session_state.pop(chave, None)
@@ -0,0 +1,135 @@
+"""
+Motor de validação de qualidade dos dados.
+
+Cada regra devolve a máscara booleana (uma posição por linha) das linhas com problema;
+validar() avalia todas sobre as colunas inteiras, de uma vez, e monta um relatório com
+a contagem e uma amostra de índices por regra. Regras que precisam de colunas ausentes
+não rodam e aparecem no relatório como erro de estrutura.
+
+O relatório é calculado uma vez por versão do dataset (memo_por_versao), então as
+páginas podem chamá-lo a cada rerun sem varrer os dados de novo.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Hashable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .instrumentacao import etapa
+from .memo import memo_por_versao
+
+# Quantos índices de exemplo guardar por regra
+AMOSTRA_PADRAO = 5
+
+
+@dataclass(frozen=True)
+class Regra:
+    """
+    nome: identificador curto (ex.: "duplicatas").
+    mensagem: texto do alerta; "{n}" vira a quantidade de linhas.
+    avaliar: df -> máscara booleana das linhas com problema.
+    colunas: colunas de que a regra precisa (se faltar alguma, a regra não roda).
+    """
+    nome: str
+    mensagem: str
+    avaliar: Callable[[pd.DataFrame], "np.ndarray | pd.Series"]
+    colunas: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ResultadoRegra:
+    regra: str
+    quantidade: int
+    amostra: tuple
+    mensagem: str
+    erro: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class RelatorioValidacao:
+    linhas: int
+    resultados: tuple[ResultadoRegra, ...]
+
+    def problemas(self) -> list[ResultadoRegra]:
+        """Regras com alguma linha marcada ou que não puderam rodar."""
+        return [r for r in self.resultados if r.quantidade or r.erro]
+
+    def mensagens(self) -> list[str]:
+        """Alertas em texto (vazio se tudo ok)."""
+        return [r.erro or r.mensagem for r in self.problemas()]
+
+    def tabela(self) -> pd.DataFrame:
+        """Uma linha por regra: quantidade, % das linhas e amostra de índices."""
+        return pd.DataFrame({
+            "Regra": [r.regra for r in self.resultados],
+            "Linhas": [r.quantidade for r in self.resultados],
+            "%": [100 * r.quantidade / self.linhas if self.linhas else 0.0 for r in self.resultados],
+            "Exemplos (índice)": [", ".join(map(str, r.amostra)) for r in self.resultados],
+            "Detalhe": [r.erro or r.mensagem for r in self.resultados],
+        })
+
+
+def validar(df: pd.DataFrame, regras: Iterable[Regra], amostra: int = AMOSTRA_PADRAO) -> RelatorioValidacao:
+    """Avalia as regras sobre df e devolve o relatório (contagens + amostra de índices)."""
+    resultados = []
+    with etapa("validar", df, regras=0) as e:
+        for regra in regras:
+            faltando = [c for c in regra.colunas if c not in df.columns]
+            if faltando:
+                ausentes = ", ".join(f"'{c}'" for c in faltando)
+                resultados.append(ResultadoRegra(
+                    regra.nome, 0, (), regra.mensagem, f"Coluna {ausentes} ausente no dataset.",
+                ))
+                continue
+            mascara = np.asarray(regra.avaliar(df), dtype=bool)
+            posicoes = np.flatnonzero(mascara)
+            resultados.append(ResultadoRegra(
+                regra.nome,
+                int(len(posicoes)),
+                tuple(df.index[posicoes[:amostra]].tolist()),
+                regra.mensagem.format(n=len(posicoes)),
+            ))
+        e.info["regras"] = len(resultados)
+    return RelatorioValidacao(len(df), tuple(resultados))
+
+
+def validar_em_cache(
+    nome: str,
+    df: pd.DataFrame,
+    regras: Callable[[], Iterable[Regra]],
+    versao: Hashable | None,
+    amostra: int = AMOSTRA_PADRAO,
+) -> RelatorioValidacao:
+    """validar() uma vez por (nome, versão do dataset); regras() só é chamada se precisar calcular."""
+    return memo_por_versao(f"validacao:{nome}:{amostra}", versao, lambda: validar(df, regras(), amostra))
+
+
+# -------------------- Máscaras comuns --------------------
+
+def fora_da_faixa(serie: pd.Series, minimo=None, maximo=None) -> np.ndarray:
+    """Valores presentes abaixo de minimo ou acima de maximo (nulos não contam)."""
+    valores = pd.to_numeric(serie, errors="coerce").astype("float64").to_numpy()
+    mascara = np.zeros(len(valores), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        if minimo is not None:
+            mascara |= valores < minimo
+        if maximo is not None:
+            mascara |= valores > maximo
+    return mascara
+
+
+def atipicos(serie: pd.Series, fator: float = 3.0) -> np.ndarray:
+    """
+    Valores acima de Q3 + fator * IQR (cerca "muito fora" de Tukey), calculada sobre os
+    valores positivos. Sem dispersão (IQR = 0), nada é marcado.
+    """
+    valores = pd.to_numeric(serie, errors="coerce").astype("float64").to_numpy()
+    positivos = valores[valores > 0]
+    if len(positivos) < 4:
+        return np.zeros(len(valores), dtype=bool)
+    q1, q3 = np.quantile(positivos, [0.25, 0.75])
+    if q3 <= q1:
+        return np.zeros(len(valores), dtype=bool)
+    with np.errstate(invalid="ignore"):
+        return valores > q3 + fator * (q3 - q1)